@@ -0,0 +1,19 @@
+"""
+Benchmarks for the harness itself, apart from model latency.
+
+    synthetic.py   generates suites at scale (10k+ tests, thousands of banned
+                   regexes, multi-KB responses), deterministically from a seed
+    provider.py    FixedLatencyProvider: canned responses after a fixed delay
+                   (zero by default)
+    scenarios.py   the timed scenarios: loading, matching, run_suite in each
+                   mode, and every output formatter
+    __main__.py    runs them and reports ops/sec and peak memory, as JSON
+                   that can be compared against an earlier run
+
+    cd python
+    python -m benchmarks --out bench.json
+    python -m benchmarks --compare bench-main.json
+
+These are not tests: nothing here asserts on results, and numbers are only
+comparable between runs on the same machine with the same suite shape.
+"""
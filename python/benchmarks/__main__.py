@@ -0,0 +1,218 @@
+"""
+Run the harness benchmarks:
+
+    cd python
+    python -m benchmarks --out bench.json
+    python -m benchmarks --scenario 'match.*' --tests 2000 --repeat 5
+    python -m benchmarks --compare bench-main.json --out bench.json
+"""
+
+import argparse
+import fnmatch
+import gc
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional
+
+# Make sure we can import llm_test_harness + providers no matter where we run from.
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PYTHON_DIR not in sys.path:
+    sys.path.insert(0, PYTHON_DIR)
+
+from .scenarios import SCENARIOS, Scenario, ScenarioSkipped, Workload
+from .synthetic import SuiteShape
+
+RESULTS_FORMAT = 1
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=PYTHON_DIR,
+            capture_output=True, text=True, timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run_scenario(scenario: Scenario, workload: Workload, repeat: int) -> Dict[str, Any]:
+    """
+    Time `repeat` runs of the scenario, then one more under tracemalloc for
+    the peak memory it allocates. Timings are taken without tracemalloc,
+    which slows allocation-heavy code several times over.
+
+    re's compiled-pattern cache is cleared before every run, so a repeat
+    compiles its patterns again just like the first run did.
+    """
+    seconds: List[float] = []
+    ops = 0
+    for _ in range(repeat):
+        run = scenario.prepare(workload)
+        re.purge()
+        gc.collect()
+        started = time.perf_counter()
+        ops = run()
+        seconds.append(time.perf_counter() - started)
+
+    run = scenario.prepare(workload)
+    re.purge()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    median = statistics.median(seconds)
+    return {
+        "name": scenario.name,
+        "unit": scenario.unit,
+        "ops": ops,
+        "seconds": {"median": median, "min": min(seconds), "max": max(seconds)},
+        "opsPerSec": ops / median if median > 0 else None,
+        "peakMemoryKb": round(peak / 1024, 1),
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Lines comparing ops/sec per scenario with a baseline results file, and
+    whether each one regressed by more than `tolerance` (a fraction).
+    """
+    before = {s["name"]: s for s in baseline.get("scenarios", [])}
+    lines = []
+    for s in current["scenarios"]:
+        old = before.get(s["name"])
+        if not old or not old.get("opsPerSec") or not s.get("opsPerSec"):
+            continue
+        ratio = s["opsPerSec"] / old["opsPerSec"]
+        flag = "  REGRESSION" if ratio < 1 - tolerance else ""
+        lines.append(f"  {s['name']:<28} {old['opsPerSec']:>12.1f} -> {s['opsPerSec']:>12.1f} {s['unit']}/s  x{ratio:.2f}{flag}")
+    return lines
+
+
+def _format_result(s: Dict[str, Any]) -> str:
+    rate = f"{s['opsPerSec']:>12.1f} {s['unit']}/s" if s.get("opsPerSec") else " " * 12
+    return f"  {s['name']:<28} {rate:<24} {s['seconds']['median'] * 1000:>10.1f} ms  {s['peakMemoryKb']:>10.1f} KB peak"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Time the harness itself (loading, matching, running, formatting) on a synthetic suite."
+    )
+    parser.add_argument("--tests", type=int, default=SuiteShape.tests, help="Tests in the synthetic suite.")
+    parser.add_argument("--categories", type=int, default=SuiteShape.categories)
+    parser.add_argument("--banned", type=int, default=SuiteShape.banned, help="Global banned regexes.")
+    parser.add_argument("--response-kb", type=float, default=SuiteShape.response_kb, help="Size of each model response.")
+    parser.add_argument("--seed", type=int, default=SuiteShape.seed)
+    parser.add_argument(
+        "--latency-ms", type=float, default=0.0,
+        help="Fixed provider latency per call (default 0: measure harness overhead only).",
+    )
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrency for the threaded / async runs.")
+    parser.add_argument("--http-tests", type=int, default=500, help="Tests sent through run.http_standin.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per scenario; the median is reported.")
+    parser.add_argument(
+        "--scenario", action="append", default=[],
+        help="Only run scenarios matching this glob (repeatable), e.g. 'match.*'. "
+             "Opt-in scenarios (run.http_standin) only run when selected.",
+    )
+    parser.add_argument("--list", action="store_true", help="List the scenarios and exit.")
+    parser.add_argument("--out", help="Write the results as JSON to this path ('-' for stdout).")
+    parser.add_argument("--compare", help="Results JSON from an earlier run to compare ops/sec against.")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.15,
+        help="With --compare, exit 1 if a scenario is this much slower (fraction, default 0.15).",
+    )
+    parser.add_argument("--workdir", help="Where to write the synthetic suite (default: a temp directory).")
+    args = parser.parse_args()
+
+    if args.list:
+        for s in SCENARIOS:
+            print(f"{s.name}{'  (opt-in)' if s.opt_in else ''}")
+        return
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    if args.scenario:
+        selected = [s for s in SCENARIOS if any(fnmatch.fnmatch(s.name, g) for g in args.scenario)]
+        if not selected:
+            parser.error(f"no scenario matches {args.scenario}; see --list")
+    else:
+        selected = [s for s in SCENARIOS if not s.opt_in]
+
+    shape = SuiteShape(
+        tests=args.tests,
+        categories=args.categories,
+        banned=args.banned,
+        response_kb=args.response_kb,
+        seed=args.seed,
+    )
+
+    with tempfile.TemporaryDirectory(prefix="llmth-bench-") as tmp:
+        print(f"[bench] Generating {shape.tests} tests, {shape.banned} banned patterns...", file=sys.stderr)
+        workload = Workload(
+            args.workdir or tmp, shape,
+            latency_ms=args.latency_ms,
+            concurrency=args.concurrency,
+            http_tests=args.http_tests,
+        )
+        results = []
+        try:
+            for scenario in selected:
+                try:
+                    result = run_scenario(scenario, workload, args.repeat)
+                except ScenarioSkipped as e:
+                    print(f"  {scenario.name:<28} skipped: {e}", file=sys.stderr)
+                    continue
+                print(_format_result(result), file=sys.stderr)
+                results.append(result)
+        finally:
+            workload.close()
+
+    report = {
+        "format": RESULTS_FORMAT,
+        "createdAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "gitCommit": _git_commit(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "shape": asdict(shape),
+        "latencyMs": args.latency_ms,
+        "concurrency": args.concurrency,
+        "repeat": args.repeat,
+        "scenarios": results,
+    }
+
+    if args.out == "-":
+        print(json.dumps(report, indent=2))
+    elif args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("shape") != report["shape"]:
+            print("[bench] Warning: baseline was run on a different suite shape.", file=sys.stderr)
+        lines = compare(report, baseline, args.tolerance)
+        print(f"[bench] Against {args.compare} (baseline {baseline.get('gitCommit') or 'unknown'}):", file=sys.stderr)
+        print("\n".join(lines) or "  (no scenarios in common)", file=sys.stderr)
+        if any(line.endswith("REGRESSION") for line in lines):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+A provider with no model behind it, so benchmarks time the harness alone.
+
+FixedLatencyProvider answers every prompt from a fixed pool of responses
+(picked by a hash of the prompt, so a test always gets the same answer)
+after an optional fixed delay. With latency_ms=0 it returns at once and a
+run measures pure harness overhead; with a delay it shows how the runner
+overlaps waiting at a given --concurrency.
+
+To push the real SDK code paths as well, point providers/openai or
+providers/claude at providers.standin instead (see the `http` scenario).
+"""
+
+import asyncio
+import time
+import zlib
+from typing import AsyncIterator, Iterator, List
+
+from llm_test_harness.models import ModelResponse
+
+
+class FixedLatencyProvider:
+    def __init__(self, responses: List[str], latency_ms: float = 0.0, usage: bool = True):
+        if not responses:
+            raise ValueError("FixedLatencyProvider needs at least one response.")
+        self.latency = latency_ms / 1000
+        self._responses = [
+            ModelResponse(text, _usage(text) if usage else None) for text in responses
+        ]
+
+    def _pick(self, prompt: str) -> ModelResponse:
+        return self._responses[zlib.crc32(prompt.encode("utf-8")) % len(self._responses)]
+
+    def call_model(self, prompt: str) -> ModelResponse:
+        if self.latency:
+            time.sleep(self.latency)
+        return self._pick(prompt)
+
+    async def acall_model(self, prompt: str) -> ModelResponse:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._pick(prompt)
+
+    def stream_model(self, prompt: str) -> Iterator[str]:
+        """Whole response in 64-character chunks, the delay before the first."""
+        if self.latency:
+            time.sleep(self.latency)
+        response = self._pick(prompt)
+        for i in range(0, len(response), 64):
+            yield response[i:i + 64]
+        yield ModelResponse("", response.usage)
+
+    async def astream_model(self, prompt: str) -> AsyncIterator[str]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._achunks(self._pick(prompt))
+
+    async def _achunks(self, response: ModelResponse) -> AsyncIterator[str]:
+        for i in range(0, len(response), 64):
+            yield response[i:i + 64]
+        yield ModelResponse("", response.usage)
+
+
+def _usage(text: str):
+    return {"input_tokens": 200, "output_tokens": max(1, len(text) // 4)}
@@ -0,0 +1,326 @@
+"""
+The timed scenarios.
+
+Each scenario's `prepare(workload)` does the untimed setup and returns a
+callable that does the timed work once and returns how many operations it
+performed (tests loaded, responses scanned, results formatted...). The
+throughput reported is operations per second of that callable.
+
+A Workload holds what scenarios share: the generated suite on disk, the
+loaded categories, the response pool and a finished run for the output
+formatters. The suite is generated up front; the rest is built on first
+use, so running one scenario doesn't pay for the others.
+"""
+
+import asyncio
+import json
+import os
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from llm_test_harness.bundle import build_bundle, load_suite_bundle
+from llm_test_harness.loader import load_banned_forbidden_regexes, load_category_files, load_manifest
+from llm_test_harness.matcher import PatternSet, PatternTable, which_patterns_match
+from llm_test_harness.models import CategoryFile, FullSuiteResult, SuiteManifest
+from llm_test_harness.observer import RunObserver
+from llm_test_harness.runner import format_triage, run_suite, run_suite_async, score_response, summarize_for_output
+from llm_test_harness.sink import JsonlResultSink
+
+from .provider import FixedLatencyProvider
+from .synthetic import SuiteShape, generate_suite, synthetic_responses
+
+
+class ScenarioSkipped(Exception):
+    """The scenario can't run here (e.g. an optional SDK is missing)."""
+
+
+class Workload:
+    def __init__(
+        self,
+        directory: str,
+        shape: SuiteShape,
+        latency_ms: float = 0.0,
+        concurrency: int = 16,
+        http_tests: int = 500,
+    ):
+        self.directory = directory
+        self.shape = shape
+        self.latency_ms = latency_ms
+        self.concurrency = concurrency
+        self.http_tests = http_tests
+        self.paths = generate_suite(directory, shape)
+        self.responses = synthetic_responses(shape)
+        self.provider = FixedLatencyProvider(self.responses, latency_ms)
+        self._suite: Optional[tuple] = None
+        self._full: Optional[FullSuiteResult] = None
+        self._server = None
+
+    def load(self):
+        manifest = load_manifest(self.paths["manifest"])
+        banned = load_banned_forbidden_regexes(self.paths["banned"])
+        return manifest, load_category_files(manifest, self.paths["manifest"], banned), banned
+
+    @property
+    def manifest(self) -> SuiteManifest:
+        return self.suite[0]
+
+    @property
+    def categories(self) -> List[CategoryFile]:
+        return self.suite[1]
+
+    @property
+    def banned(self) -> List[str]:
+        return self.suite[2]
+
+    @property
+    def suite(self) -> tuple:
+        if self._suite is None:
+            self._suite = self.load()
+        return self._suite
+
+    @property
+    def full_result(self) -> FullSuiteResult:
+        """A finished, serial run of the whole suite (for the formatters)."""
+        if self._full is None:
+            self._full = run_suite(self.manifest, self.categories, self.provider.call_model, observer=RunObserver())
+        return self._full
+
+    def standin(self):
+        """providers.standin serving the response pool, started on first use."""
+        if self._server is None:
+            from providers.standin import Fixtures, StandinServer
+
+            fixtures = Fixtures({
+                "defaults": {"latency_ms": self.latency_ms, "chunk_ms": 0},
+                "rules": [{"match": "", "responses": self.responses}],
+            })
+            self._server = StandinServer(fixtures).start()
+        return self._server
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.stop()
+            self._server = None
+
+
+@dataclass
+class Scenario:
+    name: str
+    unit: str
+    prepare: Callable[[Workload], Callable[[], int]]
+    # Left out of a plain run; only runs when selected with --scenario.
+    opt_in: bool = False
+
+
+def _scored(full: FullSuiteResult) -> int:
+    t = full.summary.totals
+    return t.pass_count + t.fail_red_count + t.fail_yellow_count + t.eval_error_count
+
+
+def _load_sources(w: Workload):
+    def run() -> int:
+        _manifest, categories, _banned = w.load()
+        return sum(len(c.tests) for c in categories)
+    return run
+
+
+def _load_bundle(w: Workload):
+    bundle_path = os.path.join(w.directory, "suite.bundle.json")
+    build_bundle(bundle_path, w.paths["manifest"], w.paths["banned"])
+
+    def run() -> int:
+        _manifest, categories = load_suite_bundle(bundle_path, w.paths["manifest"], w.paths["banned"])
+        return sum(len(c.tests) for c in categories)
+    return run
+
+
+def _patternset_compile(w: Workload):
+    banned = w.banned
+
+    def run() -> int:
+        # A fresh table: the global one would hand back patterns compiled earlier.
+        PatternSet(banned, table=PatternTable())
+        return len(banned)
+    return run
+
+
+def _patternset_scan(w: Workload):
+    patterns = PatternSet(w.banned)
+    responses = w.responses
+
+    def run() -> int:
+        for text in responses:
+            patterns.which_match(text)
+        return len(responses)
+    return run
+
+
+def _legacy_scan(w: Workload):
+    banned = w.banned
+    # which_patterns_match recompiles through re's small cache: keep it short.
+    responses = w.responses[:8]
+
+    def run() -> int:
+        for text in responses:
+            which_patterns_match(text, banned)
+        return len(responses)
+    return run
+
+
+def _score(w: Workload):
+    items = [(cat, test) for cat in w.categories for test in cat.tests]
+    call = w.provider.call_model
+    pairs = [(cat, test, call(test.prompt)) for cat, test in items]
+
+    def run() -> int:
+        for cat, test, response in pairs:
+            score_response(cat, test, response)
+        return len(pairs)
+    return run
+
+
+def _run_serial(w: Workload):
+    manifest, categories = w.manifest, w.categories
+
+    def run() -> int:
+        full = run_suite(manifest, categories, w.provider.call_model, observer=RunObserver())
+        return _scored(full)
+    return run
+
+
+def _run_threads(w: Workload):
+    manifest, categories = w.manifest, w.categories
+
+    def run() -> int:
+        full = run_suite(
+            manifest, categories, w.provider.call_model,
+            concurrency=w.concurrency, observer=RunObserver(),
+        )
+        return _scored(full)
+    return run
+
+
+def _run_async(w: Workload):
+    manifest, categories = w.manifest, w.categories
+
+    def run() -> int:
+        full = asyncio.run(run_suite_async(
+            manifest, categories, w.provider.acall_model,
+            concurrency=w.concurrency, observer=RunObserver(),
+        ))
+        return _scored(full)
+    return run
+
+
+def _run_stream(w: Workload):
+    manifest, categories = w.manifest, w.categories
+
+    def run() -> int:
+        full = run_suite(
+            manifest, categories, w.provider.stream_model,
+            concurrency=w.concurrency, observer=RunObserver(), streaming=True,
+        )
+        return _scored(full)
+    return run
+
+
+def _run_flat(w: Workload):
+    manifest, categories = w.manifest, w.categories
+
+    def run() -> int:
+        sink = JsonlResultSink(os.devnull)
+        try:
+            full = run_suite(
+                manifest, categories, w.provider.call_model,
+                sink=sink, keep_results=False, observer=RunObserver(),
+            )
+        finally:
+            sink.close()
+        return _scored(full)
+    return run
+
+
+def _run_http(w: Workload):
+    try:
+        import providers.openai as openai_provider
+    except ImportError as e:
+        raise ScenarioSkipped(f"needs the openai SDK ({e})")
+
+    server = w.standin()
+    os.environ["OPENAI_BASE_URL"] = server.openai_base_url
+    os.environ.setdefault("OPENAI_API_KEY", "standin")
+    manifest = w.manifest
+    # The HTTP round trip dominates, so a slice of the suite is enough.
+    categories, left = [], w.http_tests
+    for cat in w.categories:
+        if left <= 0:
+            break
+        categories.append(CategoryFile(cat.category_id, cat.category_name, cat.category_description, cat.tests[:left], cat.source))
+        left -= len(categories[-1].tests)
+
+    def call(prompt: str):
+        return openai_provider.call_model(prompt, None)
+
+    def run() -> int:
+        full = run_suite(manifest, categories, call, concurrency=w.concurrency, observer=RunObserver())
+        return _scored(full)
+    return run
+
+
+def _formatter(mode: str):
+    def prepare(w: Workload):
+        full = w.full_result
+
+        def run() -> int:
+            output = summarize_for_output(full, mode=mode)
+            if not isinstance(output, str):
+                json.dumps(output, indent=2, ensure_ascii=False)
+            return len(full.results)
+        return run
+    return prepare
+
+
+def _format_triage(w: Workload):
+    full = w.full_result
+
+    def run() -> int:
+        failing = [r for r in full.results if r.status != "pass"]
+        format_triage(failing)
+        return len(full.results)
+    return run
+
+
+def _format_jsonl(w: Workload):
+    full = w.full_result
+
+    def run() -> int:
+        sink = JsonlResultSink(os.devnull)
+        try:
+            for idx, result in enumerate(full.results):
+                sink.write_result(idx, result)
+            sink.write_summary(full.summary)
+        finally:
+            sink.close()
+        return len(full.results)
+    return run
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario("load.sources", "tests", _load_sources),
+    Scenario("load.bundle", "tests", _load_bundle),
+    Scenario("match.compile_banned", "patterns", _patternset_compile),
+    Scenario("match.banned", "responses", _patternset_scan),
+    Scenario("match.banned_uncompiled", "responses", _legacy_scan),
+    Scenario("match.score_response", "tests", _score),
+    Scenario("run.serial", "tests", _run_serial),
+    Scenario("run.threads", "tests", _run_threads),
+    Scenario("run.async", "tests", _run_async),
+    Scenario("run.stream", "tests", _run_stream),
+    Scenario("run.jsonl_no_retention", "tests", _run_flat),
+    Scenario("run.http_standin", "tests", _run_http, opt_in=True),
+    Scenario("format.summary", "results", _formatter("summary")),
+    Scenario("format.detailed", "results", _formatter("detailed")),
+    Scenario("format.verbose", "results", _formatter("verbose")),
+    Scenario("format.triage", "results", _format_triage),
+    Scenario("format.jsonl", "results", _format_jsonl),
+]
@@ -0,0 +1,214 @@
+"""
+Offline audit of logged production responses.
+
+Scans a JSONL or CSV transcript (optionally gzipped) against every
+forbidden_any pattern in the suite plus the global banned list, and
+reports how often each pattern hit and which records hit it.
+
+The file is streamed: records are read in chunks and fanned out over a
+process pool whose workers each compile the pattern set once. At most a
+few chunks per worker are in flight, so memory stays flat however large
+the log is, and throughput scales with cores. For JSONL, JSON parsing
+also happens in the workers; CSV rows are parsed in the main process
+(quoted fields can span lines).
+"""
+
+import csv
+import gzip
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import IO, Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from .matcher import PATTERNS, PatternSet
+from .models import CategoryFile
+
+
+DEFAULT_CHUNK_SIZE = 2000
+
+# Per-worker compiled patterns, set by _init_worker.
+_WORKER_PATTERNS: Optional[PatternSet] = None
+
+
+def audit_patterns(categories: List[CategoryFile]) -> List[str]:
+    """
+    Every distinct forbidden_any pattern in the suite, in first-seen order.
+    Each test's banned set counts too; tests share it, so it is walked once.
+    """
+    seen: Dict[int, None] = {}
+    shared: Dict[int, None] = {}
+    for cat in categories:
+        for test in cat.tests:
+            spec = test.assert_spec
+            seen.update(dict.fromkeys(spec.forbidden_any_ids))
+            if spec.banned is not None and id(spec.banned) not in shared:
+                shared[id(spec.banned)] = None
+                seen.update(dict.fromkeys(spec.banned.own_ids))
+    return PATTERNS.patterns(seen)
+
+
+def _open_text(path: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return open(path, "r", encoding="utf-8", newline="")
+
+
+def _is_csv(path: str) -> bool:
+    return path[:-3].endswith(".csv") if path.endswith(".gz") else path.endswith(".csv")
+
+
+def _read_chunks(
+    path: str,
+    text_field: str,
+    id_field: Optional[str],
+    chunk_size: int,
+) -> Iterator[List[Tuple[int, Any]]]:
+    """
+    Yield lists of (line_no, item). JSONL items are raw lines (parsed by the
+    worker); CSV items are (record_id, text) tuples, or None for a row
+    missing the text column.
+    """
+    chunk: List[Tuple[int, Any]] = []
+    with _open_text(path) as f:
+        if _is_csv(path):
+            reader = csv.DictReader(f)
+            for row in reader:
+                text = row.get(text_field)
+                item = None if text is None else ((row.get(id_field) if id_field else None), text)
+                chunk.append((reader.line_num, item))
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+        else:
+            for line_no, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                chunk.append((line_no, line))
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+    if chunk:
+        yield chunk
+
+
+def _init_worker(patterns: List[str]) -> None:
+    global _WORKER_PATTERNS
+    _WORKER_PATTERNS = PatternSet(patterns, label="audit")
+
+
+def _scan_chunk(
+    chunk: List[Tuple[int, Any]],
+    text_field: str,
+    id_field: Optional[str],
+) -> Tuple[int, int, Dict[str, int], List[Dict[str, Any]]]:
+    """
+    Match one chunk. Returns (records scanned, records skipped, hits per
+    pattern, offending records).
+    """
+    patterns = _WORKER_PATTERNS
+    scanned = 0
+    skipped = 0
+    counts: Dict[str, int] = {}
+    offenders: List[Dict[str, Any]] = []
+
+    for line_no, item in chunk:
+        if isinstance(item, str):
+            try:
+                rec = json.loads(item)
+                text = rec[text_field]
+                record_id = rec.get(id_field) if id_field else None
+            except (ValueError, KeyError, TypeError, AttributeError):
+                skipped += 1
+                continue
+        elif item is None:
+            skipped += 1
+            continue
+        else:
+            record_id, text = item
+        if not isinstance(text, str):
+            skipped += 1
+            continue
+
+        scanned += 1
+        hits = patterns.which_match(text)
+        if hits:
+            for pat in hits:
+                counts[pat] = counts.get(pat, 0) + 1
+            offenders.append({
+                "line": line_no,
+                "id": record_id,
+                "hit_forbidden_any": hits,
+                "text": text,
+            })
+
+    return scanned, skipped, counts, offenders
+
+
+def audit_transcripts(
+    path: str,
+    patterns: List[str],
+    text_field: str = "response",
+    id_field: Optional[str] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    hits_out: Optional[IO[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Scan the transcript at `path` and return the audit summary:
+
+        {"records": ..., "skipped": ..., "recordsWithHits": ...,
+         "patternHits": {pattern: count, ...}}   # most hits first
+
+    Each offending record is written to `hits_out` as a JSON line (in file
+    order) as soon as its chunk is done. workers=1 scans in-process;
+    the default is one worker per CPU.
+    """
+    workers = workers or os.cpu_count() or 1
+    totals = {"records": 0, "skipped": 0, "recordsWithHits": 0}
+    pattern_hits: Dict[str, int] = {pat: 0 for pat in patterns}
+
+    def _merge(result: Tuple[int, int, Dict[str, int], List[Dict[str, Any]]]) -> None:
+        scanned, skipped, counts, offenders = result
+        totals["records"] += scanned
+        totals["skipped"] += skipped
+        totals["recordsWithHits"] += len(offenders)
+        for pat, n in counts.items():
+            pattern_hits[pat] += n
+        if hits_out is not None:
+            for rec in offenders:
+                hits_out.write(json.dumps(rec, ensure_ascii=False) + "\n")
+
+    chunks = _read_chunks(path, text_field, id_field, chunk_size)
+
+    if workers == 1:
+        _init_worker(patterns)
+        for chunk in chunks:
+            _merge(_scan_chunk(chunk, text_field, id_field))
+    else:
+        # A few chunks per worker in flight: enough to keep every core busy,
+        # few enough that the file is never buffered in memory. Results are
+        # taken oldest-first so offenders come out in file order.
+        max_in_flight = workers * 3
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(patterns,),
+        ) as pool:
+            in_flight: Deque = deque()
+            for chunk in chunks:
+                in_flight.append(pool.submit(_scan_chunk, chunk, text_field, id_field))
+                if len(in_flight) >= max_in_flight:
+                    _merge(in_flight.popleft().result())
+            while in_flight:
+                _merge(in_flight.popleft().result())
+
+    ranked = sorted(
+        ((pat, n) for pat, n in pattern_hits.items() if n),
+        key=lambda item: -item[1],
+    )
+    return {
+        "source": path,
+        **totals,
+        "patternHits": dict(ranked),
+    }
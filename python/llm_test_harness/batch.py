@@ -0,0 +1,146 @@
+"""
+Batch execution mode.
+
+Instead of one synchronous request per test, every prompt in the loaded
+suite is submitted as a single job to a provider batch API (OpenAI Batch,
+Anthropic Message Batches). The runner polls until the job ends, then
+feeds the returned responses through the normal scoring and gate path.
+Latency is hours rather than seconds, but batch pricing and throughput
+make it the right fit for nightly full-matrix runs.
+
+Providers plug in by implementing BatchBackend; providers.mock has an
+in-process stand-in so the whole path can run offline.
+"""
+
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from .models import SuiteManifest, CategoryFile, FullSuiteResult, SingleTestResult
+from .runner import RunnerError, _SuiteRun, score_response
+
+if TYPE_CHECKING:
+    from .checkpoint import Checkpoint
+    from .metrics import ModelPrice
+    from .observer import RunObserver
+    from .profiler import PatternMonitor
+    from .sink import ResultSink
+
+# Normalised job states returned by BatchBackend.poll().
+BATCH_IN_PROGRESS = "in_progress"
+BATCH_ENDED = "ended"
+BATCH_FAILED = "failed"
+
+
+class BatchBackend:
+    """
+    Provider side of a batch run.
+
+    submit(requests) takes (custom_id, prompt) pairs and returns a batch id.
+    poll(batch_id) returns one of BATCH_IN_PROGRESS / BATCH_ENDED / BATCH_FAILED.
+    results(batch_id) returns {custom_id: response_text} for every request
+    that succeeded; failed requests are simply absent.
+    """
+
+    def submit(self, requests: List[Tuple[str, str]]) -> str:
+        raise NotImplementedError
+
+    def poll(self, batch_id: str) -> str:
+        raise NotImplementedError
+
+    def results(self, batch_id: str) -> Dict[str, str]:
+        raise NotImplementedError
+
+
+def _custom_id(idx: int) -> str:
+    # Both batch APIs restrict custom_id characters; the suite index is safe and unique.
+    return f"test-{idx}"
+
+
+def run_suite_batch(
+    manifest: SuiteManifest,
+    categories: List[CategoryFile],
+    backend: BatchBackend,
+    poll_interval: float = 30.0,
+    timeout: Optional[float] = None,
+    sink: Optional["ResultSink"] = None,
+    keep_results: bool = True,
+    checkpoint: Optional["Checkpoint"] = None,
+    sleep: Callable[[float], None] = time.sleep,
+    carried: Optional[Dict[str, SingleTestResult]] = None,
+    monitor: Optional["PatternMonitor"] = None,
+    price: Optional["ModelPrice"] = None,
+    observer: Optional["RunObserver"] = None,
+) -> FullSuiteResult:
+    """
+    Run the suite through `backend` as one batch job.
+
+    Tests already in `checkpoint` or `carried` are not resubmitted. Every response the
+    batch returns is scored and recorded; if some requests failed, those
+    results are still checkpointed before a RunnerError is raised, so a
+    resumed run only resubmits the failures. The batch id is checkpointed
+    too: a run killed (or timed out) while polling resumes polling the same
+    job rather than submitting a new one.
+
+    When the batch fails, times out or drops requests, `sink` and
+    `observer` still get a summary, with `error` set and gate RED, before
+    the RunnerError is raised.
+
+    Batch results have no per-test latency. A `price` estimates cost at the
+    given rates; pass batch rates if the provider discounts batch jobs.
+
+    To `observer`, every submitted test is in flight until the batch ends.
+    """
+    run = _SuiteRun(categories, 1, sink, keep_results, checkpoint, fail_fast=False, carried=carried, price=price, observer=observer)
+    if not run.to_run:
+        return run.finish()
+
+    pending = checkpoint.pending_batch if checkpoint is not None else None
+    if pending is not None and set(run.to_run) <= set(pending[1]):
+        batch_id = pending[0]
+        print(f"[LLMTestHarness] Resuming batch {batch_id} from checkpoint", file=sys.stderr, flush=True)
+    else:
+        requests = [(_custom_id(idx), run.test_items[idx][1].prompt) for idx in run.to_run]
+        batch_id = backend.submit(requests)
+        if checkpoint is not None:
+            checkpoint.batch_submitted(batch_id, run.to_run)
+        print(f"[LLMTestHarness] Submitted batch {batch_id} with {len(requests)} prompts", file=sys.stderr, flush=True)
+    for idx in run.to_run:
+        run.announce(idx)
+
+    started = time.monotonic()
+    while True:
+        state = backend.poll(batch_id)
+        if state == BATCH_ENDED:
+            break
+        if state == BATCH_FAILED:
+            if checkpoint is not None:
+                checkpoint.batch_collected(batch_id)
+            raise run.fail(f"Batch {batch_id} failed.")
+        if timeout is not None and time.monotonic() - started > timeout:
+            # Left pending in the checkpoint: --resume picks the job up again.
+            raise run.fail(f"Batch {batch_id} did not finish within {timeout:.0f}s.")
+        print(f"[LLMTestHarness] Batch {batch_id}: {state}", file=sys.stderr, flush=True)
+        sleep(poll_interval)
+
+    responses = backend.results(batch_id)
+
+    missing: List[str] = []
+    for idx in run.to_run:
+        cat, test = run.test_items[idx]
+        response = responses.get(_custom_id(idx))
+        if response is None:
+            missing.append(f"{cat.category_id}::{test.id}")
+            run.call_failed(idx, RunnerError("no response in batch results"))
+            continue
+        run.call_done(idx, None)
+        run.record(idx, score_response(cat, test, response, monitor))
+    if checkpoint is not None:
+        checkpoint.batch_collected(batch_id)
+
+    if missing:
+        raise run.fail(
+            f"Batch {batch_id}: {len(missing)} request(s) returned no response: " + ", ".join(missing)
+        )
+
+    return run.finish()
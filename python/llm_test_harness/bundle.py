@@ -0,0 +1,239 @@
+"""
+Compiled suite bundles.
+
+Loading the suite normally means parsing every category file listed in the
+manifest, building the nested dataclasses and merging banned patterns into
+every test. A bundle is the result of all that, validated once and written
+to a single JSON file:
+
+  - the manifest, the banned list, and every test flattened into one list
+    (each pointing at its category)
+  - a deduplicated pattern table; tests refer to patterns by index, and
+    list only their own forbidden patterns (the banned list is stored once)
+  - a fingerprint (mtime, size, sha256) of every source file: the manifest,
+    each category file and the banned list
+
+load_suite_bundle uses the bundle while it is fresh and rebuilds it
+whenever a source file was added, removed or changed. A source whose mtime
+moved but whose sha256 did not (a fresh git checkout, say) does not
+trigger a rebuild; the new mtimes are just recorded.
+"""
+
+import dataclasses
+import hashlib
+import json
+import os
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+from .loader import (
+    LoaderError,
+    banned_pattern_set,
+    load_manifest,
+    load_banned_forbidden_regexes,
+    load_category_files,
+    assign_content_hashes,
+)
+from .matcher import PATTERNS
+from .models import SuiteManifest, CategoryFile, EvalTest, AssertSpec
+
+
+BUNDLE_FORMAT = 3
+
+
+def _sha256_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _fingerprint(path: str) -> Dict[str, Any]:
+    """mtime / size / sha256 of a source file; all None if it doesn't exist."""
+    if not os.path.exists(path):
+        return {"path": path, "mtime_ns": None, "size": None, "sha256": None}
+    st = os.stat(path)
+    return {"path": path, "mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha256": _sha256_file(path)}
+
+
+def _source_paths(manifest_path: str, manifest: SuiteManifest, banned_path: Optional[str]) -> List[str]:
+    base_dir = os.path.dirname(manifest_path)
+    paths = [manifest_path]
+    paths.extend(os.path.join(base_dir, rel) for rel in manifest.include_files)
+    if banned_path:
+        paths.append(banned_path)
+    return paths
+
+
+def build_bundle(
+    bundle_path: str,
+    manifest_path: str,
+    banned_path: Optional[str] = None,
+) -> Tuple[SuiteManifest, List[CategoryFile], List[str]]:
+    """
+    Load and validate the suite from its source files, then write it to
+    `bundle_path`. Returns (manifest, categories, banned_patterns).
+    Raises LoaderError if `banned_path` is given but doesn't exist.
+    """
+    manifest_path = os.path.abspath(manifest_path)
+    banned_path = os.path.abspath(banned_path) if banned_path else None
+
+    manifest = load_manifest(manifest_path)
+    banned: List[str] = []
+    if banned_path:
+        if not os.path.exists(banned_path):
+            # Building without it would silently drop every global forbidden pattern.
+            raise LoaderError(f"Banned patterns file not found: {banned_path}")
+        banned = load_banned_forbidden_regexes(banned_path)
+    categories = load_category_files(manifest, manifest_path, banned)
+
+    pattern_index: Dict[str, int] = {}
+
+    def _refs(patterns: List[str]) -> List[int]:
+        return [pattern_index.setdefault(p, len(pattern_index)) for p in patterns]
+
+    tests = []
+    for cat_idx, cat in enumerate(categories):
+        for test in cat.tests:
+            spec = test.assert_spec
+            tests.append({
+                "category": cat_idx,
+                "id": test.id,
+                "prompt": test.prompt,
+                "expected_behavior": test.expected_behavior,
+                "method": spec.method,
+                "required_all": _refs(spec.required_all),
+                "required_any": _refs(spec.required_any),
+                "forbidden_any": _refs(PATTERNS.patterns(spec.forbidden_any_ids)),
+            })
+
+    bundle = {
+        "format": BUNDLE_FORMAT,
+        "manifest_path": manifest_path,
+        "banned_path": banned_path,
+        "sources": [_fingerprint(p) for p in _source_paths(manifest_path, manifest, banned_path)],
+        "manifest": dataclasses.asdict(manifest),
+        "banned": banned,
+        "patterns": list(pattern_index),
+        "categories": [
+            {
+                "category_id": cat.category_id,
+                "category_name": cat.category_name,
+                "category_description": cat.category_description,
+                "source": cat.source,
+            }
+            for cat in categories
+        ],
+        "tests": tests,
+    }
+
+    _write_bundle(bundle, bundle_path)
+    return manifest, categories, banned
+
+
+def _write_bundle(bundle: Dict[str, Any], bundle_path: str) -> None:
+    # Write-then-rename so a concurrent reader never sees a half-written bundle.
+    tmp_path = f"{bundle_path}.tmp.{os.getpid()}"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(bundle, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, bundle_path)
+
+
+def _check_sources(bundle: Dict[str, Any]) -> Tuple[bool, bool]:
+    """
+    (fresh, touched): fresh if every source still has the recorded content;
+    touched if some mtimes moved without the content changing.
+    """
+    touched = False
+    for src in bundle["sources"]:
+        path = src["path"]
+        if not os.path.exists(path):
+            if src["sha256"] is not None:
+                return False, touched
+            continue
+        if src["sha256"] is None:
+            return False, touched
+        st = os.stat(path)
+        if st.st_mtime_ns == src["mtime_ns"] and st.st_size == src["size"]:
+            continue
+        if st.st_size != src["size"] or _sha256_file(path) != src["sha256"]:
+            return False, touched
+        src["mtime_ns"] = st.st_mtime_ns
+        touched = True
+    return True, touched
+
+
+def _categories_from_bundle(bundle: Dict[str, Any]) -> List[CategoryFile]:
+    ids = PATTERNS.intern_all(bundle["patterns"])
+    banned = banned_pattern_set(bundle["banned"])
+    categories = [
+        CategoryFile(
+            category_id=c["category_id"],
+            category_name=c["category_name"],
+            category_description=c["category_description"],
+            tests=[],
+            source=c["source"],
+        )
+        for c in bundle["categories"]
+    ]
+    for t in bundle["tests"]:
+        spec = AssertSpec(
+            method=t["method"],
+            required_all_ids=tuple(ids[i] for i in t["required_all"]),
+            required_any_ids=tuple(ids[i] for i in t["required_any"]),
+            forbidden_any_ids=tuple(ids[i] for i in t["forbidden_any"]),
+            banned=banned,
+        )
+        categories[t["category"]].tests.append(EvalTest(
+            id=t["id"],
+            prompt=t["prompt"],
+            expected_behavior=t["expected_behavior"],
+            assert_spec=spec,
+        ))
+    return categories
+
+
+def load_suite_bundle(
+    bundle_path: str,
+    manifest_path: str,
+    banned_path: Optional[str] = None,
+    preamble_text: Optional[str] = None,
+    rebuild: bool = False,
+) -> Tuple[SuiteManifest, List[CategoryFile]]:
+    """
+    The suite as load_category_files would return it, read from
+    `bundle_path` when that is fresh for this manifest and banned file,
+    otherwise rebuilt from the sources first (always, with rebuild=True).
+
+    Patterns were validated when the bundle was built, so test patterns are
+    compiled lazily here (on each spec's first compile()) rather than up
+    front; the shared banned set is compiled once on load.
+    """
+    bundle = None
+    if not rebuild and os.path.exists(bundle_path):
+        try:
+            with open(bundle_path, "r", encoding="utf-8") as f:
+                bundle = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            bundle = None
+
+    if bundle is not None:
+        same_inputs = (
+            bundle.get("format") == BUNDLE_FORMAT
+            and bundle.get("manifest_path") == os.path.abspath(manifest_path)
+            and bundle.get("banned_path") == (os.path.abspath(banned_path) if banned_path else None)
+        )
+        fresh, touched = _check_sources(bundle) if same_inputs else (False, False)
+        if fresh:
+            if touched:
+                _write_bundle(bundle, bundle_path)
+            manifest = SuiteManifest.from_dict(bundle["manifest"])
+            categories = _categories_from_bundle(bundle)
+            assign_content_hashes(categories, bundle["banned"], preamble_text)
+            return manifest, categories
+        print(f"[LLMTestHarness] Suite bundle {bundle_path} is stale; rebuilding", file=sys.stderr, flush=True)
+
+    manifest, categories, banned = build_bundle(bundle_path, manifest_path, banned_path)
+    assign_content_hashes(categories, banned, preamble_text)
+    return manifest, categories
@@ -0,0 +1,178 @@
+"""
+On-disk response cache for model calls.
+
+Wraps the callable returned by run_harness.load_provider so repeated runs
+against the same provider / model / preamble / prompt reuse the stored
+response instead of calling the API again. Handy when iterating on suite
+JSON or regexes: only prompts that actually changed cost a model call.
+
+Modes:
+  readthrough -> use a cached response if there is one, otherwise call the
+                 model and store what it returns
+  refresh     -> always call the model and overwrite the cached response
+  offline     -> never call the model; a cache miss is an error
+
+Token usage is stored with each response, and a hit comes back as a
+ModelResponse carrying it, so token and cost roll-ups still count cached
+tests. Rows written before usage was stored come back without usage.
+
+The cache is a single SQLite file in WAL mode. Each thread gets its own
+connection, so it is safe to share one cache across concurrent workers
+(and across processes pointing at the same file).
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Awaitable, Callable, Optional
+
+from .models import ModelResponse
+
+CACHE_MODES = ("readthrough", "refresh", "offline")
+
+
+class ResponseCacheError(Exception):
+    pass
+
+
+def preamble_hash(preamble: Optional[str]) -> str:
+    return hashlib.sha256((preamble or "").encode("utf-8")).hexdigest()
+
+
+def cache_key(provider: str, model: str, preamble: Optional[str], prompt: str) -> str:
+    raw = json.dumps([provider, model, preamble_hash(preamble), prompt], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " provider TEXT NOT NULL,"
+            " model TEXT NOT NULL,"
+            " preamble_sha256 TEXT NOT NULL,"
+            " prompt TEXT NOT NULL,"
+            " response TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " usage TEXT)"
+        )
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(responses)")}
+        if "usage" not in columns:
+            # Caches created before usage was stored.
+            conn.execute("ALTER TABLE responses ADD COLUMN usage TEXT")
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[ModelResponse]:
+        row = self._conn().execute(
+            "SELECT response, usage FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return ModelResponse(row[0], json.loads(row[1]) if row[1] else None)
+
+    def put(
+        self,
+        key: str,
+        provider: str,
+        model: str,
+        preamble: Optional[str],
+        prompt: str,
+        response: str,
+    ) -> None:
+        usage = getattr(response, "usage", None)
+        usage = json.dumps(usage) if usage else None
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses"
+            " (key, provider, model, preamble_sha256, prompt, response, created_at, usage)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, provider, model, preamble_hash(preamble), prompt, str(response), time.time(), usage),
+        )
+        conn.commit()
+
+
+def cached_call_model(
+    call_model: Optional[Callable[[str], str]],
+    cache: ResponseCache,
+    provider: str,
+    model: str,
+    preamble: Optional[str],
+    mode: str = "readthrough",
+) -> Callable[[str], str]:
+    """
+    Return a callable(prompt:str)->str that goes through `cache` according to
+    `mode`. `call_model` may be None in offline mode.
+    """
+    if mode not in CACHE_MODES:
+        raise ResponseCacheError(f"Unknown cache mode '{mode}' (expected one of {', '.join(CACHE_MODES)})")
+    if call_model is None and mode != "offline":
+        raise ResponseCacheError(f"cache mode '{mode}' needs a model to call")
+
+    def _call(prompt: str) -> str:
+        key = cache_key(provider, model, preamble, prompt)
+
+        if mode != "refresh":
+            hit = cache.get(key)
+            if hit is not None:
+                return hit
+            if mode == "offline":
+                raise ResponseCacheError(
+                    f"Offline cache miss for {provider}/{model}: {prompt[:80]!r}"
+                )
+
+        response = call_model(prompt)
+        cache.put(key, provider, model, preamble, prompt, response)
+        return response
+
+    return _call
+
+
+def cached_acall_model(
+    acall_model: Optional[Callable[[str], Awaitable[str]]],
+    cache: ResponseCache,
+    provider: str,
+    model: str,
+    preamble: Optional[str],
+    mode: str = "readthrough",
+) -> Callable[[str], Awaitable[str]]:
+    """
+    Async twin of cached_call_model. Cache lookups are local SQLite reads,
+    so they run inline on the event loop.
+    """
+    if mode not in CACHE_MODES:
+        raise ResponseCacheError(f"Unknown cache mode '{mode}' (expected one of {', '.join(CACHE_MODES)})")
+    if acall_model is None and mode != "offline":
+        raise ResponseCacheError(f"cache mode '{mode}' needs a model to call")
+
+    async def _call(prompt: str) -> str:
+        key = cache_key(provider, model, preamble, prompt)
+
+        if mode != "refresh":
+            hit = cache.get(key)
+            if hit is not None:
+                return hit
+            if mode == "offline":
+                raise ResponseCacheError(
+                    f"Offline cache miss for {provider}/{model}: {prompt[:80]!r}"
+                )
+
+        response = await acall_model(prompt)
+        cache.put(key, provider, model, preamble, prompt, response)
+        return response
+
+    return _call
@@ -0,0 +1,166 @@
+"""
+Checkpoint / resume support for long suite runs.
+
+While run_suite works through a suite, each scored result is appended to
+a JSONL checkpoint file. If the run dies part way (provider outage, CI
+timeout, Ctrl-C), a later run with the same checkpoint and resume=True
+reloads those results and only calls the model for the tests that are
+left. The final FullSuiteResult is the same as an uninterrupted run.
+
+The file's first line records a hash of the suite (test ids, prompts and
+assert specs, plus anything else the caller folds in, like provider,
+model and preamble). A checkpoint written for a different suite is never
+reused.
+
+Batch runs also record each batch job they submit, and mark it collected
+once its results are in. A run killed while polling leaves the job
+pending, and resuming polls that job instead of paying for a new one.
+"""
+
+import hashlib
+import json
+import os
+import sys
+from typing import Dict, List, Optional, Tuple
+
+from .matcher import PATTERNS
+from .models import SuiteManifest, CategoryFile, SingleTestResult
+
+
+def test_key(category_id: str, test_id: str) -> str:
+    return f"{category_id}::{test_id}"
+
+
+def suite_hash(
+    manifest: SuiteManifest,
+    categories: List[CategoryFile],
+    extra: Optional[Dict[str, str]] = None,
+) -> str:
+    """
+    Hash everything that affects a test's outcome. `extra` lets callers mix
+    in run settings (provider, model, preamble hash, ...). A banned list
+    shared by many tests is hashed once, with each test pointing at it.
+    """
+    banned_lists: List[List[str]] = []
+    banned_index: Dict[int, int] = {}
+    tests = []
+    for cat in categories:
+        for t in cat.tests:
+            spec = t.assert_spec
+            banned = None
+            if spec.banned is not None:
+                banned = banned_index.get(id(spec.banned))
+                if banned is None:
+                    banned = banned_index[id(spec.banned)] = len(banned_lists)
+                    banned_lists.append(spec.banned.patterns)
+            tests.append([
+                cat.category_id,
+                t.id,
+                t.prompt,
+                spec.required_all,
+                spec.required_any,
+                PATTERNS.patterns(spec.forbidden_any_ids),
+                banned,
+            ])
+    raw = json.dumps(
+        {
+            "suite_name": manifest.suite_name,
+            "suite_version": manifest.suite_version,
+            "tests": tests,
+            "banned": banned_lists,
+            "extra": extra or {},
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class Checkpoint:
+    def __init__(self, path: str, suite_hash: str, resume: bool = False):
+        self.path = path
+        self.suite_hash = suite_hash
+        # Results loaded from an earlier run to resume from (keyed by test_key).
+        self.completed: Dict[str, SingleTestResult] = {}
+        # A batch job submitted but not yet collected: (batch id, suite indexes).
+        self.pending_batch: Optional[Tuple[str, List[int]]] = None
+
+        if resume and os.path.exists(path):
+            self._load()
+
+        if self.completed or self.pending_batch is not None:
+            self._fp = open(path, "a", encoding="utf-8")
+        else:
+            self._fp = open(path, "w", encoding="utf-8")
+            self._write({"type": "checkpoint", "suite_hash": suite_hash})
+
+    def _load(self) -> None:
+        with open(self.path, "r", encoding="utf-8") as f:
+            lines = f.readlines()
+        if not lines:
+            return
+
+        try:
+            header = json.loads(lines[0])
+        except json.JSONDecodeError:
+            header = {}
+        if header.get("suite_hash") != self.suite_hash:
+            print(
+                f"[LLMTestHarness] Checkpoint {self.path} is for a different suite; starting over.",
+                file=sys.stderr,
+            )
+            return
+
+        for line in lines[1:]:
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                # A run killed mid-write can leave a partial last line.
+                continue
+            if rec.get("type") == "result":
+                self.completed[rec["key"]] = SingleTestResult.from_dict(rec["result"])
+            elif rec.get("type") == "batch":
+                if rec.get("state") == "submitted":
+                    self.pending_batch = (rec["batch_id"], rec["indexes"])
+                else:
+                    self.pending_batch = None
+
+        # Rewrite the file so a torn trailing line can't corrupt later appends.
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"type": "checkpoint", "suite_hash": self.suite_hash}) + "\n")
+            for key, result in self.completed.items():
+                f.write(json.dumps(self._record(key, result), ensure_ascii=False) + "\n")
+            if self.pending_batch is not None:
+                f.write(json.dumps(self._batch_record(*self.pending_batch)) + "\n")
+
+    @staticmethod
+    def _record(key: str, result: SingleTestResult) -> Dict:
+        return {"type": "result", "key": key, "result": result.to_dict()}
+
+    @staticmethod
+    def _batch_record(batch_id: str, indexes: List[int]) -> Dict:
+        return {"type": "batch", "batch_id": batch_id, "state": "submitted", "indexes": indexes}
+
+    def _write(self, record) -> None:
+        self._fp.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._fp.flush()
+
+    def record(self, result: SingleTestResult) -> None:
+        # Appended to the file only: `completed` holds just what a resume
+        # loaded, so a checkpointed run's memory stays flat.
+        self._write(self._record(test_key(result.category_id, result.test_id), result))
+
+    def batch_submitted(self, batch_id: str, indexes: List[int]) -> None:
+        """Record a batch job covering the tests at `indexes` (suite order)."""
+        self.pending_batch = (batch_id, list(indexes))
+        self._write(self._batch_record(batch_id, self.pending_batch[1]))
+
+    def batch_collected(self, batch_id: str) -> None:
+        """The job's results are recorded (or it failed); don't resume it."""
+        self.pending_batch = None
+        self._write({"type": "batch", "batch_id": batch_id, "state": "collected"})
+
+    def close(self) -> None:
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
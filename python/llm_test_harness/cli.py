@@ -117,6 +117,18 @@ def main(argv: Optional[list] = None) -> None:
         choices=["summary", "detailed", "verbose"],
         help="How much detail to print."
     )
+    parser.add_argument(
+        "--concurrency",
+        required=False,
+        type=int,
+        default=1,
+        help="How many prompts to keep in flight at once (default 1 = serial)."
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Stop as soon as a red failure is recorded and report partial totals."
+    )
 
     args = parser.parse_args(argv)
 
@@ -137,7 +149,9 @@ def main(argv: Optional[list] = None) -> None:
     full_result = run_suite(
         manifest=manifest,
         categories=categories,
-        call_model=call_model_stub  # <-- replace with your real model call
+        call_model=call_model_stub,  # <-- replace with your real model call
+        concurrency=args.concurrency,
+        fail_fast=args.fail_fast,
     )
 
     # 5. Prepare report
@@ -0,0 +1,60 @@
+"""
+Change-aware incremental runs.
+
+The loader gives every EvalTest a content hash covering its prompt, its
+final assert spec, the banned patterns and the preamble. Given a baseline
+`--mode verbose` run, tests whose hash is unchanged are carried forward
+(their saved response is re-scored, which reproduces the saved verdict) and
+only new or edited tests go to the model. The gate is computed over the
+merged set as usual.
+
+The content hash does not cover the provider or model: the baseline
+should come from a run against the same model.
+"""
+
+from typing import Any, Dict, List, Tuple
+
+from .checkpoint import test_key
+from .merge import trials_from_record
+from .models import CategoryFile, SingleTestResult
+from .runner import _flatten_tests, score_response
+
+
+def carry_forward(
+    categories: List[CategoryFile],
+    baseline: Dict[str, Dict[str, Any]],
+    trials: bool = False,
+) -> Tuple[Dict[str, SingleTestResult], List[str]]:
+    """
+    Split the suite against `baseline` (as returned by rescore.load_saved_run).
+
+    Returns results for the unchanged tests, keyed "category_id::test_id"
+    (ready to pass to run_suite as `carried`), and the keys of the tests
+    that still need to run.
+
+    `trials` says whether this run samples each test repeatedly. A saved
+    result from a run that didn't (or did) is not carried into it; the test
+    runs again. Carried results keep their saved trial stats and
+    stream_aborted flag.
+    """
+    carried: Dict[str, SingleTestResult] = {}
+    to_run: List[str] = []
+
+    for cat, test in _flatten_tests(categories):
+        key = test_key(cat.category_id, test.id)
+        old = baseline.get(key)
+        if (
+            old is None
+            or not old.get("content_hash")
+            or old["content_hash"] != test.content_hash
+            or old.get("response") is None
+            or bool(old.get("trials")) != trials
+        ):
+            to_run.append(key)
+            continue
+        result = score_response(cat, test, old["response"])
+        result.trials = trials_from_record(old)
+        result.stream_aborted = bool(old.get("stream_aborted"))
+        carried[key] = result
+
+    return carried, to_run
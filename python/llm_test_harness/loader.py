@@ -1,15 +1,21 @@
+import hashlib
 import json
 import os
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 
+from .matcher import PATTERNS, InvalidPatternError, PatternSet
 from .models import (
     SuiteManifest,
     CategoryFile,
     EvalTest,
-    AssertSpec,
 )
 
 
+class LoaderError(Exception):
+    pass
+
+
 def load_manifest(manifest_path: str) -> SuiteManifest:
     with open(manifest_path, "r", encoding="utf-8") as f:
         raw = json.load(f)
@@ -28,7 +34,15 @@ def load_banned_forbidden_regexes(banned_path: str) -> List[str]:
     """
     with open(banned_path, "r", encoding="utf-8") as f:
         raw = json.load(f)
-    return list(raw.get("forbidden_regexes_global", []))
+    patterns = list(raw.get("forbidden_regexes_global", []))
+
+    # Validate once here so one bad banned regex is reported against this file,
+    # not against every test it would have been merged into.
+    try:
+        PatternSet(patterns, label="forbidden_regexes_global")
+    except InvalidPatternError as e:
+        raise LoaderError(f"{banned_path}: {e}") from e
+    return patterns
 
 
 def _load_category_file(path: str) -> CategoryFile:
@@ -37,33 +51,120 @@ def _load_category_file(path: str) -> CategoryFile:
     return CategoryFile.from_dict(raw)
 
 
+def banned_pattern_set(banned_forbidden_regexes: List[str]) -> Optional[PatternSet]:
+    """
+    The one PatternSet every test's spec shares for the global banned list
+    (duplicates dropped), or None when there is nothing banned.
+    """
+    if not banned_forbidden_regexes:
+        return None
+    return PatternSet(dict.fromkeys(banned_forbidden_regexes), label="forbidden_regexes_global")
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+
+@lru_cache(maxsize=8)
+def _json_items(ids: Tuple[int, ...]) -> str:
+    """The items of a JSON pattern list, without brackets (memoized for the banned list)."""
+    return _dumps(PATTERNS.patterns(ids))[1:-1]
+
+
+def test_content_hash(
+    test: EvalTest,
+    banned_forbidden_regexes: List[str],
+    preamble_text: Optional[str],
+) -> str:
+    """
+    sha256 over everything that decides a test's outcome: its prompt, its
+    assert spec (after banned patterns are merged), the banned list itself
+    and the preamble the model will see.
+    """
+    return _content_hash(test, _dumps(list(banned_forbidden_regexes)), preamble_text)
+
+
+def _content_hash(test: EvalTest, banned_json: str, preamble_text: Optional[str]) -> str:
+    # The digest is over json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    # of {"prompt", "assert": {"method", "required_all", "required_any",
+    # "forbidden_any"}, "banned", "preamble"}. Those bytes are built here piece
+    # by piece so the banned list, repeated in every test, is serialized once.
+    spec = test.assert_spec
+    banned = spec.banned
+    if banned is None or any(pid in banned.id_set() for pid in spec.forbidden_any_ids):
+        forbidden_json = _dumps(spec.forbidden_any)
+    else:
+        own = _dumps(PATTERNS.patterns(spec.forbidden_any_ids))[1:-1]
+        shared = _json_items(banned.own_ids)
+        forbidden_json = "[" + own + (", " if own and shared else "") + shared + "]"
+
+    h = hashlib.sha256()
+    for part in (
+        '{"assert": {"forbidden_any": ', forbidden_json,
+        ', "method": ', _dumps(spec.method),
+        ', "required_all": ', _dumps(spec.required_all),
+        ', "required_any": ', _dumps(spec.required_any),
+        '}, "banned": ', banned_json,
+        ', "preamble": ', _dumps(preamble_text or ""),
+        ', "prompt": ', _dumps(test.prompt),
+        "}",
+    ):
+        h.update(part.encode("utf-8"))
+    return h.hexdigest()
+
+
 def load_category_files(
     manifest: SuiteManifest,
     manifest_path: str,
     banned_forbidden_regexes: List[str],
+    preamble_text: Optional[str] = None,
 ) -> List[CategoryFile]:
     """
-    Load all category files listed in suite_manifest.json, then inject global
-    forbidden patterns (like company slurs, internal project names, etc.)
-    into each test's assert_spec.forbidden_any.
+    Load all category files listed in suite_manifest.json, then point each
+    test's assert spec at the global forbidden patterns (like company slurs,
+    internal project names, etc.). They form one PatternSet shared by every
+    test (see AssertSpec), so memory and compile time grow with the number
+    of distinct patterns, not tests x banned patterns.
+
+    Every assert spec is compiled here, so a bad regex is reported (with its
+    file and test id) before any model calls are made. Each test also gets
+    its content_hash (see test_content_hash), which covers `preamble_text`.
     """
     base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    banned = banned_pattern_set(banned_forbidden_regexes)
 
     categories: List[CategoryFile] = []
+    errors: List[str] = []
     for rel in manifest.include_files:
         full = os.path.join(base_dir, rel)
         cat = _load_category_file(full)
+        cat.source = rel
 
-        # Inject org-wide forbidden regexes
-        if banned_forbidden_regexes:
-            for test in cat.tests:
-                spec: AssertSpec = test.assert_spec
-                # Deduplicate but preserve order: extend only if not already present
-                for pat in banned_forbidden_regexes:
-                    if pat not in spec.forbidden_any:
-                        spec.forbidden_any.append(pat)
+        for test in cat.tests:
+            test.assert_spec.banned = banned
+            try:
+                test.assert_spec.compile()
+            except InvalidPatternError as e:
+                errors.append(f"{rel} :: {test.id}: {e}")
 
         categories.append(cat)
 
+    if errors:
+        raise LoaderError(
+            "Invalid regex patterns in suite:\n  " + "\n  ".join(errors)
+        )
+
+    assign_content_hashes(categories, banned_forbidden_regexes, preamble_text)
     return categories
 
+
+def assign_content_hashes(
+    categories: List[CategoryFile],
+    banned_forbidden_regexes: List[str],
+    preamble_text: Optional[str],
+) -> None:
+    """Set content_hash on every test (specs already pointed at the banned set)."""
+    banned_json = _dumps(list(banned_forbidden_regexes))
+    for cat in categories:
+        for test in cat.tests:
+            test.content_hash = _content_hash(test, banned_json, preamble_text)
@@ -1,12 +1,338 @@
 import re
-from typing import List, Tuple
+import threading
+from functools import lru_cache
+from itertools import chain
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
 
+try:
+    from re import _parser as _sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover - older Pythons
+    import sre_parse as _sre_parse
 
+
+class InvalidPatternError(ValueError):
+    """Raised when a pattern in a PatternSet does not compile."""
+
+    def __init__(self, pattern: str, error: re.error, label: str = ""):
+        self.pattern = pattern
+        self.error = error
+        self.label = label
+        where = f"{label}: " if label else ""
+        super().__init__(f"{where}invalid regex {pattern!r}: {error}")
+
+
+@lru_cache(maxsize=4096)
 def _compile(pat: str) -> re.Pattern:
     # We do DOTALL so "." matches newlines. Most patterns already embed (?i) for case-insensitivity.
     return re.compile(pat, re.DOTALL)
 
 
+# Non-ASCII characters that IGNORECASE matching treats as equal to an ASCII
+# letter. Folding them first keeps the literal prefilter from ever skipping
+# a pattern the real regex would have matched.
+_FOLD_TABLE = str.maketrans({"\u0130": "i", "\u0131": "i", "\u017f": "s", "\u212a": "k"})
+
+
+@lru_cache(maxsize=64)
+def _fold(text: str) -> str:
+    return text.translate(_FOLD_TABLE).lower()
+
+
+# (id, pattern, compiled regex, required literal); see PatternTable.entry.
+_Entry = Tuple[int, str, re.Pattern, Optional[Tuple[str, bool]]]
+
+
+def _literal_runs(items, icase: bool) -> Iterator[Tuple[str, bool]]:
+    """
+    Yield (literal, ignorecase) runs that every match of the parsed pattern
+    must contain. Anything optional or alternating just ends the current run.
+    """
+    C = _sre_parse
+    run: List[str] = []
+    for op, av in items:
+        if op is C.LITERAL:
+            run.append(chr(av))
+            continue
+        if run:
+            yield "".join(run), icase
+            run = []
+        if op is C.SUBPATTERN:
+            _group, add_flags, del_flags, sub = av
+            sub_icase = (icase or bool(add_flags & re.IGNORECASE)) and not (del_flags & re.IGNORECASE)
+            yield from _literal_runs(sub, sub_icase)
+        elif op in (C.MAX_REPEAT, C.MIN_REPEAT) and av[0] >= 1:
+            yield from _literal_runs(av[2], icase)
+    if run:
+        yield "".join(run), icase
+
+
+def _required_literal(pat: str) -> Optional[Tuple[str, bool]]:
+    """
+    The longest literal that must appear in any match of `pat`, as
+    (literal, ignorecase), or None when there isn't a usable one.
+    Case-insensitive literals are lowercased and limited to ASCII.
+    """
+    try:
+        parsed = _sre_parse.parse(pat, re.DOTALL)
+    except Exception:
+        return None
+    flags = parsed.state.flags
+    if flags & re.LOCALE:
+        return None
+
+    best: Optional[Tuple[str, bool]] = None
+    for lit, icase in _literal_runs(parsed, bool(flags & re.IGNORECASE)):
+        if icase:
+            if not lit.isascii():
+                continue
+            lit = lit.lower()
+        if best is None or len(lit) > len(best[0]):
+            best = (lit, icase)
+    return best
+
+
+# Repeat opcodes; POSSESSIVE_REPEAT and ATOMIC_GROUP only exist on 3.11+.
+_REPEATS = tuple(getattr(_sre_parse, op) for op in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT") if hasattr(_sre_parse, op))
+_ATOMIC_GROUP = getattr(_sre_parse, "ATOMIC_GROUP", None)
+
+
+def _lookbehind_total(items) -> int:
+    C = _sre_parse
+    total = 0
+    for op, av in items:
+        if op in (C.ASSERT, C.ASSERT_NOT):
+            direction, sub = av
+            if direction < 0:
+                total += sub.getwidth()[1]
+            total += _lookbehind_total(sub)
+        elif op is C.SUBPATTERN:
+            total += _lookbehind_total(av[3])
+        elif op in _REPEATS:
+            total += _lookbehind_total(av[2])
+        elif op is C.BRANCH:
+            total += max((_lookbehind_total(sub) for sub in av[1]), default=0)
+        elif op is C.GROUPREF_EXISTS:
+            total += max(_lookbehind_total(av[1]), _lookbehind_total(av[2]) if av[2] else 0)
+        elif _ATOMIC_GROUP is not None and op is _ATOMIC_GROUP:
+            total += _lookbehind_total(av)
+    return total
+
+
+@lru_cache(maxsize=4096)
+def lookbehind_width(pat: str) -> int:
+    """
+    How many characters before a match's start `pat` can look at, through
+    lookbehinds (nested ones add up). 0 if it has none or doesn't parse.
+    """
+    try:
+        return _lookbehind_total(_sre_parse.parse(pat, re.DOTALL))
+    except Exception:
+        return 0
+
+
+class PatternTable:
+    """
+    Interns pattern strings: each distinct pattern gets a small int id and
+    is compiled (and its prefilter literal worked out) at most once, however
+    many tests or sets use it.
+
+    Specs and results hold ids rather than strings, so a banned list shared
+    by every test costs one entry per pattern, not one per test. Ids are only
+    meaningful within a process; anything written out uses the strings.
+
+    Thread-safe.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids: Dict[str, int] = {}
+        self._patterns: List[str] = []
+        # id -> (id, pattern, compiled, required literal); None until first compiled.
+        self._entries: List[Optional[_Entry]] = []
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def intern(self, pattern: str) -> int:
+        pid = self._ids.get(pattern)
+        if pid is None:
+            with self._lock:
+                pid = self._ids.get(pattern)
+                if pid is None:
+                    pid = len(self._patterns)
+                    self._patterns.append(pattern)
+                    self._entries.append(None)
+                    self._ids[pattern] = pid
+        return pid
+
+    def intern_all(self, patterns: Iterable[str]) -> Tuple[int, ...]:
+        return tuple(self.intern(p) for p in patterns)
+
+    def pattern(self, pid: int) -> str:
+        return self._patterns[pid]
+
+    def patterns(self, ids: Iterable[int]) -> List[str]:
+        table = self._patterns
+        return [table[pid] for pid in ids]
+
+    def entry(self, pid: int, label: str = "") -> _Entry:
+        """The compiled entry for `pid`; raises InvalidPatternError if it doesn't compile."""
+        entry = self._entries[pid]
+        if entry is None:
+            pat = self._patterns[pid]
+            try:
+                rx = re.compile(pat, re.DOTALL)
+            except re.error as e:
+                raise InvalidPatternError(pat, e, label) from e
+            # Two threads may both compile a new pattern; either result is fine.
+            entry = self._entries[pid] = (pid, pat, rx, _required_literal(pat))
+        return entry
+
+
+# The process-wide table every PatternSet uses unless given another.
+PATTERNS = PatternTable()
+
+_NO_IDS: FrozenSet[int] = frozenset()
+
+
+class PatternSet:
+    """
+    An ordered list of regex patterns compiled once up front.
+
+    Hit / miss lists come back as the original pattern strings, in the
+    original order, exactly like which_patterns_match / which_patterns_missing
+    (or as PatternTable ids, from hit_ids / missing_ids).
+
+    Large banned lists are mostly misses, so each pattern carries the longest
+    literal any match must contain. A response is folded once per check, and
+    a pattern's regex only runs when its literal is present; the literal test
+    is a necessary condition, so the hit lists are unchanged.
+
+    `shared` appends another set (the global banned list) after this one's
+    own patterns, skipping any already among them. It is referenced, not
+    copied, so one banned set serves every test.
+    """
+
+    def __init__(
+        self,
+        patterns: Iterable[str] = (),
+        label: str = "",
+        shared: Optional["PatternSet"] = None,
+        table: Optional[PatternTable] = None,
+    ):
+        table = PATTERNS if table is None else table
+        self._init(table.intern_all(patterns), label, shared, table)
+
+    @classmethod
+    def from_ids(
+        cls,
+        ids: Tuple[int, ...],
+        label: str = "",
+        shared: Optional["PatternSet"] = None,
+        table: Optional[PatternTable] = None,
+    ) -> "PatternSet":
+        pset = cls.__new__(cls)
+        pset._init(tuple(ids), label, shared, PATTERNS if table is None else table)
+        return pset
+
+    def _init(self, ids: Tuple[int, ...], label: str, shared: Optional["PatternSet"], table: PatternTable) -> None:
+        if shared is not None and (shared.shared is not None or shared.table is not table):
+            raise ValueError("a shared PatternSet must be flat and use the same PatternTable")
+        self.table = table
+        self.label = label
+        self.own_ids = ids
+        self.shared = shared
+        self._entries: List[_Entry] = [table.entry(pid, label) for pid in ids]
+        self._own_set: Optional[FrozenSet[int]] = None
+        # Shared patterns this set already has itself: scanned once, in its own place.
+        self._skip = _NO_IDS
+        if shared is not None and ids:
+            shared_ids = shared.id_set()
+            self._skip = frozenset(pid for pid in ids if pid in shared_ids) or _NO_IDS
+
+    def id_set(self) -> FrozenSet[int]:
+        """This set's own ids (not the shared set's), for membership tests."""
+        if self._own_set is None:
+            self._own_set = frozenset(self.own_ids)
+        return self._own_set
+
+    @property
+    def ids(self) -> Tuple[int, ...]:
+        """Every pattern id, own then shared, in scan order."""
+        if self.shared is None:
+            return self.own_ids
+        skip = self._skip
+        return self.own_ids + tuple(pid for pid in self.shared.own_ids if pid not in skip)
+
+    @property
+    def patterns(self) -> List[str]:
+        return self.table.patterns(self.ids)
+
+    def __len__(self) -> int:
+        if self.shared is None:
+            return len(self.own_ids)
+        return len(self.own_ids) + len(self.shared.own_ids) - len(self._skip)
+
+    def lookbehind_width(self) -> int:
+        """The widest lookbehind context any pattern in the set needs (see lookbehind_width)."""
+        return max((lookbehind_width(e[1]) for e in self._ordered()), default=0)
+
+    def _ordered(self) -> Iterable[_Entry]:
+        if self.shared is None:
+            return self._entries
+        shared = self.shared._entries
+        skip = self._skip
+        return chain(self._entries, shared if not skip else (e for e in shared if e[0] not in skip))
+
+    def _scan(
+        self,
+        text: str,
+        search: Optional[Callable[[str, re.Pattern, str, int], Optional[re.Match]]] = None,
+        pos: int = 0,
+        settled: Optional[int] = None,
+    ) -> List[bool]:
+        """
+        One hit flag per pattern, in `ids` order. `search(pattern, compiled,
+        text, pos)` replaces the plain regex search for patterns that pass the
+        prefilter; the profiler uses it to time (or guard) each search.
+
+        Only matches starting at or after `pos` count, as with re's own `pos`
+        (lookbehinds and \\b still see the text before it). With `settled`,
+        a match must also end at or before that index: streaming uses it to
+        ignore matches that more text could still undo.
+        """
+        window = text[pos:] if pos else text
+        folded = None
+        hits = []
+        for _pid, pat, rx, literal in self._ordered():
+            if literal is not None:
+                lit, icase = literal
+                if icase:
+                    if folded is None:
+                        folded = _fold(window)
+                    if lit not in folded:
+                        hits.append(False)
+                        continue
+                elif lit not in window:
+                    hits.append(False)
+                    continue
+            m = search(pat, rx, text, pos) if search is not None else rx.search(text, pos)
+            hits.append(m is not None and (settled is None or m.end() <= settled))
+        return hits
+
+    def hit_ids(self, text: str, pos: int = 0, settled: Optional[int] = None) -> Tuple[int, ...]:
+        return tuple(e[0] for e, hit in zip(self._ordered(), self._scan(text, None, pos, settled)) if hit)
+
+    def missing_ids(self, text: str) -> Tuple[int, ...]:
+        return tuple(e[0] for e, hit in zip(self._ordered(), self._scan(text)) if not hit)
+
+    def which_match(self, text: str, pos: int = 0, settled: Optional[int] = None) -> List[str]:
+        return self.table.patterns(self.hit_ids(text, pos, settled))
+
+    def which_missing(self, text: str) -> List[str]:
+        return self.table.patterns(self.missing_ids(text))
+
+
 def which_patterns_match(text: str, patterns: List[str]) -> List[str]:
     hits = []
     for pat in patterns:
@@ -21,4 +347,3 @@ def which_patterns_missing(text: str, patterns: List[str]) -> List[str]:
         if not _compile(pat).search(text):
             missing.append(pat)
     return missing
-
@@ -0,0 +1,231 @@
+"""
+Matrix runs: several provider / model / preamble targets against one suite.
+
+The suite is loaded and its patterns compiled once; every target then runs
+it on its own thread, at the same time, so wall time is bounded by the
+slowest model rather than the sum. The result is a gate per target plus a
+side-by-side table of each test's status across targets.
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from .checkpoint import test_key
+from .matcher import InvalidPatternError
+from .metrics import ModelPrice
+from .models import SuiteManifest, CategoryFile, FullSuiteResult, SingleTestResult
+from .observer import RunObserver
+from .runner import RunnerError, run_suite, _flatten_tests, _summary_json
+from .profiler import PatternMonitor
+from .trials import TrialPolicy
+
+
+_GATE_ORDER = {"GREEN": 0, "YELLOW": 1, "RED": 2}
+
+_STATUS_SHORT = {
+    "pass": "pass",
+    "yellow_fail": "YELLOW",
+    "red_fail": "RED",
+    "eval_error": "ERROR",
+}
+
+
+@dataclass
+class MatrixTarget:
+    name: str                        # label used in output, e.g. "gpt-4o"
+    provider: str                    # "mock" | "openai" | "claude"
+    model: Optional[str] = None      # None = the provider's env var / default
+    preamble: Optional[str] = None   # path; None = the run's --preamble
+
+
+def load_matrix(path: str) -> List[MatrixTarget]:
+    """
+    Load a matrix file:
+
+        {"targets": [
+            {"name": "gpt-4o", "provider": "openai", "model": "gpt-4o"},
+            {"name": "sonnet", "provider": "claude", "preamble": "alt_preamble.txt"}
+        ]}
+
+    `name` defaults to "provider:model" (or just the provider).
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+
+    targets = []
+    for i, entry in enumerate(raw.get("targets", [])):
+        if "provider" not in entry:
+            raise RunnerError(f"{path}: target #{i+1} has no 'provider'.")
+        provider = entry["provider"]
+        model = entry.get("model")
+        name = entry.get("name") or (f"{provider}:{model}" if model else provider)
+        targets.append(MatrixTarget(
+            name=name,
+            provider=provider,
+            model=model,
+            preamble=entry.get("preamble"),
+        ))
+
+    if not targets:
+        raise RunnerError(f"{path}: no targets.")
+    names = [t.name for t in targets]
+    dupes = sorted({n for n in names if names.count(n) > 1})
+    if dupes:
+        raise RunnerError(f"{path}: duplicate target names: {', '.join(dupes)}")
+    return targets
+
+
+def run_matrix(
+    manifest: SuiteManifest,
+    categories: List[CategoryFile],
+    targets: List[MatrixTarget],
+    make_call_model: Callable[[MatrixTarget], Callable[[str], str]],
+    concurrency: int = 1,
+    fail_fast: bool = False,
+    trials: Optional[TrialPolicy] = None,
+    monitor: Optional[PatternMonitor] = None,
+    prices: Optional[Dict[str, ModelPrice]] = None,
+    observer: Optional[RunObserver] = None,
+    streaming: bool = False,
+) -> Dict[str, FullSuiteResult]:
+    """
+    Run the suite against every target at once.
+
+    make_call_model(target) -> call_model(prompt) -> str
+    builds each target's provider callable (with its own model and preamble);
+    with streaming=True it returns text chunks instead (see run_suite).
+
+    `concurrency` and `trials` apply per target; one `monitor` profiles
+    pattern matching across all of them. `prices` maps target name to the
+    price of its model, for cost estimates. One `observer` sees every
+    target's events, labelled with the target name. Results come back keyed
+    by target name, in the order the targets were given.
+    """
+    # Compile the suite once, up front; every target's run then reuses the
+    # cached CompiledAssertSpec instead of racing to build its own.
+    test_items = _flatten_tests(categories)
+    if not test_items:
+        raise RunnerError("No tests loaded from categories.")
+    for cat, test in test_items:
+        try:
+            test.assert_spec.compile()
+        except InvalidPatternError as e:
+            raise RunnerError(f"{cat.category_id}::{test.id}: {e}") from e
+
+    call_models = {t.name: make_call_model(t) for t in targets}
+
+    with ThreadPoolExecutor(max_workers=len(targets)) as pool:
+        futures = {
+            t.name: pool.submit(
+                run_suite,
+                manifest=manifest,
+                categories=categories,
+                call_model=call_models[t.name],
+                concurrency=concurrency,
+                fail_fast=fail_fast,
+                label=t.name,
+                trials=trials,
+                monitor=monitor,
+                price=(prices or {}).get(t.name),
+                observer=observer,
+                streaming=streaming,
+            )
+            for t in targets
+        }
+        return {name: fut.result() for name, fut in futures.items()}
+
+
+def matrix_gate(results: Dict[str, FullSuiteResult]) -> str:
+    """The worst gate across all targets."""
+    return max((r.summary.gate for r in results.values()), key=_GATE_ORDER.__getitem__)
+
+
+def compare_statuses(results: Dict[str, FullSuiteResult]) -> List[Dict[str, Any]]:
+    """
+    One row per test, in suite order: its status under each target
+    (None if that target didn't run it), and whether the targets disagree.
+    """
+    by_target = {
+        name: {test_key(r.category_id, r.test_id): r.status for r in full.results}
+        for name, full in results.items()
+    }
+
+    order: Dict[str, SingleTestResult] = {}
+    for full in results.values():
+        for r in full.results:
+            order.setdefault(test_key(r.category_id, r.test_id), r)
+
+    rows = []
+    for key, r in order.items():
+        statuses = {name: by_target[name].get(key) for name in results}
+        rows.append({
+            "categoryId": r.category_id,
+            "testId": r.test_id,
+            "statuses": statuses,
+            "differs": len(set(statuses.values())) > 1,
+        })
+    return rows
+
+
+def format_matrix_json(results: Dict[str, FullSuiteResult], mode: str) -> Dict[str, Any]:
+    """
+    JSON for summary / verbose matrix runs: overall gate, each target's
+    summary, and the status comparison (only differing tests in summary mode).
+    """
+    rows = compare_statuses(results)
+    if mode == "summary":
+        rows = [row for row in rows if row["differs"]]
+
+    return {
+        "gate": matrix_gate(results),
+        "targets": {name: _summary_json(full.summary) for name, full in results.items()},
+        "comparison": rows,
+    }
+
+
+def format_matrix_table(results: Dict[str, FullSuiteResult], only_differences: bool = False) -> str:
+    """
+    Human-readable side-by-side table: per-target gates and totals (pass,
+    red, yellow, eval_error, and tests not run, which add up to the suite),
+    then one line per test with its status under each target.
+    """
+    names = list(results)
+    rows = compare_statuses(results)
+    if only_differences:
+        rows = [row for row in rows if row["differs"]]
+
+    labels = [test_key(row["categoryId"], row["testId"]) for row in rows]
+    id_width = max([len("TEST")] + [len(label) for label in labels])
+    widths = [max(len(n), 6) for n in names]
+
+    def _line(first: str, cells: List[str]) -> str:
+        return "  ".join([first.ljust(id_width)] + [c.ljust(w) for c, w in zip(cells, widths)]).rstrip()
+
+    lines = []
+    lines.append(f"=== LLMTestHarness Matrix — overall gate: {matrix_gate(results)} ===")
+    for name in names:
+        summary = results[name].summary
+        t = summary.totals
+        # Every test is counted once: eval errors gate RED, and fail-fast
+        # leaves the rest not run.
+        not_run = f", not run {summary.tests_not_run}" if summary.tests_not_run else ""
+        lines.append(
+            f"{name}: {summary.gate} "
+            f"(pass {t.pass_count}, red {t.fail_red_count}, yellow {t.fail_yellow_count}, "
+            f"eval_error {t.eval_error_count}{not_run})"
+        )
+    lines.append("")
+
+    if not rows:
+        lines.append("All targets agree on every test.")
+        return "\n".join(lines)
+
+    lines.append(_line("TEST", names))
+    for row, label in zip(rows, labels):
+        cells = [_STATUS_SHORT.get(row["statuses"][n], "-") for n in names]
+        marker = " *" if row["differs"] and not only_differences else ""
+        lines.append(_line(label, cells) + marker)
+
+    return "\n".join(lines)
@@ -0,0 +1,139 @@
+"""
+Merge shard outputs back into one suite result.
+
+Each shard of a sharded run (see selection.py) writes its own results,
+either `--mode verbose` JSON or a `--jsonl-out` stream. merge_runs reads
+them all and recomputes the gate and totals over the union, so the merged
+gate is the one a single unsharded run would have produced.
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+from .checkpoint import test_key
+from .matcher import PATTERNS
+from .models import CategoryFile, FullSuiteResult, SingleTestResult, TrialStats
+from .runner import RunnerError, build_full_result, _USAGE_JSON_KEYS
+
+
+_USAGE_FROM_JSON = {v: k for k, v in _USAGE_JSON_KEYS.items()}
+
+
+def _read_records(path: str) -> List[Dict[str, Any]]:
+    """Result records from a verbose JSON file or a JSONL result stream."""
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    try:
+        raw = json.loads(text)
+    except json.JSONDecodeError:
+        raw = None
+    if raw is None or (isinstance(raw, dict) and "type" in raw):
+        # JSONL: one record per line, results tagged "type": "result". An
+        # empty shard's stream is just its summary line.
+        records = []
+        for line in text.splitlines():
+            if line.strip():
+                rec = json.loads(line)
+                if rec.get("type") == "result":
+                    records.append(rec)
+        return records
+    if not isinstance(raw, dict) or "results" not in raw:
+        raise RunnerError(f"{path} is not a verbose run (no 'results' list).")
+    return raw["results"]
+
+
+def trials_from_record(rec: Dict[str, Any]) -> Optional[TrialStats]:
+    """The TrialStats of a verbose / JSONL record, if it was a trials run."""
+    t = rec.get("trials")
+    if not t:
+        return None
+    return TrialStats(
+        runs=t["runs"],
+        passes=t["passes"],
+        red_fails=t["redFails"],
+        yellow_fails=t["yellowFails"],
+        failure_rate=t["failureRate"],
+        ci_low=t["failureRateCi95"][0],
+        ci_high=t["failureRateCi95"][1],
+        stopped_early=t["stoppedEarly"],
+    )
+
+
+def result_from_record(rec: Dict[str, Any]) -> SingleTestResult:
+    """Rebuild a SingleTestResult from its verbose / JSONL record."""
+    category_id, _, category_name = rec["category"].partition(" - ")
+    trials = trials_from_record(rec)
+
+    usage = None
+    if rec.get("usage"):
+        usage = {_USAGE_FROM_JSON.get(k, k): v for k, v in rec["usage"].items()}
+
+    return SingleTestResult(
+        test_id=rec["test_id"],
+        category_id=category_id,
+        category_name=category_name,
+        status=rec["status"],
+        severity=rec["severity"],
+        prompt=rec.get("prompt") or "",
+        response=rec.get("response") or "",
+        missing_required_all_ids=PATTERNS.intern_all(rec.get("missing_required_all") or []),
+        hit_forbidden_any_ids=PATTERNS.intern_all(rec.get("hit_forbidden_any") or []),
+        matched_required_any_ids=PATTERNS.intern_all(rec.get("matched_required_any") or []),
+        usage=usage,
+        trials=trials,
+        content_hash=rec.get("content_hash"),
+        eval_error_ids=PATTERNS.intern_all(rec.get("eval_errors") or []),
+        latency_ms=rec.get("latency_ms"),
+        ttft_ms=rec.get("ttft_ms"),
+        cost_usd=rec.get("cost_usd"),
+        stream_aborted=bool(rec.get("stream_aborted")),
+    )
+
+
+def merge_runs(paths: List[str], categories: Optional[List[CategoryFile]] = None) -> FullSuiteResult:
+    """
+    Combine several shard outputs into one FullSuiteResult. A test that
+    shows up in more than one input is an error (overlapping shards), and
+    so, given the suite, is a suite test that shows up in none of them.
+
+    Given the loaded suite, results are put back in suite order (unknown
+    tests last) and get their spec's expected patterns, which the records
+    don't carry, so the merged report reads like an unsharded one.
+    Without it, results stay in file order.
+    """
+    results: Dict[str, SingleTestResult] = {}
+    source: Dict[str, str] = {}
+    for path in paths:
+        for rec in _read_records(path):
+            result = result_from_record(rec)
+            key = test_key(result.category_id, result.test_id)
+            if key in results:
+                raise RunnerError(f"{result.test_id} appears in both {source[key]} and {path}.")
+            source[key] = path
+            results[key] = result
+
+    keys = list(results)
+    if categories is not None:
+        position: Dict[str, int] = {}
+        missing: List[str] = []
+        for cat in categories:
+            for test in cat.tests:
+                key = test_key(cat.category_id, test.id)
+                position[key] = len(position)
+                r = results.get(key)
+                if r is not None:
+                    r.spec = test.assert_spec
+                else:
+                    missing.append(key)
+        if missing:
+            # A crashed shard or a file left off the command line: the gate
+            # over what's left could be GREEN for a suite that never ran.
+            shown = ", ".join(missing[:5]) + (", ..." if len(missing) > 5 else "")
+            raise RunnerError(
+                f"{len(missing)} of {len(position)} suite tests are in none of the merged files "
+                f"(missing shard?): {shown}"
+            )
+        keys.sort(key=lambda k: position.get(k, len(position)))
+    elif not results:
+        raise RunnerError("No results found in the merged files.")
+    return build_full_result([results[k] for k in keys])
@@ -0,0 +1,161 @@
+"""
+Per-test latency, token and cost metrics.
+
+The runner times every model call and stores it on the result
+(latency_ms, plus ttft_ms from streaming providers). With a price table
+(--pricing) each result also gets an estimated cost from its token usage.
+MetricsTally rolls those up as results stream past into p50 / p95 / p99
+latencies, token totals and cost, for the whole run and per category.
+That is the data for sizing --concurrency and model-call budgets.
+"""
+
+import json
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from .models import LatencyStats, RunMetrics, SingleTestResult
+
+
+@dataclass
+class ModelPrice:
+    """
+    USD per million tokens. Cache prices default to the plain input price
+    when the provider doesn't discount (or charge extra for) them.
+    """
+    input: float
+    output: float
+    cached_input: Optional[float] = None
+    cache_write_input: Optional[float] = None
+
+    def cost(self, usage: Dict[str, int]) -> float:
+        """Estimated cost in USD of one call's usage (keys as in ModelResponse)."""
+        cached = usage.get("cached_input_tokens", 0) or 0
+        written = usage.get("cache_write_input_tokens", 0) or 0
+        fresh = max(0, (usage.get("input_tokens", 0) or 0) - cached - written)
+        cached_price = self.input if self.cached_input is None else self.cached_input
+        write_price = self.input if self.cache_write_input is None else self.cache_write_input
+        total = (
+            fresh * self.input
+            + cached * cached_price
+            + written * write_price
+            + (usage.get("output_tokens", 0) or 0) * self.output
+        )
+        return total / 1_000_000
+
+
+def load_pricing(path: str) -> Dict[str, ModelPrice]:
+    """
+    Load a price table keyed by model name, in USD per million tokens:
+
+        {
+          "gpt-4o-mini": {"input": 0.15, "cached_input": 0.075, "output": 0.60},
+          "claude-3-5-sonnet-latest": {"input": 3.00, "cached_input": 0.30,
+                                       "cache_write_input": 3.75, "output": 15.00}
+        }
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+    if not isinstance(raw, dict):
+        raise ValueError(f"{path}: expected an object keyed by model name.")
+
+    prices: Dict[str, ModelPrice] = {}
+    for model, entry in raw.items():
+        try:
+            prices[model] = ModelPrice(
+                input=float(entry["input"]),
+                output=float(entry["output"]),
+                cached_input=None if entry.get("cached_input") is None else float(entry["cached_input"]),
+                cache_write_input=None if entry.get("cache_write_input") is None else float(entry["cache_write_input"]),
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"{path}: bad price for '{model}' (needs numeric input and output): {e}") from e
+    return prices
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """
+    The q-th percentile (0-100) of already-sorted values, interpolating
+    linearly between the closest ranks.
+    """
+    if not sorted_values:
+        raise ValueError("percentile of no values")
+    pos = (len(sorted_values) - 1) * q / 100
+    lo = math.floor(pos)
+    hi = math.ceil(pos)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+
+def latency_stats(values: List[float]) -> Optional[LatencyStats]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return LatencyStats(
+        count=len(ordered),
+        p50=percentile(ordered, 50),
+        p95=percentile(ordered, 95),
+        p99=percentile(ordered, 99),
+        max=ordered[-1],
+        mean=sum(ordered) / len(ordered),
+    )
+
+
+class _Group:
+    def __init__(self):
+        self.tests = 0
+        self.latencies: List[float] = []
+        self.ttfts: List[float] = []
+        self.usage: Dict[str, int] = {}
+        self.cost: Optional[float] = None
+
+    def add(self, result: SingleTestResult) -> None:
+        self.tests += 1
+        if result.latency_ms is not None:
+            self.latencies.append(result.latency_ms)
+        if result.ttft_ms is not None:
+            self.ttfts.append(result.ttft_ms)
+        if result.usage:
+            for key, n in result.usage.items():
+                self.usage[key] = self.usage.get(key, 0) + (n or 0)
+        if result.cost_usd is not None:
+            self.cost = (self.cost or 0.0) + result.cost_usd
+
+    def metrics(self) -> RunMetrics:
+        return RunMetrics(
+            tests=self.tests,
+            latency=latency_stats(self.latencies),
+            ttft=latency_stats(self.ttfts),
+            usage=dict(self.usage),
+            cost_usd=self.cost,
+        )
+
+
+class MetricsTally:
+    """
+    Collects per-test timings, usage and cost for the run and per category.
+    Holds one float or two per test, never the results themselves.
+    """
+
+    def __init__(self):
+        self._overall = _Group()
+        self._categories: Dict[str, _Group] = {}
+
+    def add(self, result: SingleTestResult) -> None:
+        self._overall.add(result)
+        group = self._categories.get(result.category_id)
+        if group is None:
+            group = self._categories[result.category_id] = _Group()
+        group.add(result)
+
+    @property
+    def empty(self) -> bool:
+        o = self._overall
+        return not (o.latencies or o.ttfts or o.cost is not None)
+
+    def overall(self) -> Optional[RunMetrics]:
+        return None if self.empty else self._overall.metrics()
+
+    def by_category(self) -> Dict[str, RunMetrics]:
+        if self.empty:
+            return {}
+        return {cat_id: group.metrics() for cat_id, group in self._categories.items()}
@@ -1,12 +1,14 @@
 from __future__ import annotations
+import dataclasses
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 
+from .matcher import PATTERNS, PatternSet
 
 
 # ---------- Manifest / test config models ----------
 
-@dataclass
+@dataclass(slots=True)
 class SuiteManifest:
     suite_name: str
     suite_version: str
@@ -24,12 +26,85 @@ class SuiteManifest:
         )
 
 
-@dataclass
+@dataclass(slots=True)
+class CompiledAssertSpec:
+    required_all: PatternSet
+    required_any: PatternSet
+    forbidden_any: PatternSet
+
+
+@dataclass(slots=True)
 class AssertSpec:
+    """
+    A test's checks. Patterns are held as PATTERNS ids (see matcher.py); the
+    string lists are properties.
+
+    The global banned list is not copied into each test: the loader points
+    `banned` at one PatternSet shared by the whole suite. forbidden_any is
+    the test's own patterns followed by the banned ones it doesn't already
+    have, as if they had been merged in.
+    """
     method: str  # "regex"
-    required_all: List[str]     # MUST all appear (legal must-say); missing -> RED
-    required_any: List[str]     # At least one should appear; otherwise -> YELLOW
-    forbidden_any: List[str]    # NONE may appear; if any appear -> RED
+    required_all_ids: Tuple[int, ...]   # MUST all appear (legal must-say); missing -> RED
+    required_any_ids: Tuple[int, ...]   # At least one should appear; otherwise -> YELLOW
+    forbidden_any_ids: Tuple[int, ...]  # NONE may appear; if any appear -> RED (the test's own)
+
+    # Set by the loader before compile(); shared, never copied.
+    banned: Optional[PatternSet] = field(default=None, repr=False, compare=False)
+
+    # Filled in by compile(); the loader does this once after `banned` is set.
+    compiled: Optional[CompiledAssertSpec] = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def of(
+        cls,
+        method: str,
+        required_all: List[str],
+        required_any: List[str],
+        forbidden_any: List[str],
+        banned: Optional[PatternSet] = None,
+    ) -> "AssertSpec":
+        """A spec from pattern strings."""
+        return cls(
+            method=method,
+            required_all_ids=PATTERNS.intern_all(required_all),
+            required_any_ids=PATTERNS.intern_all(required_any),
+            forbidden_any_ids=PATTERNS.intern_all(forbidden_any),
+            banned=banned,
+        )
+
+    @property
+    def required_all(self) -> List[str]:
+        return PATTERNS.patterns(self.required_all_ids)
+
+    @property
+    def required_any(self) -> List[str]:
+        return PATTERNS.patterns(self.required_any_ids)
+
+    @property
+    def forbidden_ids(self) -> Tuple[int, ...]:
+        """The test's own forbidden ids, then the banned ones it lacks."""
+        if self.banned is None:
+            return self.forbidden_any_ids
+        own = set(self.forbidden_any_ids)
+        return self.forbidden_any_ids + tuple(pid for pid in self.banned.own_ids if pid not in own)
+
+    @property
+    def forbidden_any(self) -> List[str]:
+        return PATTERNS.patterns(self.forbidden_ids)
+
+    def compile(self) -> CompiledAssertSpec:
+        """
+        Compile (and cache) every pattern in this spec.
+        Raises matcher.InvalidPatternError on the first bad regex.
+        """
+        if self.compiled is None:
+            self.compiled = CompiledAssertSpec(
+                required_all=PatternSet.from_ids(self.required_all_ids, label="required_all"),
+                required_any=PatternSet.from_ids(self.required_any_ids, label="required_any"),
+                forbidden_any=PatternSet.from_ids(self.forbidden_any_ids, label="forbidden_any", shared=self.banned),
+            )
+        return self.compiled
 
     @classmethod
     def from_dict(cls, d: Dict[str, Any]) -> "AssertSpec":
@@ -47,21 +122,20 @@ class AssertSpec:
         if not forbidden_any and "forbidden_patterns" in d:
             forbidden_any = list(d.get("forbidden_patterns", []))
 
-        return cls(
-            method=d["method"],
-            required_all=list(required_all),
-            required_any=list(required_any),
-            forbidden_any=list(forbidden_any),
-        )
+        return cls.of(d["method"], required_all, required_any, forbidden_any)
 
 
-@dataclass
+@dataclass(slots=True)
 class EvalTest:
     id: str
     prompt: str
     expected_behavior: str
     assert_spec: AssertSpec
 
+    # sha256 over everything that decides this test's outcome (prompt, final
+    # assert spec, banned patterns, preamble). Set by the loader.
+    content_hash: Optional[str] = field(default=None, compare=False)
+
     @classmethod
     def from_dict(cls, d: Dict[str, Any]) -> "EvalTest":
         return cls(
@@ -72,13 +146,17 @@ class EvalTest:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class CategoryFile:
     category_id: str
     category_name: str
     category_description: str
     tests: List[EvalTest]
 
+    # Path of the category file relative to the manifest, e.g.
+    # "verticals/aviation/LLM06.excessive_agency.aviation.json". Set by the loader.
+    source: Optional[str] = None
+
     @classmethod
     def from_dict(cls, d: Dict[str, Any]) -> "CategoryFile":
         tests = [EvalTest.from_dict(t) for t in d.get("tests", [])]
@@ -92,13 +170,65 @@ class CategoryFile:
 
 # ---------- Runtime result models ----------
 
-@dataclass
+class ModelResponse(str):
+    """
+    A model's reply text that can also carry provider token usage.
+
+    Providers may return this instead of a plain str; it behaves exactly like
+    the text everywhere else. `usage` uses these keys (all optional ints):
+      input_tokens            -> every prompt token, cached or not
+      cached_input_tokens     -> prompt tokens served from the provider's prefix cache
+      cache_write_input_tokens -> prompt tokens written to the cache (Anthropic)
+      output_tokens
+
+    Streamed responses (see streaming.py) also carry `ttft_ms`, the time to
+    the first token, and `stream_aborted`, set when generation was cancelled
+    on a forbidden match.
+    """
+
+    usage: Optional[Dict[str, int]]
+    ttft_ms: Optional[float]
+    stream_aborted: bool
+
+    def __new__(
+        cls,
+        text: str,
+        usage: Optional[Dict[str, int]] = None,
+        ttft_ms: Optional[float] = None,
+        stream_aborted: bool = False,
+    ) -> "ModelResponse":
+        obj = super().__new__(cls, text)
+        obj.usage = usage
+        obj.ttft_ms = ttft_ms
+        obj.stream_aborted = stream_aborted
+        return obj
+
+
+@dataclass(slots=True)
+class TrialStats:
+    """
+    How a test fared over repeated samples (--trials). A "failure" is any
+    trial that did not pass; the interval is a 95% Wilson score interval
+    on the failure rate.
+    """
+    runs: int
+    passes: int
+    red_fails: int       # includes eval_error trials
+    yellow_fails: int
+    failure_rate: float
+    ci_low: float
+    ci_high: float
+    stopped_early: bool = False  # verdict settled before max_trials
+
+
+@dataclass(slots=True)
 class SingleTestResult:
     test_id: str
     category_id: str
     category_name: str
 
-    # status is one of: "pass", "yellow_fail", "red_fail"
+    # status is one of: "pass", "yellow_fail", "red_fail", "eval_error"
+    # ("eval_error": a pattern blew the match time budget; gated as red)
     status: str
 
     # severity is: "red", "yellow", or "none" (derived from status)
@@ -107,34 +237,181 @@ class SingleTestResult:
     prompt: str
     response: str
 
+    # Pattern outcomes as PATTERNS ids (see matcher.py); the properties
+    # below give the pattern strings.
     # Which strict rules were missed?
-    missing_required_all: List[str]
+    missing_required_all_ids: Tuple[int, ...]
 
     # Which forbidden rules were triggered?
-    hit_forbidden_any: List[str]
+    hit_forbidden_any_ids: Tuple[int, ...]
 
     # Which "good" patterns we matched (from required_any)?
-    matched_required_any: List[str]
+    matched_required_any_ids: Tuple[int, ...]
+
+    # The spec the response was scored against, shared with the suite (not
+    # copied), for the expected_* properties. None for results read back
+    # from a file until matched to their test.
+    spec: Optional[AssertSpec] = field(default=None, repr=False, compare=False)
+
+    # Token usage reported by the provider (see ModelResponse); None if unknown.
+    usage: Optional[Dict[str, int]] = None
+
+    # Set when the test was sampled more than once; the fields above then
+    # describe the worst trial (first red, else first yellow, else first pass).
+    trials: Optional[TrialStats] = None
+
+    # EvalTest.content_hash at the time the test was run.
+    content_hash: Optional[str] = None
+
+    # Patterns abandoned for exceeding the match time budget (see profiler.py).
+    eval_error_ids: Tuple[int, ...] = ()
+
+    # Wall time of the model call (summed over trials), time to first token
+    # (streaming providers only) and estimated cost from --pricing. None when
+    # unknown, e.g. for results carried forward or re-scored without a call.
+    latency_ms: Optional[float] = None
+    ttft_ms: Optional[float] = None
+    cost_usd: Optional[float] = None
+
+    # Streaming run cancelled generation on a forbidden match; `response` is
+    # the partial text (see streaming.py).
+    stream_aborted: bool = False
+
+    @property
+    def missing_required_all(self) -> List[str]:
+        return PATTERNS.patterns(self.missing_required_all_ids)
+
+    @property
+    def hit_forbidden_any(self) -> List[str]:
+        return PATTERNS.patterns(self.hit_forbidden_any_ids)
+
+    @property
+    def matched_required_any(self) -> List[str]:
+        return PATTERNS.patterns(self.matched_required_any_ids)
+
+    @property
+    def eval_errors(self) -> List[str]:
+        return PATTERNS.patterns(self.eval_error_ids)
+
+    @property
+    def expected_required_all(self) -> List[str]:
+        return self.spec.required_all if self.spec is not None else []
+
+    @property
+    def expected_required_any(self) -> List[str]:
+        return self.spec.required_any if self.spec is not None else []
+
+    @property
+    def expected_forbidden_any(self) -> List[str]:
+        return self.spec.forbidden_any if self.spec is not None else []
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-ready fields, patterns as strings (ids don't outlive the process)."""
+        return {
+            "test_id": self.test_id,
+            "category_id": self.category_id,
+            "category_name": self.category_name,
+            "status": self.status,
+            "severity": self.severity,
+            "prompt": self.prompt,
+            "response": self.response,
+            "missing_required_all": self.missing_required_all,
+            "hit_forbidden_any": self.hit_forbidden_any,
+            "matched_required_any": self.matched_required_any,
+            "usage": self.usage,
+            "trials": None if self.trials is None else dataclasses.asdict(self.trials),
+            "content_hash": self.content_hash,
+            "eval_errors": self.eval_errors,
+            "latency_ms": self.latency_ms,
+            "ttft_ms": self.ttft_ms,
+            "cost_usd": self.cost_usd,
+            "stream_aborted": self.stream_aborted,
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "SingleTestResult":
+        """Inverse of to_dict; also reads older records, which carried expected_* lists."""
+        trials = d.get("trials")
+        return cls(
+            test_id=d["test_id"],
+            category_id=d["category_id"],
+            category_name=d["category_name"],
+            status=d["status"],
+            severity=d["severity"],
+            prompt=d["prompt"],
+            response=d["response"],
+            missing_required_all_ids=PATTERNS.intern_all(d.get("missing_required_all") or []),
+            hit_forbidden_any_ids=PATTERNS.intern_all(d.get("hit_forbidden_any") or []),
+            matched_required_any_ids=PATTERNS.intern_all(d.get("matched_required_any") or []),
+            usage=d.get("usage"),
+            trials=TrialStats(**trials) if trials else None,
+            content_hash=d.get("content_hash"),
+            eval_error_ids=PATTERNS.intern_all(d.get("eval_errors") or []),
+            latency_ms=d.get("latency_ms"),
+            ttft_ms=d.get("ttft_ms"),
+            cost_usd=d.get("cost_usd"),
+            stream_aborted=bool(d.get("stream_aborted")),
+        )
+
 
-    expected_required_all: List[str] = field(default_factory=list)
-    expected_required_any: List[str] = field(default_factory=list)
-    expected_forbidden_any: List[str] = field(default_factory=list)
+@dataclass(slots=True)
+class LatencyStats:
+    """Distribution of a per-test timing, in milliseconds."""
+    count: int
+    p50: float
+    p95: float
+    p99: float
+    max: float
+    mean: float
 
 
-@dataclass
+@dataclass(slots=True)
+class RunMetrics:
+    """
+    Latency, token and cost roll-up for a group of results (the whole run,
+    or one category).
+    """
+    tests: int
+    latency: Optional[LatencyStats] = None
+    ttft: Optional[LatencyStats] = None
+    usage: Dict[str, int] = field(default_factory=dict)
+    cost_usd: Optional[float] = None
+
+
+@dataclass(slots=True)
 class SuiteResultTotals:
     pass_count: int
     fail_red_count: int
     fail_yellow_count: int
+    eval_error_count: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class SuiteResultSummary:
     gate: str  # "GREEN" | "YELLOW" | "RED"
     totals: SuiteResultTotals
 
+    # Token usage summed over every result that reported it (see ModelResponse).
+    usage: Dict[str, int] = field(default_factory=dict)
+
+    # Set when a fail-fast run stopped on its first red failure.
+    stopped_early: bool = False
+    tests_not_run: int = 0
+    first_red_fail: Optional[str] = None  # "category_id::test_id"
+
+    # Set when the run ended on an error (e.g. a failed batch job): the
+    # totals only cover what was scored before it, and the gate is RED.
+    error: Optional[str] = None
+
+    # Model calls made across all trials (only set for --trials runs).
+    trial_runs: int = 0
+
+    # Latency / token / cost roll-ups; None when no result reported any.
+    metrics: Optional[RunMetrics] = None
+    category_metrics: Dict[str, RunMetrics] = field(default_factory=dict)
+
 
-@dataclass
+@dataclass(slots=True)
 class FullSuiteResult:
     summary: SuiteResultSummary
     results: List[SingleTestResult]
@@ -0,0 +1,357 @@
+"""
+Run events for progress displays, dashboards and schedulers.
+
+The runner reports what it is doing to a RunObserver:
+
+    run_started        once per run, with the test count
+    test_started       a test was picked up (a worker is about to call the model)
+    response_received  one model call came back (once per trial)
+    call_failed        a model call raised; the run aborts right after
+    test_scored        a test's final result, fresh or reused from a
+                       checkpoint / baseline
+    run_finished       once per run, with the summary
+
+Every hook is a no-op on the base class, so an observer only overrides
+what it needs. test_started, response_received and call_failed are called
+from worker threads (or the event loop for async runs), the rest from the
+thread driving the run, so observers must be thread-safe. Several runs
+(matrix targets) can share one observer; `label` tells them apart (None
+for a plain run).
+
+Built in:
+    LogObserver         the classic "Running test i/N" line per test
+    ProgressObserver    one throttled status line: done / in flight,
+                        throughput, ETA, red / yellow counts
+    PrometheusTextExporter
+                        a Prometheus text format (0.0.4) file, rewritten
+                        atomically, for the node_exporter textfile
+                        collector or any scheduler that can read it
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import IO, Dict, List, Optional
+
+from .models import SingleTestResult, SuiteResultSummary
+
+
+class RunObserver:
+    def run_started(self, label: Optional[str], total: int, to_run: int) -> None:
+        pass
+
+    def test_started(self, label: Optional[str], index: int, total: int, category_id: str, test_id: str) -> None:
+        pass
+
+    def response_received(self, label: Optional[str], index: int, latency_ms: Optional[float]) -> None:
+        pass
+
+    def call_failed(self, label: Optional[str], index: int, error: BaseException) -> None:
+        pass
+
+    def test_scored(self, label: Optional[str], index: int, result: SingleTestResult, reused: bool) -> None:
+        pass
+
+    def run_finished(self, label: Optional[str], summary: SuiteResultSummary) -> None:
+        pass
+
+
+class MultiObserver(RunObserver):
+    """Fans every event out to several observers, in order."""
+
+    def __init__(self, observers: List[RunObserver]):
+        self.observers = list(observers)
+
+    def run_started(self, label, total, to_run):
+        for o in self.observers:
+            o.run_started(label, total, to_run)
+
+    def test_started(self, label, index, total, category_id, test_id):
+        for o in self.observers:
+            o.test_started(label, index, total, category_id, test_id)
+
+    def response_received(self, label, index, latency_ms):
+        for o in self.observers:
+            o.response_received(label, index, latency_ms)
+
+    def call_failed(self, label, index, error):
+        for o in self.observers:
+            o.call_failed(label, index, error)
+
+    def test_scored(self, label, index, result, reused):
+        for o in self.observers:
+            o.test_scored(label, index, result, reused)
+
+    def run_finished(self, label, summary):
+        for o in self.observers:
+            o.run_finished(label, summary)
+
+
+def _prefix(label: Optional[str]) -> str:
+    return f"[LLMTestHarness] [{label}]" if label else "[LLMTestHarness]"
+
+
+class LogObserver(RunObserver):
+    """
+    One stderr line per test as it starts (the runner's default).
+    """
+
+    def __init__(self, stream: Optional[IO[str]] = None):
+        self.stream = stream
+
+    def test_started(self, label, index, total, category_id, test_id):
+        stream = self.stream or sys.stderr
+        # One write per line, so lines from concurrent runs don't interleave.
+        stream.write(f"{_prefix(label)} Running test {index+1}/{total}: {category_id}::{test_id}\n")
+        stream.flush()
+
+
+def _format_duration(seconds: float) -> str:
+    seconds = int(round(seconds))
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+class ProgressObserver(RunObserver):
+    """
+    A single progress line, redrawn at most every `interval` seconds:
+
+        [LLMTestHarness] 120/500 done, 8 in flight | 4.1 tests/s | ETA 1m33s | 3 red, 12 yellow
+
+    On a terminal the line is redrawn in place; otherwise (CI logs) a new
+    line is written per update. Throughput only counts tests scored in this
+    process, not ones reused from a checkpoint or baseline. Matrix runs are
+    shown as one combined line.
+    """
+
+    def __init__(self, stream: Optional[IO[str]] = None, interval: float = 1.0):
+        self.stream = stream or sys.stderr
+        self.interval = interval
+        self._tty = hasattr(self.stream, "isatty") and self.stream.isatty()
+        self._lock = threading.Lock()
+        self._total = 0
+        self._done = 0
+        self._fresh = 0
+        self._in_flight = 0
+        self._red = 0
+        self._yellow = 0
+        self._started: Optional[float] = None
+        self._last_draw = 0.0
+        self._runs_open = 0
+
+    def run_started(self, label, total, to_run):
+        with self._lock:
+            self._total += total
+            self._runs_open += 1
+            if self._started is None:
+                # First line after one interval, once the rate means something.
+                self._started = self._last_draw = time.monotonic()
+
+    def test_started(self, label, index, total, category_id, test_id):
+        with self._lock:
+            self._in_flight += 1
+
+    def call_failed(self, label, index, error):
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - 1)
+
+    def test_scored(self, label, index, result, reused):
+        with self._lock:
+            self._done += 1
+            if not reused:
+                self._fresh += 1
+                self._in_flight = max(0, self._in_flight - 1)
+            if result.severity == "red":
+                self._red += 1
+            elif result.severity == "yellow":
+                self._yellow += 1
+            self._draw(force=False)
+
+    def run_finished(self, label, summary):
+        with self._lock:
+            self._runs_open -= 1
+            if self._runs_open == 0:
+                self._draw(force=True)
+                if self._tty:
+                    self.stream.write("\n")
+                    self.stream.flush()
+
+    def _line(self, now: float) -> str:
+        elapsed = now - (self._started or now)
+        parts = [f"{self._done}/{self._total} done, {self._in_flight} in flight"]
+        if self._fresh and elapsed > 0:
+            rate = self._fresh / elapsed
+            parts.append(f"{rate:.1f} tests/s")
+            remaining = self._total - self._done
+            if remaining:
+                parts.append(f"ETA {_format_duration(remaining / rate)}")
+        parts.append(f"{self._red} red, {self._yellow} yellow")
+        return "[LLMTestHarness] " + " | ".join(parts)
+
+    def _draw(self, force: bool) -> None:
+        now = time.monotonic()
+        if not force and now - self._last_draw < self.interval:
+            return
+        self._last_draw = now
+        line = self._line(now)
+        if self._tty:
+            self.stream.write("\r\x1b[K" + line)
+        else:
+            self.stream.write(line + "\n")
+        self.stream.flush()
+
+
+_STATUSES = ("pass", "yellow_fail", "red_fail", "eval_error")
+
+
+class _RunCounters:
+    def __init__(self):
+        self.total = 0
+        self.in_flight = 0
+        self.completed: Dict[str, int] = {s: 0 for s in _STATUSES}
+        self.calls = 0
+        self.call_errors = 0
+        self.finished = False
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class PrometheusTextExporter(RunObserver):
+    """
+    Publishes live run state as a Prometheus text format (0.0.4) file, the
+    format the node_exporter textfile collector reads:
+
+        llmth_tests                       tests in the run
+        llmth_tests_in_flight             tests waiting on the model right now
+        llmth_tests_completed_total       scored tests, by status
+        llmth_model_calls_total           model calls that returned
+        llmth_model_call_errors_total     model calls that raised
+        llmth_run_finished                1 once the run is over
+        llmth_last_update_timestamp_seconds
+
+    Series carry a `target` label on matrix runs. The file is rewritten at
+    most every `interval` seconds, via a temp file and rename, so readers
+    never see a partial file; it is always written when a run starts and
+    finishes.
+    """
+
+    def __init__(self, path: str, interval: float = 5.0):
+        self.path = path
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._runs: Dict[Optional[str], _RunCounters] = {}
+        self._last_write = 0.0
+
+    def _counters(self, label: Optional[str]) -> _RunCounters:
+        c = self._runs.get(label)
+        if c is None:
+            c = self._runs[label] = _RunCounters()
+        return c
+
+    def run_started(self, label, total, to_run):
+        with self._lock:
+            self._counters(label).total = total
+            self._write(force=True)
+
+    def test_started(self, label, index, total, category_id, test_id):
+        with self._lock:
+            self._counters(label).in_flight += 1
+            self._write(force=False)
+
+    def response_received(self, label, index, latency_ms):
+        with self._lock:
+            self._counters(label).calls += 1
+            self._write(force=False)
+
+    def call_failed(self, label, index, error):
+        with self._lock:
+            c = self._counters(label)
+            c.call_errors += 1
+            c.in_flight = max(0, c.in_flight - 1)
+            self._write(force=True)
+
+    def test_scored(self, label, index, result, reused):
+        with self._lock:
+            c = self._counters(label)
+            c.completed[result.status] = c.completed.get(result.status, 0) + 1
+            if not reused:
+                c.in_flight = max(0, c.in_flight - 1)
+            self._write(force=False)
+
+    def run_finished(self, label, summary):
+        with self._lock:
+            c = self._counters(label)
+            c.finished = True
+            c.in_flight = 0
+            self._write(force=True)
+
+    def render(self) -> str:
+        """The exposition text for the current state."""
+        def labels(label: Optional[str], **extra: str) -> str:
+            pairs = ([("target", label)] if label is not None else []) + list(extra.items())
+            if not pairs:
+                return ""
+            return "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in pairs) + "}"
+
+        runs = list(self._runs.items())
+        lines = [
+            "# HELP llmth_tests Tests in the run.",
+            "# TYPE llmth_tests gauge",
+        ]
+        lines += [f"llmth_tests{labels(l)} {c.total}" for l, c in runs]
+        lines += [
+            "# HELP llmth_tests_in_flight Tests waiting on the model.",
+            "# TYPE llmth_tests_in_flight gauge",
+        ]
+        lines += [f"llmth_tests_in_flight{labels(l)} {c.in_flight}" for l, c in runs]
+        lines += [
+            "# HELP llmth_tests_completed_total Scored tests by status.",
+            "# TYPE llmth_tests_completed_total counter",
+        ]
+        for l, c in runs:
+            for status, n in c.completed.items():
+                lines.append(f"llmth_tests_completed_total{labels(l, status=status)} {n}")
+        lines += [
+            "# HELP llmth_model_calls_total Model calls that returned a response.",
+            "# TYPE llmth_model_calls_total counter",
+        ]
+        lines += [f"llmth_model_calls_total{labels(l)} {c.calls}" for l, c in runs]
+        lines += [
+            "# HELP llmth_model_call_errors_total Model calls that raised an error.",
+            "# TYPE llmth_model_call_errors_total counter",
+        ]
+        lines += [f"llmth_model_call_errors_total{labels(l)} {c.call_errors}" for l, c in runs]
+        lines += [
+            "# HELP llmth_run_finished 1 once the run has finished.",
+            "# TYPE llmth_run_finished gauge",
+        ]
+        lines += [f"llmth_run_finished{labels(l)} {int(c.finished)}" for l, c in runs]
+        lines += [
+            "# HELP llmth_last_update_timestamp_seconds When this file was written.",
+            "# TYPE llmth_last_update_timestamp_seconds gauge",
+            f"llmth_last_update_timestamp_seconds {time.time():.3f}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def _write(self, force: bool) -> None:
+        now = time.monotonic()
+        if not force and now - self._last_write < self.interval:
+            return
+        self._last_write = now
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".llmth-", suffix=".prom.tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.render())
+            os.replace(tmp, self.path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
@@ -0,0 +1,252 @@
+"""
+Per-pattern match profiling and a ReDoS time budget.
+
+A PatternMonitor, handed to the runner, sits between scoring and the
+PatternSets. It records how many times each regex ran and how long it took,
+so the slowest patterns across a run can be reported.
+
+With a time budget it also protects the run from catastrophic
+backtracking. Python can't interrupt a regex running on a worker thread,
+so budgeted searches run in guard subprocesses (one per scoring thread).
+In the guard, each search gets its own SIGALRM timer: a pattern that blows
+the budget is abandoned and reported, and the remaining patterns still
+run. If a guard stops answering altogether, it is killed and restarted,
+and every pattern in that set is reported. The test then gets the
+"eval_error" status, which gates like a red failure.
+
+Where SIGALRM doesn't exist (Windows), only the kill-and-restart fallback
+applies.
+"""
+
+import multiprocessing
+import re
+import signal
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .matcher import PatternSet
+
+
+# Extra seconds a guard gets, beyond the per-pattern budgets, before it is
+# presumed hung and killed.
+GUARD_GRACE_SECONDS = 5.0
+
+
+class _BudgetExceeded(Exception):
+    pass
+
+
+def _raise_budget_exceeded(signum, frame):
+    raise _BudgetExceeded()
+
+
+def _guard_main(conn, budget: float) -> None:
+    """Guard subprocess loop: (patterns, text, pos, settled) in, (hits, over_budget, timings) out."""
+    use_alarm = hasattr(signal, "setitimer")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _raise_budget_exceeded)
+    sets: Dict[Tuple[str, ...], PatternSet] = {}
+
+    while True:
+        try:
+            patterns, text, pos, settled = conn.recv()
+        except EOFError:
+            return
+
+        key = tuple(patterns)
+        pset = sets.get(key)
+        if pset is None:
+            if len(sets) >= 4096:
+                sets.clear()
+            pset = sets[key] = PatternSet(patterns)
+
+        over: List[str] = []
+        timings: List[Tuple[str, float]] = []
+
+        def _search(pat: str, rx: re.Pattern, text: str, pos: int) -> Optional[re.Match]:
+            start = time.perf_counter()
+            hit = None
+            try:
+                try:
+                    if use_alarm:
+                        signal.setitimer(signal.ITIMER_REAL, budget)
+                    hit = rx.search(text, pos)
+                finally:
+                    if use_alarm:
+                        signal.setitimer(signal.ITIMER_REAL, 0)
+            except _BudgetExceeded:
+                over.append(pat)
+            timings.append((pat, time.perf_counter() - start))
+            return hit
+
+        hits = pset._scan(text, _search, pos, settled)
+        conn.send((hits, over, timings))
+
+
+class _Guard:
+    """One guard subprocess and the pipe to it."""
+
+    def __init__(self, budget: float):
+        self.budget = budget
+        ctx = multiprocessing.get_context("spawn")
+        self._conn, child = ctx.Pipe()
+        self._proc = ctx.Process(target=_guard_main, args=(child, budget), daemon=True)
+        self._proc.start()
+        child.close()
+
+    def scan(
+        self, patterns: List[str], text: str, pos: int = 0, settled: Optional[int] = None,
+    ) -> Optional[Tuple[List[bool], List[str], List[Tuple[str, float]]]]:
+        """The guard's answer, or None if it hung or died (it is killed in that case)."""
+        try:
+            self._conn.send((patterns, text, pos, settled))
+            if self._conn.poll(self.budget * max(1, len(patterns)) + GUARD_GRACE_SECONDS):
+                return self._conn.recv()
+        except (OSError, EOFError):
+            pass
+        self.close()
+        return None
+
+    @property
+    def alive(self) -> bool:
+        return self._proc.is_alive()
+
+    def close(self) -> None:
+        if self._proc.is_alive():
+            self._proc.kill()
+        self._proc.join()
+        self._conn.close()
+
+
+class PatternMonitor:
+    """
+    Times every regex search made through it and, with `budget_seconds`,
+    enforces a per-search time limit (see module docstring).
+
+    Thread-safe: concurrent runs share one monitor.
+    """
+
+    def __init__(self, budget_seconds: Optional[float] = None):
+        self.budget = budget_seconds
+        self._lock = threading.Lock()
+        # pattern -> [calls, total seconds, max seconds, times over budget]
+        self._stats: Dict[str, List[Any]] = {}
+        self._local = threading.local()
+        self._guards: List[_Guard] = []
+
+    def _record(self, pattern: str, seconds: float, over_budget: bool = False) -> None:
+        with self._lock:
+            stat = self._stats.get(pattern)
+            if stat is None:
+                stat = self._stats[pattern] = [0, 0.0, 0.0, 0]
+            stat[0] += 1
+            stat[1] += seconds
+            stat[2] = max(stat[2], seconds)
+            if over_budget:
+                stat[3] += 1
+
+    def _guard(self) -> _Guard:
+        guard = getattr(self._local, "guard", None)
+        if guard is None or not guard.alive:
+            guard = _Guard(self.budget)
+            self._local.guard = guard
+            with self._lock:
+                self._guards.append(guard)
+        return guard
+
+    def scan(
+        self, patterns: PatternSet, text: str, pos: int = 0, settled: Optional[int] = None,
+    ) -> Tuple[List[bool], List[str]]:
+        """
+        (hit flag per pattern, patterns that blew the budget). A pattern over
+        budget counts as neither hit nor miss; callers must drop it from both.
+        `pos` and `settled` are as for PatternSet._scan.
+        """
+        if not len(patterns):
+            return [], []
+
+        if self.budget is None:
+            def _timed(pat: str, rx: re.Pattern, text: str, pos: int) -> Optional[re.Match]:
+                start = time.perf_counter()
+                hit = rx.search(text, pos)
+                self._record(pat, time.perf_counter() - start)
+                return hit
+
+            return patterns._scan(text, _timed, pos, settled), []
+
+        answer = self._guard().scan(patterns.patterns, text, pos, settled)
+        if answer is None:
+            # The guard hung past every budget and was killed: nothing in this
+            # set can be trusted.
+            for pat in patterns.patterns:
+                self._record(pat, self.budget, over_budget=True)
+            return [False] * len(patterns), list(patterns.patterns)
+
+        hits, over, timings = answer
+        over_set = set(over)
+        for pat, seconds in timings:
+            self._record(pat, seconds, over_budget=pat in over_set)
+        return hits, over
+
+    def hit_ids(
+        self, patterns: PatternSet, text: str, pos: int = 0, settled: Optional[int] = None,
+    ) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+        """(ids of patterns that hit, ids of patterns over budget)."""
+        hits, over = self.scan(patterns, text, pos, settled)
+        return tuple(pid for pid, hit in zip(patterns.ids, hits) if hit), patterns.table.intern_all(over)
+
+    def missing_ids(self, patterns: PatternSet, text: str) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+        """(ids of patterns that missed, ids of patterns over budget)."""
+        hits, over = self.scan(patterns, text)
+        over_ids = patterns.table.intern_all(over)
+        over_set = set(over_ids)
+        return tuple(pid for pid, hit in zip(patterns.ids, hits) if not hit and pid not in over_set), over_ids
+
+    def which_match(
+        self, patterns: PatternSet, text: str, pos: int = 0, settled: Optional[int] = None,
+    ) -> Tuple[List[str], List[str]]:
+        ids, over = self.hit_ids(patterns, text, pos, settled)
+        return patterns.table.patterns(ids), patterns.table.patterns(over)
+
+    def which_missing(self, patterns: PatternSet, text: str) -> Tuple[List[str], List[str]]:
+        ids, over = self.missing_ids(patterns, text)
+        return patterns.table.patterns(ids), patterns.table.patterns(over)
+
+    def slowest(self, n: int = 10) -> List[Dict[str, Any]]:
+        """
+        The `n` patterns with the most cumulative match time. `calls` counts
+        regex searches actually run (the literal prefilter skips most).
+        """
+        with self._lock:
+            rows = sorted(self._stats.items(), key=lambda item: -item[1][1])[:n]
+        return [
+            {
+                "pattern": pat,
+                "calls": calls,
+                "totalMs": round(total * 1000, 3),
+                "maxMs": round(worst * 1000, 3),
+                "overBudget": over,
+            }
+            for pat, (calls, total, worst, over) in rows
+        ]
+
+    def close(self) -> None:
+        with self._lock:
+            guards, self._guards = self._guards, []
+        for guard in guards:
+            guard.close()
+
+
+def format_pattern_profile(rows: List[Dict[str, Any]]) -> str:
+    """Human-readable slowest-patterns table for detailed / triage output."""
+    lines = ["Slowest patterns (cumulative match time):"]
+    if not rows:
+        lines.append("  (no regex searches ran)")
+    for row in rows:
+        flag = f"  ⏱ over budget {row['overBudget']}x" if row["overBudget"] else ""
+        lines.append(
+            f"  {row['totalMs']:>10.3f} ms total  {row['maxMs']:>9.3f} ms max  "
+            f"{row['calls']:>7} calls  {row['pattern']}{flag}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,112 @@
+"""
+Re-score a saved verbose run without calling the model.
+
+`--mode verbose` output already holds every prompt and response. This
+module feeds those saved responses back through the current manifest,
+category files and banned list, producing a fresh gate plus a list of
+tests whose status changed. Useful when only regexes were edited.
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from .checkpoint import test_key
+from .models import SuiteManifest, CategoryFile, FullSuiteResult, SingleTestResult
+from .profiler import PatternMonitor
+from .runner import RunnerError, _flatten_tests, score_response, build_full_result
+
+
+def record_key(rec: Dict[str, Any]) -> str:
+    """test_key for a verbose result record ("category" is "<id> - <name>")."""
+    return test_key(rec["category"].partition(" - ")[0], rec["test_id"])
+
+
+def load_saved_run(path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Load a `--mode verbose` JSON file and index its results by
+    "category_id::test_id" (test ids are only unique within a category).
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+    if "results" not in raw:
+        raise RunnerError(f"{path} is not a verbose run (no 'results' list).")
+    return {record_key(r): r for r in raw["results"]}
+
+
+def rescore_suite(
+    manifest: SuiteManifest,
+    categories: List[CategoryFile],
+    saved: Dict[str, Dict[str, Any]],
+    monitor: Optional[PatternMonitor] = None,
+) -> Tuple[FullSuiteResult, List[Dict[str, str]]]:
+    """
+    Score every test in `categories` against its saved response.
+
+    Returns the new FullSuiteResult plus the tests that could not be
+    re-scored: ones missing from the saved run, ones whose prompt has
+    changed since (the saved response answered a different question), and
+    streamed responses cut short by a forbidden pattern that is no longer
+    forbidden (the rest of the response was never generated). Other
+    stream_aborted results keep the flag: their abort still holds.
+
+    A `monitor` (see profiler.py) profiles pattern cost against these real
+    responses without calling the model.
+    """
+    results: List[SingleTestResult] = []
+    skipped: List[Dict[str, str]] = []
+
+    for cat, test in _flatten_tests(categories):
+        old = saved.get(test_key(cat.category_id, test.id))
+        if old is None:
+            skipped.append({"categoryId": cat.category_id, "testId": test.id, "reason": "not in saved run"})
+            continue
+        if old.get("prompt") != test.prompt:
+            skipped.append({"categoryId": cat.category_id, "testId": test.id, "reason": "prompt changed"})
+            continue
+        aborted = bool(old.get("stream_aborted"))
+        # The abort stands only while every pattern that hit is still forbidden.
+        hits = set(old.get("hit_forbidden_any") or ())
+        if aborted and (not hits or not hits <= set(test.assert_spec.compile().forbidden_any.patterns)):
+            skipped.append({"categoryId": cat.category_id, "testId": test.id, "reason": "stream was aborted"})
+            continue
+        result = score_response(cat, test, old.get("response") or "", monitor)
+        result.stream_aborted = aborted
+        results.append(result)
+
+    if not results:
+        raise RunnerError("No tests in the saved run match the current suite.")
+
+    return build_full_result(results), skipped
+
+
+def diff_statuses(
+    saved: Dict[str, Dict[str, Any]],
+    full: FullSuiteResult,
+) -> List[Dict[str, str]]:
+    """
+    Tests whose status differs between the saved run and `full`.
+    """
+    changes = []
+    for r in full.results:
+        before = saved.get(test_key(r.category_id, r.test_id), {}).get("status")
+        if before != r.status:
+            changes.append({"categoryId": r.category_id, "testId": r.test_id, "before": before, "after": r.status})
+    return changes
+
+
+def format_rescore_report(
+    source: str,
+    changes: List[Dict[str, str]],
+    skipped: List[Dict[str, str]],
+) -> str:
+    """
+    Human-readable status diff, appended to detailed / triage output.
+    """
+    lines = [f"Re-scored against saved run: {source}"]
+    if not changes:
+        lines.append("No test changed status.")
+    for c in changes:
+        lines.append(f"  {test_key(c['categoryId'], c['testId'])}: {c['before']} -> {c['after']}")
+    for s in skipped:
+        lines.append(f"  {test_key(s['categoryId'], s['testId'])}: not re-scored ({s['reason']})")
+    return "\n".join(lines)
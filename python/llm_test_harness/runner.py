@@ -1,113 +1,597 @@
+import asyncio
 import sys
-from typing import Callable, List, Dict, Any
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TYPE_CHECKING,
+)
 
-from .matcher import which_patterns_match, which_patterns_missing
+from .matcher import InvalidPatternError
 from .models import (
     SuiteManifest,
     CategoryFile,
+    EvalTest,
     SingleTestResult,
     SuiteResultTotals,
     SuiteResultSummary,
     FullSuiteResult,
+    TrialStats,
+    LatencyStats,
+    RunMetrics,
 )
 
 
+from .checkpoint import test_key
+from .metrics import MetricsTally
+from .observer import LogObserver, RunObserver
+from .streaming import StreamMatcher, consume_stream, aconsume_stream
+from .trials import TrialPolicy, combine_trials
+
+if TYPE_CHECKING:
+    from .checkpoint import Checkpoint
+    from .metrics import ModelPrice
+    from .profiler import PatternMonitor
+    from .sink import ResultSink
+
+
 class RunnerError(Exception):
     pass
 
 
+def _flatten_tests(categories: List[CategoryFile]) -> List[Tuple[CategoryFile, EvalTest]]:
+    test_items = []
+    for cat in categories:
+        for t in cat.tests:
+            test_items.append((cat, t))
+    return test_items
+
+
+def score_response(
+    cat: CategoryFile,
+    test: EvalTest,
+    response: str,
+    monitor: Optional["PatternMonitor"] = None,
+    latency_ms: Optional[float] = None,
+) -> SingleTestResult:
+    """
+    Apply a test's assert spec to a model response and classify it as
+    "pass", "yellow_fail" or "red_fail".
+
+    With a `monitor` every regex search is timed, and under a time budget a
+    pattern that blows it makes the result "eval_error" (gated as red).
+    `latency_ms` is the wall time of the call that produced the response.
+    """
+    # Providers may hand back a ModelResponse; keep its usage and streaming
+    # details, store plain text.
+    usage = getattr(response, "usage", None)
+    ttft_ms = getattr(response, "ttft_ms", None)
+    stream_aborted = getattr(response, "stream_aborted", False)
+    response = str(response)
+
+    spec = test.assert_spec
+    compiled = spec.compile()
+
+    eval_errors: Tuple[int, ...] = ()
+    if monitor is None:
+        hit_forbidden_any = compiled.forbidden_any.hit_ids(response)
+        missing_required_all = compiled.required_all.missing_ids(response)
+        matched_required_any = compiled.required_any.hit_ids(response)
+    else:
+        hit_forbidden_any, over_forbidden = monitor.hit_ids(compiled.forbidden_any, response)
+        missing_required_all, over_required_all = monitor.missing_ids(compiled.required_all, response)
+        matched_required_any, over_required_any = monitor.hit_ids(compiled.required_any, response)
+        eval_errors = over_forbidden + over_required_all + over_required_any
+    hit_any_required_any = len(matched_required_any) > 0 or len(spec.required_any_ids) == 0
+
+    # Figure out status
+    if eval_errors:
+        # A pattern we couldn't evaluate might have been a forbidden hit.
+        status = "eval_error"
+        severity = "red"
+    elif hit_forbidden_any or missing_required_all:
+        status = "red_fail"
+        severity = "red"
+    elif not hit_any_required_any:
+        status = "yellow_fail"
+        severity = "yellow"
+    else:
+        status = "pass"
+        severity = "none"
+
+    return SingleTestResult(
+        test_id=test.id,
+        category_id=cat.category_id,
+        category_name=cat.category_name,
+        status=status,
+        severity=severity,
+        prompt=test.prompt,
+        response=response,
+        missing_required_all_ids=missing_required_all,
+        hit_forbidden_any_ids=hit_forbidden_any,
+        matched_required_any_ids=matched_required_any,
+        # What the spec expected, so triage/verbose can show it (shared, not copied)
+        spec=spec,
+        usage=usage,
+        content_hash=test.content_hash,
+        eval_error_ids=eval_errors,
+        latency_ms=latency_ms,
+        ttft_ms=ttft_ms,
+        stream_aborted=stream_aborted,
+    )
+
+
+def _stream_matcher(test: EvalTest, monitor: Optional["PatternMonitor"]) -> StreamMatcher:
+    """Watches a streamed response for the test's forbidden_any patterns."""
+    forbidden = test.assert_spec.compile().forbidden_any
+    context = forbidden.lookbehind_width()
+    if monitor is None:
+        return StreamMatcher(forbidden.which_match, context=context)
+    return StreamMatcher(
+        lambda text, pos, settled: monitor.which_match(forbidden, text, pos, settled)[0], context=context,
+    )
+
+
+class ResultTally:
+    """
+    Running pass / red / yellow counters. Lets the gate be computed as
+    results stream past, without holding on to them.
+    """
+
+    def __init__(self):
+        self.pass_count = 0
+        self.fail_red_count = 0
+        self.fail_yellow_count = 0
+        self.eval_error_count = 0
+        self.usage: Dict[str, int] = {}
+        self.trial_runs = 0
+        self.metrics = MetricsTally()
+
+    @property
+    def count(self) -> int:
+        return self.pass_count + self.fail_red_count + self.fail_yellow_count + self.eval_error_count
+
+    def add(self, result: SingleTestResult) -> None:
+        if result.status == "pass":
+            self.pass_count += 1
+        elif result.status == "red_fail":
+            self.fail_red_count += 1
+        elif result.status == "yellow_fail":
+            self.fail_yellow_count += 1
+        elif result.status == "eval_error":
+            self.eval_error_count += 1
+        if result.usage:
+            for key, n in result.usage.items():
+                self.usage[key] = self.usage.get(key, 0) + (n or 0)
+        if result.trials is not None:
+            self.trial_runs += result.trials.runs
+        self.metrics.add(result)
+
+    def summary(self) -> SuiteResultSummary:
+        if self.fail_red_count or self.eval_error_count:
+            gate = "RED"
+        elif self.fail_yellow_count:
+            gate = "YELLOW"
+        else:
+            gate = "GREEN"
+
+        totals = SuiteResultTotals(
+            pass_count=self.pass_count,
+            fail_red_count=self.fail_red_count,
+            fail_yellow_count=self.fail_yellow_count,
+            eval_error_count=self.eval_error_count,
+        )
+
+        return SuiteResultSummary(
+            gate=gate,
+            totals=totals,
+            usage=dict(self.usage),
+            trial_runs=self.trial_runs,
+            metrics=self.metrics.overall(),
+            category_metrics=self.metrics.by_category(),
+        )
+
+
+def build_full_result(results: List[SingleTestResult]) -> FullSuiteResult:
+    """
+    Roll individual test results up into the suite gate and totals.
+    """
+    tally = ResultTally()
+    for r in results:
+        tally.add(r)
+
+    return FullSuiteResult(
+        summary=tally.summary(),
+        results=results,
+    )
+
+
+def _execute(
+    indices: List[int],
+    run_one: Callable[[int], SingleTestResult],
+    concurrency: int,
+    stop: Optional[threading.Event] = None,
+) -> Iterator[Tuple[int, SingleTestResult]]:
+    """
+    Yield (index, result) for every test index. Serial runs yield in suite
+    order; concurrent runs yield in completion order.
+
+    Once `stop` is set no new tests are started. Queued work is cancelled and
+    anything still in flight is abandoned (its result is never yielded).
+    """
+    if concurrency == 1:
+        for idx in indices:
+            if stop is not None and stop.is_set():
+                return
+            yield idx, run_one(idx)
+        return
+
+    # Keep at most `concurrency` futures outstanding so huge suites don't queue
+    # every prompt up front.
+    pending = iter(indices)
+    pool = ThreadPoolExecutor(max_workers=concurrency)
+    stopped = False
+    try:
+        in_flight = {}
+        exhausted = False
+        while not exhausted or in_flight:
+            while not exhausted and len(in_flight) < concurrency:
+                idx = next(pending, None)
+                if idx is None:
+                    exhausted = True
+                    break
+                in_flight[pool.submit(run_one, idx)] = idx
+            if not in_flight:
+                break
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for fut in done:
+                yield in_flight.pop(fut), fut.result()
+                if stop is not None and stop.is_set():
+                    stopped = True
+                    for other in in_flight:
+                        other.cancel()
+                    return
+    finally:
+        # Don't block on abandoned in-flight calls after a stop.
+        pool.shutdown(wait=not stopped, cancel_futures=True)
+
+
+async def _aexecute(
+    indices: List[int],
+    run_one: Callable[[int], Awaitable[SingleTestResult]],
+    concurrency: int,
+    stop: Optional[threading.Event] = None,
+) -> AsyncIterator[Tuple[int, SingleTestResult]]:
+    """
+    asyncio twin of _execute: at most `concurrency` tasks in flight, results
+    yielded in completion order. After `stop` is set the remaining in-flight
+    tasks are cancelled, which aborts their HTTP requests.
+    """
+    pending = iter(indices)
+    in_flight: Dict["asyncio.Task", int] = {}
+    exhausted = False
+    try:
+        while not exhausted or in_flight:
+            while not exhausted and len(in_flight) < concurrency:
+                idx = next(pending, None)
+                if idx is None:
+                    exhausted = True
+                    break
+                in_flight[asyncio.ensure_future(run_one(idx))] = idx
+            if not in_flight:
+                break
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield in_flight.pop(task), task.result()
+                if stop is not None and stop.is_set():
+                    return
+    finally:
+        for task in in_flight:
+            task.cancel()
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
+
+
+class _SuiteRun:
+    """
+    Bookkeeping shared by run_suite and run_suite_async: flattening and
+    validating the suite, checkpoint reuse and carried-forward results,
+    sink / tally / fail-fast handling as results arrive, and building the
+    final FullSuiteResult.
+    """
+
+    def __init__(
+        self,
+        categories: List[CategoryFile],
+        concurrency: int,
+        sink: Optional["ResultSink"],
+        keep_results: bool,
+        checkpoint: Optional["Checkpoint"],
+        fail_fast: bool,
+        label: Optional[str] = None,
+        carried: Optional[Dict[str, SingleTestResult]] = None,
+        price: Optional["ModelPrice"] = None,
+        observer: Optional[RunObserver] = None,
+    ):
+        # Flatten all tests
+        self.test_items = _flatten_tests(categories)
+
+        if not self.test_items:
+            raise RunnerError("No tests loaded from categories.")
+        if concurrency < 1:
+            raise RunnerError(f"concurrency must be >= 1 (got {concurrency}).")
+
+        # Normally already done by the loader; this makes sure a bad regex in
+        # hand-built categories fails here rather than after paying for model calls.
+        for cat, test in self.test_items:
+            try:
+                test.assert_spec.compile()
+            except InvalidPatternError as e:
+                raise RunnerError(f"{cat.category_id}::{test.id}: {e}") from e
+
+        self.total = len(self.test_items)
+        self.sink = sink
+        self.checkpoint = checkpoint
+        self.fail_fast = fail_fast
+        self.price = price
+        self.tally = ResultTally()
+        self.slots: Optional[List[Any]] = [None] * self.total if keep_results else None
+        self.stop = threading.Event()
+        self.first_red: Optional[str] = None
+        self.label = label
+        self.observer = observer if observer is not None else LogObserver()
+        # Messages are prefixed with the label when several runs share stderr.
+        self.prefix = f"[LLMTestHarness] [{label}]" if label else "[LLMTestHarness]"
+
+        self.to_run: List[int] = []
+        reused: List[Tuple[int, SingleTestResult]] = []
+        for idx, (cat, test) in enumerate(self.test_items):
+            key = test_key(cat.category_id, test.id)
+            done = checkpoint.completed.get(key) if checkpoint else None
+            if done is None and carried:
+                done = carried.get(key)
+            if done is not None:
+                if done.spec is None:
+                    done.spec = test.assert_spec
+                reused.append((idx, done))
+            else:
+                self.to_run.append(idx)
+
+        self.observer.run_started(label, self.total, len(self.to_run))
+        for idx, done in reused:
+            self._collect(idx, done, reused=True)
+
+        if checkpoint is not None and len(self.to_run) < self.total:
+            print(f"{self.prefix} Resuming: {self.total - len(self.to_run)}/{self.total} tests already scored in checkpoint", file=sys.stderr, flush=True)
+
+    def announce(self, idx: int) -> None:
+        cat, test = self.test_items[idx]
+        self.observer.test_started(self.label, idx, self.total, cat.category_id, test.id)
+
+    def call_done(self, idx: int, latency_ms: Optional[float]) -> None:
+        self.observer.response_received(self.label, idx, latency_ms)
+
+    def call_failed(self, idx: int, error: BaseException) -> None:
+        self.observer.call_failed(self.label, idx, error)
+
+    def _collect(self, idx: int, result: SingleTestResult, reused: bool = False) -> None:
+        self.observer.test_scored(self.label, idx, result, reused)
+        self.tally.add(result)
+        if result.severity == "red" and self.first_red is None:
+            self.first_red = test_key(result.category_id, result.test_id)
+            if self.fail_fast:
+                self.stop.set()
+        if self.sink is not None:
+            self.sink.write_result(idx, result)
+        if self.slots is not None:
+            self.slots[idx] = result
+
+    def record(self, idx: int, result: SingleTestResult) -> None:
+        """A freshly scored result (as opposed to one reused from a checkpoint)."""
+        if self.price is not None and result.usage:
+            result.cost_usd = self.price.cost(result.usage)
+        if self.checkpoint is not None:
+            self.checkpoint.record(result)
+        self._collect(idx, result)
+
+    def finish(self) -> FullSuiteResult:
+        summary = self.tally.summary()
+        if self.stop.is_set():
+            summary.stopped_early = True
+            summary.tests_not_run = self.total - self.tally.count
+            summary.first_red_fail = self.first_red
+            print(f"{self.prefix} Fail-fast: stopping after red failure in {self.first_red}", file=sys.stderr, flush=True)
+        if self.sink is not None:
+            self.sink.write_summary(summary)
+        self.observer.run_finished(self.label, summary)
+
+        results: List[SingleTestResult] = []
+        if self.slots is not None:
+            results = [r for r in self.slots if r is not None] if summary.stopped_early else self.slots
+
+        return FullSuiteResult(
+            summary=summary,
+            results=results,
+        )
+
+    def fail(self, message: str) -> RunnerError:
+        """
+        End a run that can't complete: the sink and observer still get a
+        summary (gate RED, with `error` set) so a partial result stream can
+        be told apart from a crashed one. Returns the RunnerError to raise.
+        """
+        summary = self.tally.summary()
+        summary.gate = "RED"
+        summary.error = message
+        summary.tests_not_run = self.total - self.tally.count
+        if self.sink is not None:
+            self.sink.write_summary(summary)
+        self.observer.run_finished(self.label, summary)
+        return RunnerError(message)
+
+
 def run_suite(
     manifest: SuiteManifest,
     categories: List[CategoryFile],
     call_model: Callable[[str], str],
+    concurrency: int = 1,
+    sink: Optional["ResultSink"] = None,
+    keep_results: bool = True,
+    checkpoint: Optional["Checkpoint"] = None,
+    fail_fast: bool = False,
+    label: Optional[str] = None,
+    trials: Optional[TrialPolicy] = None,
+    carried: Optional[Dict[str, SingleTestResult]] = None,
+    monitor: Optional["PatternMonitor"] = None,
+    price: Optional["ModelPrice"] = None,
+    observer: Optional[RunObserver] = None,
+    streaming: bool = False,
 ) -> FullSuiteResult:
     """
     Execute the full test harness against `call_model`.
 
     call_model(prompt: str) -> str
     should return the assistant's final, user-facing response string.
-    """
 
-    # Flatten all tests
-    test_items = []
-    for cat in categories:
-        for t in cat.tests:
-            test_items.append((cat, t))
+    With concurrency > 1, up to `concurrency` prompts are in flight at once
+    on a thread pool (call_model must be thread-safe). Results are always
+    returned in suite order, so the output and gate match a serial run.
 
-    if not test_items:
-        raise RunnerError("No tests loaded from categories.")
+    If `sink` is given, each result is handed to it as soon as it is scored
+    (in completion order), followed by the summary at the end. With
+    keep_results=False nothing is retained: the returned FullSuiteResult has
+    an empty results list and a summary built from running counters, so
+    memory stays flat however large the suite is.
 
-    total = len(test_items)
-    results: List[SingleTestResult] = []
+    If `checkpoint` is given, every scored result is appended to it, and
+    tests it already holds (from a resumed run) are reused instead of
+    calling the model again.
 
-    for idx, (cat, test) in enumerate(test_items):
-        print(f"[LLMTestHarness] Running test {idx+1}/{total}: {cat.category_id}::{test.id}", file=sys.stderr, flush=True)
+    With fail_fast=True the run stops as soon as a red failure is recorded:
+    no new model calls are issued, queued ones are cancelled, and the
+    summary reports the partial totals, how many tests never ran, and the
+    test that settled the gate. Results only cover tests that finished.
 
-        response = call_model(test.prompt)
+    `label` tags the progress lines on stderr (used by matrix runs).
 
-        spec = test.assert_spec
+    With a `trials` policy each test is sampled repeatedly inside its worker
+    (see trials.py) and scored by its worst trial; without one, once.
 
-        hit_forbidden_any = which_patterns_match(response, spec.forbidden_any)
-        missing_required_all = which_patterns_missing(response, spec.required_all)
-        matched_required_any = which_patterns_match(response, spec.required_any)
-        hit_any_required_any = len(matched_required_any) > 0 or len(spec.required_any) == 0
+    `carried` maps "category_id::test_id" to results taken over from an
+    earlier run (see incremental.py). Those tests are not sent to the model,
+    but count toward the gate like any other result.
 
-        # Figure out status
-        if hit_forbidden_any or missing_required_all:
-            status = "red_fail"
-            severity = "red"
-        elif not hit_any_required_any:
-            status = "yellow_fail"
-            severity = "yellow"
-        else:
-            status = "pass"
-            severity = "none"
-
-        results.append(
-            SingleTestResult(
-                test_id=test.id,
-                category_id=cat.category_id,
-                category_name=cat.category_name,
-                status=status,
-                severity=severity,
-                prompt=test.prompt,
-                response=response,
-                missing_required_all=missing_required_all,
-                hit_forbidden_any=hit_forbidden_any,
-                matched_required_any=matched_required_any,
-                # NEW: include what the spec expected so triage/verbose can show it
-                expected_required_all=list(spec.required_all or []),
-                expected_required_any=list(spec.required_any or []),
-                expected_forbidden_any=list(spec.forbidden_any or []),
-            )
-        )
+    `monitor` (see profiler.py) times every regex search and can enforce a
+    per-pattern time budget.
 
-    # Roll up gate
-    fail_red = any(r.status == "red_fail" for r in results)
-    fail_yellow = any(r.status == "yellow_fail" for r in results)
+    Every model call is timed (see metrics.py); with a `price` for the
+    model, each result also gets an estimated cost from its token usage.
 
-    if fail_red:
-        gate = "RED"
-    elif fail_yellow:
-        gate = "YELLOW"
-    else:
-        gate = "GREEN"
+    Progress is reported to `observer` (see observer.py); the default
+    writes one stderr line per test.
 
-    totals = SuiteResultTotals(
-        pass_count=sum(1 for r in results if r.status == "pass"),
-        fail_red_count=sum(1 for r in results if r.status == "red_fail"),
-        fail_yellow_count=sum(1 for r in results if r.status == "yellow_fail"),
-    )
+    With streaming=True, call_model(prompt) returns an iterator of text
+    chunks instead of a string. Generation is cancelled as soon as a
+    forbidden_any pattern matches, and the partial text is scored (see
+    streaming.py).
+    """
+    run = _SuiteRun(categories, concurrency, sink, keep_results, checkpoint, fail_fast, label, carried, price, observer)
+
+    def _sample(idx: int, cat: CategoryFile, test: EvalTest) -> SingleTestResult:
+        try:
+            started = time.perf_counter()
+            response = call_model(test.prompt)
+            if streaming:
+                response = consume_stream(response, _stream_matcher(test, monitor), started)
+            latency_ms = (time.perf_counter() - started) * 1000
+        except Exception as e:
+            run.call_failed(idx, e)
+            raise
+        run.call_done(idx, latency_ms)
+        return score_response(cat, test, response, monitor, latency_ms)
+
+    def _run_one(idx: int) -> SingleTestResult:
+        cat, test = run.test_items[idx]
+        run.announce(idx)
+        if trials is None:
+            return _sample(idx, cat, test)
+        samples: List[SingleTestResult] = []
+        while not trials.settled(samples):
+            samples.append(_sample(idx, cat, test))
+        return combine_trials(samples, trials)
+
+    for idx, result in _execute(run.to_run, _run_one, concurrency, run.stop):
+        run.record(idx, result)
+
+    return run.finish()
+
+
+async def run_suite_async(
+    manifest: SuiteManifest,
+    categories: List[CategoryFile],
+    acall_model: Callable[[str], Awaitable[str]],
+    concurrency: int = 1,
+    sink: Optional["ResultSink"] = None,
+    keep_results: bool = True,
+    checkpoint: Optional["Checkpoint"] = None,
+    fail_fast: bool = False,
+    label: Optional[str] = None,
+    trials: Optional[TrialPolicy] = None,
+    carried: Optional[Dict[str, SingleTestResult]] = None,
+    monitor: Optional["PatternMonitor"] = None,
+    price: Optional["ModelPrice"] = None,
+    observer: Optional[RunObserver] = None,
+    streaming: bool = False,
+) -> FullSuiteResult:
+    """
+    asyncio version of run_suite, for async providers.
 
-    summary = SuiteResultSummary(
-        gate=gate,
-        totals=totals,
-    )
+    acall_model(prompt: str) -> Awaitable[str]
 
-    return FullSuiteResult(
-        summary=summary,
-        results=results,
-    )
+    Up to `concurrency` requests run as tasks on one event loop instead of
+    one OS thread each. Every other option behaves exactly as in run_suite;
+    with fail_fast, in-flight requests are cancelled outright. With
+    streaming=True, acall_model(prompt) resolves to an async iterator of
+    text chunks.
+    """
+    run = _SuiteRun(categories, concurrency, sink, keep_results, checkpoint, fail_fast, label, carried, price, observer)
+
+    async def _sample(idx: int, cat: CategoryFile, test: EvalTest) -> SingleTestResult:
+        try:
+            started = time.perf_counter()
+            response = await acall_model(test.prompt)
+            if streaming:
+                response = await aconsume_stream(response, _stream_matcher(test, monitor), started)
+            latency_ms = (time.perf_counter() - started) * 1000
+        except Exception as e:
+            run.call_failed(idx, e)
+            raise
+        run.call_done(idx, latency_ms)
+        return score_response(cat, test, response, monitor, latency_ms)
+
+    async def _run_one(idx: int) -> SingleTestResult:
+        cat, test = run.test_items[idx]
+        run.announce(idx)
+        if trials is None:
+            return await _sample(idx, cat, test)
+        samples: List[SingleTestResult] = []
+        while not trials.settled(samples):
+            samples.append(await _sample(idx, cat, test))
+        return combine_trials(samples, trials)
+
+    async for idx, result in _aexecute(run.to_run, _run_one, concurrency, run.stop):
+        run.record(idx, result)
+
+    return run.finish()
 
 
 def _format_detailed_report(full: FullSuiteResult) -> str:
@@ -131,7 +615,26 @@ def _format_detailed_report(full: FullSuiteResult) -> str:
         f"Totals: {full.summary.totals.pass_count} passed, "
         f"{full.summary.totals.fail_red_count} red fails, "
         f"{full.summary.totals.fail_yellow_count} yellow fails"
+        + (f", {full.summary.totals.eval_error_count} eval errors" if full.summary.totals.eval_error_count else "")
     )
+    if full.summary.usage:
+        usage = full.summary.usage
+        lines.append(
+            f"Tokens: {usage.get('input_tokens', 0)} input "
+            f"({usage.get('cached_input_tokens', 0)} from prompt cache), "
+            f"{usage.get('output_tokens', 0)} output"
+        )
+    if full.summary.trial_runs:
+        lines.append(f"Trials: {full.summary.trial_runs} model calls in total")
+    if full.summary.metrics is not None:
+        lines.append(f"Model calls: {_format_metrics(full.summary.metrics)}")
+        for cat_id, m in full.summary.category_metrics.items():
+            lines.append(f"  {cat_id}: {_format_metrics(m)}")
+    if full.summary.stopped_early:
+        lines.append(
+            f"Stopped early (fail-fast) after red failure in {full.summary.first_red_fail}; "
+            f"{full.summary.tests_not_run} tests not run"
+        )
     lines.append("")
 
     failing = [r for r in full.results if r.status != "pass"]
@@ -144,6 +647,8 @@ def _format_detailed_report(full: FullSuiteResult) -> str:
         lines.append(f"Test ID: {r.test_id}")
         lines.append(f"Category: {r.category_id} - {r.category_name}")
         lines.append(f"Result: {r.severity.upper() if r.severity != 'none' else 'PASS'}")
+        if r.trials is not None:
+            lines.append(f"Trials: {_format_trials(r.trials)}; worst trial shown")
         lines.append("")
         lines.append("Model Response:")
         resp = r.response.strip() if r.response.strip() else "(no response)"
@@ -151,6 +656,13 @@ def _format_detailed_report(full: FullSuiteResult) -> str:
         lines.append("")
         lines.append("Checks:")
 
+        # Patterns that blew the match time budget: verdict unknown, gated RED
+        for pat in r.eval_errors:
+            lines.append(f"  ⏱ Pattern exceeded the match time budget (EVAL ERROR): {pat}")
+
+        if r.stream_aborted:
+            lines.append("  ✂ Generation was stopped at the first forbidden match; checks below saw only the partial response")
+
         # Forbidden content: RED if any matched
         if r.hit_forbidden_any:
             for pat in r.hit_forbidden_any:
@@ -178,48 +690,159 @@ def _format_detailed_report(full: FullSuiteResult) -> str:
     return "\n".join(lines)
 
 
-def _format_verbose_json(full: FullSuiteResult) -> Dict[str, Any]:
+def _verbose_record(r: SingleTestResult) -> Dict[str, Any]:
     """
-    Full forensic detail for --mode verbose, as JSON-serializable data.
-    Includes every test (pass or fail).
+    One test's entry in verbose output (also used for streamed JSONL records).
     """
-    verbose_results = []
-    for r in full.results:
-        verbose_results.append({
-            "test_id": r.test_id,
-            "category": f"{r.category_id} - {r.category_name}",
-            "status": r.status,
-            "severity": r.severity,
-            "prompt": r.prompt,
-            "response": r.response,
-            "hit_forbidden_any": r.hit_forbidden_any,
-            "missing_required_all": r.missing_required_all,
-            "matched_required_any": r.matched_required_any,
-        })
+    record = {
+        "test_id": r.test_id,
+        "category": f"{r.category_id} - {r.category_name}",
+        "status": r.status,
+        "severity": r.severity,
+        "prompt": r.prompt,
+        "response": r.response,
+        "hit_forbidden_any": r.hit_forbidden_any,
+        "missing_required_all": r.missing_required_all,
+        "matched_required_any": r.matched_required_any,
+    }
+    if r.usage:
+        record["usage"] = _usage_json(r.usage)
+    if r.trials is not None:
+        record["trials"] = _trials_json(r.trials)
+    if r.content_hash:
+        record["content_hash"] = r.content_hash
+    if r.eval_errors:
+        record["eval_errors"] = r.eval_errors
+    if r.latency_ms is not None:
+        record["latency_ms"] = round(r.latency_ms, 1)
+    if r.ttft_ms is not None:
+        record["ttft_ms"] = round(r.ttft_ms, 1)
+    if r.cost_usd is not None:
+        record["cost_usd"] = round(r.cost_usd, 6)
+    if r.stream_aborted:
+        record["stream_aborted"] = True
+    return record
+
+
+def _trials_json(t: TrialStats) -> Dict[str, Any]:
+    return {
+        "runs": t.runs,
+        "passes": t.passes,
+        "redFails": t.red_fails,
+        "yellowFails": t.yellow_fails,
+        "failureRate": round(t.failure_rate, 4),
+        "failureRateCi95": [round(t.ci_low, 4), round(t.ci_high, 4)],
+        "stoppedEarly": t.stopped_early,
+    }
+
 
+def _format_trials(t: TrialStats) -> str:
+    return (
+        f"{t.runs - t.passes}/{t.runs} trials failed "
+        f"(failure rate {t.failure_rate:.0%}, 95% CI {t.ci_low:.0%}–{t.ci_high:.0%})"
+    )
+
+
+def _latency_json(s: LatencyStats) -> Dict[str, Any]:
     return {
-        "gate": full.summary.gate,
-        "totals": {
-            "passCount": full.summary.totals.pass_count,
-            "failRedCount": full.summary.totals.fail_red_count,
-            "failYellowCount": full.summary.totals.fail_yellow_count,
-        },
-        "results": verbose_results,
+        "count": s.count,
+        "p50": round(s.p50, 1),
+        "p95": round(s.p95, 1),
+        "p99": round(s.p99, 1),
+        "max": round(s.max, 1),
+        "mean": round(s.mean, 1),
+    }
+
+
+def _metrics_json(m: RunMetrics, with_usage: bool = True) -> Dict[str, Any]:
+    out: Dict[str, Any] = {"tests": m.tests}
+    if m.latency is not None:
+        out["latencyMs"] = _latency_json(m.latency)
+    if m.ttft is not None:
+        out["ttftMs"] = _latency_json(m.ttft)
+    if with_usage and m.usage:
+        out["usage"] = _usage_json(m.usage)
+    if m.cost_usd is not None:
+        out["costUsd"] = round(m.cost_usd, 6)
+    return out
+
+
+def _format_metrics(m: RunMetrics) -> str:
+    parts = []
+    if m.latency is not None:
+        s = m.latency
+        parts.append(f"p50 {s.p50:.0f} ms, p95 {s.p95:.0f} ms, p99 {s.p99:.0f} ms over {s.count} test{'s' if s.count != 1 else ''}")
+    if m.ttft is not None:
+        parts.append(f"first token p50 {m.ttft.p50:.0f} ms, p95 {m.ttft.p95:.0f} ms")
+    if m.cost_usd is not None:
+        parts.append(f"est. cost ${m.cost_usd:.4f}")
+    return "; ".join(parts) or "n/a"
+
+
+def _totals_json(totals: SuiteResultTotals) -> Dict[str, Any]:
+    out = {
+        "passCount": totals.pass_count,
+        "failRedCount": totals.fail_red_count,
+        "failYellowCount": totals.fail_yellow_count,
+    }
+    if totals.eval_error_count:
+        out["evalErrorCount"] = totals.eval_error_count
+    return out
+
+
+_USAGE_JSON_KEYS = {
+    "input_tokens": "inputTokens",
+    "cached_input_tokens": "cachedInputTokens",
+    "cache_write_input_tokens": "cacheWriteInputTokens",
+    "output_tokens": "outputTokens",
+}
+
+
+def _usage_json(usage: Dict[str, int]) -> Dict[str, int]:
+    return {_USAGE_JSON_KEYS.get(k, k): v for k, v in usage.items()}
+
+
+def _summary_json(summary: SuiteResultSummary) -> Dict[str, Any]:
+    out: Dict[str, Any] = {
+        "gate": summary.gate,
+        "totals": _totals_json(summary.totals),
     }
+    if summary.usage:
+        # Includes prompt-cache hits/misses: cachedInputTokens vs inputTokens.
+        out["usage"] = _usage_json(summary.usage)
+    if summary.stopped_early:
+        out["stoppedEarly"] = True
+        out["testsNotRun"] = summary.tests_not_run
+        out["firstRedFail"] = summary.first_red_fail
+    if summary.error:
+        out["error"] = summary.error
+        out["testsNotRun"] = summary.tests_not_run
+    if summary.trial_runs:
+        out["trialRuns"] = summary.trial_runs
+    if summary.metrics is not None:
+        # Run-wide usage is already in "usage" above.
+        out["metrics"] = _metrics_json(summary.metrics, with_usage=False)
+        out["metrics"]["byCategory"] = {
+            cat_id: _metrics_json(m) for cat_id, m in summary.category_metrics.items()
+        }
+    return out
+
+
+def _format_verbose_json(full: FullSuiteResult) -> Dict[str, Any]:
+    """
+    Full forensic detail for --mode verbose, as JSON-serializable data.
+    Includes every test (pass or fail).
+    """
+    out = _summary_json(full.summary)
+    out["results"] = [_verbose_record(r) for r in full.results]
+    return out
 
 
 def _format_summary_json(full: FullSuiteResult) -> Dict[str, Any]:
     """
     Short JSON for --mode summary (CI use).
     """
-    return {
-        "gate": full.summary.gate,
-        "totals": {
-            "passCount": full.summary.totals.pass_count,
-            "failRedCount": full.summary.totals.fail_red_count,
-            "failYellowCount": full.summary.totals.fail_yellow_count,
-        }
-    }
+    return _summary_json(full.summary)
 
 def format_triage(failing_results):
     """
@@ -229,12 +852,22 @@ def format_triage(failing_results):
     lines = []
     for r in failing_results:
         lines.append(f"[{r.severity.upper()}] {r.test_id} — {r.category_id} - {r.category_name}")
+        if r.trials is not None:
+            lines.append(_format_trials(r.trials))
         lines.append("INPUT:")
         lines.append((r.prompt or "").strip())
         lines.append("OUTPUT:")
         lines.append((r.response or "").strip())
         lines.append("FAILED:")
 
+        if r.stream_aborted:
+            lines.append("(Generation stopped at the first forbidden match; output above is partial.)")
+
+        if r.eval_errors:
+            lines.append("Patterns that exceeded the match time budget (not evaluated):")
+            for pat in r.eval_errors:
+                lines.append(f"  - {pat}")
+
         # RED reasons
         if r.hit_forbidden_any:
             lines.append("Forbidden patterns matched:")
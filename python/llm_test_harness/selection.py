@@ -0,0 +1,150 @@
+"""
+Test selection and sharding.
+
+select_tests narrows the loaded suite by category id, test id glob and
+vertical. shard_tests then splits what is left into N deterministic,
+disjoint shards so a suite run can be spread over several CI machines;
+merge.py puts the shard outputs back together.
+
+Selection works on the loaded categories, so it composes with every run
+mode (sync, async, batch, matrix, incremental).
+"""
+
+import dataclasses
+import fnmatch
+import json
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .checkpoint import test_key
+from .models import CategoryFile, EvalTest
+
+
+CORE_VERTICAL = "core"
+
+
+def vertical_of(cat: CategoryFile) -> str:
+    """
+    "aviation" for a file under verticals/aviation/, "core" for everything
+    else (including categories built in code, with no source path).
+    """
+    parts = (cat.source or "").replace("\\", "/").split("/")
+    if len(parts) >= 3 and parts[0] == "verticals":
+        return parts[1]
+    return CORE_VERTICAL
+
+
+def _with_tests(cat: CategoryFile, tests: List[EvalTest]) -> CategoryFile:
+    return dataclasses.replace(cat, tests=tests)
+
+
+def select_tests(
+    categories: List[CategoryFile],
+    category_ids: Optional[Iterable[str]] = None,
+    test_globs: Optional[Iterable[str]] = None,
+    verticals: Optional[Iterable[str]] = None,
+) -> List[CategoryFile]:
+    """
+    The subset of `categories` matching every given filter (None = no filter):
+      category_ids -> exact category_id, e.g. "LLM01"
+      test_globs   -> fnmatch-style globs on test id, e.g. "LLM07_*"
+      verticals    -> "core" or a verticals/<name>/ directory, e.g. "aviation"
+
+    Categories left with no tests are dropped; suite order is kept.
+    """
+    cat_filter = set(category_ids) if category_ids else None
+    vertical_filter = set(verticals) if verticals else None
+    globs = list(test_globs) if test_globs else None
+
+    selected = []
+    for cat in categories:
+        if cat_filter is not None and cat.category_id not in cat_filter:
+            continue
+        if vertical_filter is not None and vertical_of(cat) not in vertical_filter:
+            continue
+        tests = cat.tests
+        if globs is not None:
+            tests = [t for t in tests if any(fnmatch.fnmatchcase(t.id, g) for g in globs)]
+        if tests:
+            selected.append(_with_tests(cat, tests))
+    return selected
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """
+    "2/4" -> (2, 4). Shards are numbered 1..N.
+    """
+    try:
+        index_s, count_s = spec.split("/")
+        index, count = int(index_s), int(count_s)
+    except ValueError:
+        raise ValueError(f"shard must look like i/N (got '{spec}')")
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"shard index must be between 1 and N (got '{spec}')")
+    return index, count
+
+
+def load_durations(path: str) -> Dict[str, float]:
+    """
+    Historical per-test durations in seconds, as a JSON object keyed by
+    "category_id::test_id" (or bare test id), or taken from the latency_ms
+    of each result in an earlier `--mode verbose` run.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+    if isinstance(raw.get("results"), list):
+        durations = {}
+        for rec in raw["results"]:
+            if rec.get("latency_ms") is not None:
+                category_id = rec["category"].partition(" - ")[0]
+                durations[test_key(category_id, rec["test_id"])] = rec["latency_ms"] / 1000
+        return durations
+    return {str(k): float(v) for k, v in raw.items()}
+
+
+def shard_tests(
+    categories: List[CategoryFile],
+    index: int,
+    count: int,
+    durations: Optional[Dict[str, float]] = None,
+) -> List[CategoryFile]:
+    """
+    Shard `index` (1-based) of `count`. Every shard computes the same
+    partition from the same suite, so shards never overlap or miss a test.
+
+    Without durations tests are dealt round-robin in suite order, which
+    balances test counts. With durations, tests are placed longest first on
+    whichever shard has the least total time so far (tests missing from the
+    map count as the mean of the known ones), which balances wall time.
+    """
+    items = [(cat_idx, test) for cat_idx, cat in enumerate(categories) for test in cat.tests]
+
+    assignment: List[int] = []
+    if not durations:
+        assignment = [pos % count for pos in range(len(items))]
+    else:
+        def _known(cat_idx: int, test: EvalTest) -> Optional[float]:
+            key = test_key(categories[cat_idx].category_id, test.id)
+            return durations.get(key, durations.get(test.id))
+
+        known = [d for d in (_known(c, t) for c, t in items) if d is not None]
+        fallback = sum(known) / len(known) if known else 1.0
+        cost = [d if d is not None else fallback for d in (_known(c, t) for c, t in items)]
+
+        assignment = [0] * len(items)
+        loads = [0.0] * count
+        # Longest first; suite position breaks ties so the order is stable.
+        for pos in sorted(range(len(items)), key=lambda p: (-cost[p], p)):
+            shard = min(range(count), key=lambda s: (loads[s], s))
+            assignment[pos] = shard
+            loads[shard] += cost[pos]
+
+    picked: Dict[int, List[EvalTest]] = {}
+    for pos, (cat_idx, test) in enumerate(items):
+        if assignment[pos] == index - 1:
+            picked.setdefault(cat_idx, []).append(test)
+
+    return [
+        _with_tests(cat, picked[cat_idx])
+        for cat_idx, cat in enumerate(categories)
+        if cat_idx in picked
+    ]
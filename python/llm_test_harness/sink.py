@@ -0,0 +1,68 @@
+"""
+Streaming result sinks for run_suite.
+
+A sink receives each SingleTestResult the moment it is scored, then the
+suite summary once the run finishes. JsonlResultSink writes one JSON record
+per line and flushes after each, so other tools can tail a long run while
+it is still going:
+
+    {"type": "result", "index": 0, "test_id": "...", "status": "pass", ...}
+    ...
+    {"type": "summary", "gate": "GREEN", "totals": {...}}
+
+Result records use the same fields as --mode verbose, plus the test's
+position in the suite ("index"), since concurrent runs emit them in
+completion order.
+"""
+
+import json
+import sys
+from typing import IO, Optional
+
+from .models import SingleTestResult, SuiteResultSummary
+from .runner import _verbose_record, _summary_json
+
+
+class ResultSink:
+    def write_result(self, index: int, result: SingleTestResult) -> None:
+        raise NotImplementedError
+
+    def write_summary(self, summary: SuiteResultSummary) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class JsonlResultSink(ResultSink):
+    """
+    Writes to `path`, or with path "-" to `stdout` (default sys.stdout).
+    Nothing else should print to that stream while the sink is open, or
+    the lines interleave; run_harness moves its report to stderr.
+    """
+
+    def __init__(self, path: str, stdout: Optional[IO[str]] = None):
+        self.path = path
+        self._owns_file = path != "-"
+        self._fp: Optional[IO[str]] = (
+            open(path, "w", encoding="utf-8") if self._owns_file else (stdout or sys.stdout)
+        )
+
+    def _write(self, record) -> None:
+        self._fp.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._fp.flush()
+
+    def write_result(self, index: int, result: SingleTestResult) -> None:
+        record = {"type": "result", "index": index}
+        record.update(_verbose_record(result))
+        self._write(record)
+
+    def write_summary(self, summary: SuiteResultSummary) -> None:
+        record = {"type": "summary"}
+        record.update(_summary_json(summary))
+        self._write(record)
+
+    def close(self) -> None:
+        if self._owns_file and self._fp is not None:
+            self._fp.close()
+            self._fp = None
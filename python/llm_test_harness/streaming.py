@@ -0,0 +1,179 @@
+"""
+Streaming responses with early abort on forbidden content.
+
+With streaming on, a provider's stream_model(prompt) opens the request and
+returns an iterator of text chunks (astream_model: an awaitable giving an
+async iterator). Any chunk may be a ModelResponse carrying token usage;
+providers send one, with empty text, at the end of the stream when the API
+reports usage.
+
+consume_stream reads the chunks while a StreamMatcher re-checks the test's
+forbidden_any patterns every few dozen characters. The moment one matches
+(and enough text has followed the match that it can't be undone),
+the test is a red failure whatever follows, so the stream is closed, which
+cancels generation and stops paying for output tokens, and the partial text
+is scored. The result is marked stream_aborted; required_all / required_any
+checks on it only saw the partial response.
+"""
+
+import time
+from typing import AsyncIterator, Callable, Iterable, List, Optional
+
+from .models import ModelResponse
+
+
+# Re-check forbidden patterns after at least this many new characters. Small
+# enough to stop within a sentence or so, large enough that long responses
+# aren't rescanned on every token.
+CHECK_EVERY_CHARS = 32
+
+# Each check re-reads this much already-checked text before the new chunk,
+# so a match split across chunks is still found while streaming.
+OVERLAP_CHARS = 256
+
+# A mid-stream hit must end at least this far before the end of the text
+# received so far. \b, $ and lookaheads can match at the end of a partial
+# response ("...offer ass" + "istance") and stop matching once more arrives.
+SETTLE_MARGIN_CHARS = 16
+
+# Text kept before each check window for \b and lookbehinds to look at.
+# The minimum: callers pass the patterns' widest lookbehind when it's more.
+CONTEXT_CHARS = 16
+
+
+class StreamMatcher:
+    """
+    Accumulates streamed text and reports the first forbidden hit.
+
+    `match(text, pos, settled)` returns the patterns with a match starting
+    at or after `pos` and ending by `settled` (e.g. PatternSet.which_match).
+    Each check only scans the new text plus OVERLAP_CHARS before it, so a
+    response costs linear time however long it gets. A match longer than
+    the overlap, or one not yet SETTLE_MARGIN_CHARS clear of the end, is not
+    acted on mid-stream; scoring the finished response still catches it.
+
+    `context` characters before each window are kept for \\b and
+    lookbehinds; it must cover the widest lookbehind in the patterns
+    (PatternSet.lookbehind_width), or a negative lookbehind can see too
+    little and report a hit the full text doesn't have.
+    """
+
+    def __init__(
+        self,
+        match: Callable[[str, int, Optional[int]], List[str]],
+        check_every: int = CHECK_EVERY_CHARS,
+        overlap: int = OVERLAP_CHARS,
+        margin: int = SETTLE_MARGIN_CHARS,
+        context: int = CONTEXT_CHARS,
+    ):
+        self.match = match
+        self.check_every = check_every
+        self.overlap = overlap
+        self.margin = margin
+        self.context = max(context, CONTEXT_CHARS)
+        self._parts: List[str] = []
+        self._pending: List[str] = []
+        self._unchecked = 0
+        # The end of the text received so far, and where in it the next
+        # check starts matching.
+        self._tail = ""
+        self._pos = 0
+        self.hit: Optional[str] = None
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    def feed(self, chunk: str) -> bool:
+        """Add a chunk; True once a forbidden pattern has matched."""
+        if chunk:
+            chunk = str(chunk)
+            self._parts.append(chunk)
+            self._pending.append(chunk)
+            self._unchecked += len(chunk)
+        if self._unchecked >= self.check_every and self.hit is None:
+            self._unchecked = 0
+            self._check()
+        return self.hit is not None
+
+    def _check(self) -> None:
+        tail = self._tail + "".join(self._pending)
+        self._pending = []
+        settled = len(tail) - self.margin
+        if settled <= self._pos:
+            self._tail = tail
+            return
+        hits = self.match(tail, self._pos, settled)
+        if hits:
+            self.hit = hits[0]
+            return
+        # Next time, start `overlap` back from what just settled, keeping a
+        # little context before that.
+        pos = max(self._pos, settled - self.overlap)
+        cut = max(0, pos - self.context)
+        self._tail = tail[cut:]
+        self._pos = pos - cut
+
+
+def _usage_of(chunk, usage):
+    return getattr(chunk, "usage", None) or usage
+
+
+def consume_stream(
+    chunks: Iterable[str],
+    matcher: StreamMatcher,
+    started: Optional[float] = None,
+) -> ModelResponse:
+    """
+    Read `chunks` to the end, or until `matcher` sees forbidden content, and
+    return the text as a ModelResponse with usage, time to first token
+    (from `started`, a time.perf_counter() value, when given) and
+    `stream_aborted` set.
+    """
+    started = time.perf_counter() if started is None else started
+    ttft_ms = None
+    usage = None
+    aborted = False
+    try:
+        for chunk in chunks:
+            usage = _usage_of(chunk, usage)
+            if chunk and ttft_ms is None:
+                ttft_ms = (time.perf_counter() - started) * 1000
+            if matcher.feed(chunk):
+                aborted = True
+                break
+    finally:
+        # Closing the stream drops the connection, which stops generation.
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+    return _response(matcher, usage, ttft_ms, aborted)
+
+
+async def aconsume_stream(
+    chunks: AsyncIterator[str],
+    matcher: StreamMatcher,
+    started: Optional[float] = None,
+) -> ModelResponse:
+    """asyncio twin of consume_stream."""
+    started = time.perf_counter() if started is None else started
+    ttft_ms = None
+    usage = None
+    aborted = False
+    try:
+        async for chunk in chunks:
+            usage = _usage_of(chunk, usage)
+            if chunk and ttft_ms is None:
+                ttft_ms = (time.perf_counter() - started) * 1000
+            if matcher.feed(chunk):
+                aborted = True
+                break
+    finally:
+        aclose = getattr(chunks, "aclose", None)
+        if aclose is not None:
+            await aclose()
+    return _response(matcher, usage, ttft_ms, aborted)
+
+
+def _response(matcher: StreamMatcher, usage, ttft_ms: Optional[float], aborted: bool) -> ModelResponse:
+    return ModelResponse(matcher.text, usage, ttft_ms, stream_aborted=aborted)
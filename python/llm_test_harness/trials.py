@@ -0,0 +1,116 @@
+"""
+Repeated-trial sampling (--trials).
+
+One sample per prompt hides flakiness: a model that leaks 1 time in 20
+usually passes. With a TrialPolicy each test is sampled up to
+`max_trials` times and the test takes the verdict of its worst trial, so
+any red sample makes the test red. Sampling stops early once the verdict
+is settled:
+
+  - on the first red trial (the test is red whatever happens next; an
+    eval_error counts as red), or
+  - after `pass_streak` clean passes in a row.
+
+Each result carries a failure-rate estimate with a Wilson score interval,
+which stays meaningful for the small sample sizes and 0% / 100% rates
+that early stopping produces.
+"""
+
+import dataclasses
+import math
+from typing import Dict, List, Optional, Tuple
+
+from .models import SingleTestResult, TrialStats
+
+
+Z_95 = 1.959964
+
+
+def wilson_interval(failures: int, runs: int, z: float = Z_95) -> Tuple[float, float]:
+    """
+    Wilson score interval for a binomial proportion failures / runs.
+    """
+    if runs == 0:
+        return 0.0, 1.0
+    p = failures / runs
+    denom = 1 + z * z / runs
+    centre = (p + z * z / (2 * runs)) / denom
+    half = z * math.sqrt(p * (1 - p) / runs + z * z / (4 * runs * runs)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+class TrialPolicy:
+    """
+    How many times to sample each test, and when to stop sampling early.
+
+    pass_streak=None never stops on passes (every clean test costs
+    max_trials calls). n clean passes in a row bound the failure rate
+    below roughly 3/n at 95% confidence, so raise the streak to catch
+    rarer failures.
+    """
+
+    def __init__(self, max_trials: int, pass_streak: Optional[int] = None):
+        if max_trials < 1:
+            raise ValueError(f"max_trials must be >= 1 (got {max_trials}).")
+        if pass_streak is not None and pass_streak < 1:
+            raise ValueError(f"pass_streak must be >= 1 (got {pass_streak}).")
+        self.max_trials = max_trials
+        self.pass_streak = pass_streak
+
+    def settled(self, results: List[SingleTestResult]) -> bool:
+        if len(results) >= self.max_trials:
+            return True
+        if results and results[-1].severity == "red":
+            return True
+        n = self.pass_streak
+        if n is not None and len(results) >= n:
+            return all(r.status == "pass" for r in results[-n:])
+        return False
+
+
+def combine_trials(results: List[SingleTestResult], policy: TrialPolicy) -> SingleTestResult:
+    """
+    Fold one test's trial results into a single result: the worst trial,
+    with usage and latency summed over every trial, the mean time to first
+    token, and TrialStats attached.
+    """
+    worst = (
+        next((r for r in results if r.status == "eval_error"), None)
+        or next((r for r in results if r.status == "red_fail"), None)
+        or next((r for r in results if r.status == "yellow_fail"), None)
+        or results[0]
+    )
+
+    runs = len(results)
+    red = sum(1 for r in results if r.severity == "red")
+    yellow = sum(1 for r in results if r.status == "yellow_fail")
+    failures = red + yellow
+    ci_low, ci_high = wilson_interval(failures, runs)
+
+    usage: Optional[Dict[str, int]] = None
+    for r in results:
+        if r.usage:
+            usage = usage if usage is not None else {}
+            for key, n in r.usage.items():
+                usage[key] = usage.get(key, 0) + (n or 0)
+
+    latencies = [r.latency_ms for r in results if r.latency_ms is not None]
+    ttfts = [r.ttft_ms for r in results if r.ttft_ms is not None]
+
+    stats = TrialStats(
+        runs=runs,
+        passes=runs - failures,
+        red_fails=red,
+        yellow_fails=yellow,
+        failure_rate=failures / runs,
+        ci_low=ci_low,
+        ci_high=ci_high,
+        stopped_early=runs < policy.max_trials,
+    )
+    return dataclasses.replace(
+        worst,
+        usage=usage,
+        trials=stats,
+        latency_ms=sum(latencies) if latencies else None,
+        ttft_ms=sum(ttfts) / len(ttfts) if ttfts else None,
+    )
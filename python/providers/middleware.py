@@ -0,0 +1,351 @@
+"""
+Shared resilience layer for provider calls.
+
+Wraps any callable(prompt:str)->str (what run_harness.load_provider returns)
+with:
+
+  - RateLimiter: token buckets for requests/minute and tokens/minute
+  - RetryPolicy: jittered exponential backoff on 429 / 5xx / connection
+    errors, honouring Retry-After when the API sends it
+  - AdaptiveConcurrency: an AIMD cap on in-flight calls that halves on
+    throttling and grows by one slot per window of healthy calls
+
+Each piece has an asyncio twin (acquire_async, AsyncAdaptiveConcurrency,
+with_async_middleware) for the acall_model providers.
+
+Nothing here imports a provider SDK. Errors are classified by the
+`status_code` / `response.headers` attributes the OpenAI and Anthropic
+SDK exceptions expose (and by class name for connection/timeouts), so a
+fake client that raises look-alike exceptions drives it the same way.
+Clock, sleep and random source are injectable for the same reason.
+"""
+
+import asyncio
+import email.utils
+import random
+import threading
+import time
+from typing import Awaitable, Callable, Optional
+
+# 529 is Anthropic's "overloaded".
+THROTTLE_STATUS_CODES = (429, 529)
+RETRYABLE_STATUS_CODES = (408, 409, 429, 500, 502, 503, 504, 529)
+_RETRYABLE_ERROR_NAMES = ("APIConnectionError", "APITimeoutError")
+
+
+def status_code_of(exc: BaseException) -> Optional[int]:
+    code = getattr(exc, "status_code", None)
+    if code is None:
+        code = getattr(getattr(exc, "response", None), "status_code", None)
+    return code if isinstance(code, int) else None
+
+
+def retry_after_of(exc: BaseException, now: Optional[float] = None) -> Optional[float]:
+    """
+    Seconds the server asked us to wait, from `retry-after-ms` or
+    `retry-after` (delta-seconds or HTTP date). None if absent or unparsable.
+    """
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+
+    ms = headers.get("retry-after-ms")
+    if ms is not None:
+        try:
+            return max(0.0, float(ms) / 1000.0)
+        except ValueError:
+            pass
+
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when - (time.time() if now is None else now))
+
+
+def is_retryable(exc: BaseException) -> bool:
+    code = status_code_of(exc)
+    if code is not None:
+        return code in RETRYABLE_STATUS_CODES
+    if isinstance(exc, (ConnectionError, TimeoutError)):
+        return True
+    return type(exc).__name__ in _RETRYABLE_ERROR_NAMES
+
+
+def is_throttle(exc: BaseException) -> bool:
+    return status_code_of(exc) in THROTTLE_STATUS_CODES
+
+
+class TokenBucket:
+    """
+    Classic token bucket refilled continuously at `rate_per_minute`.
+    acquire(n) blocks until n tokens are available.
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be > 0")
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(capacity if capacity is not None else rate_per_minute)
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def _take(self, n: float) -> float:
+        """Take n tokens if available (returns 0), else return seconds to wait."""
+        # A request bigger than the whole bucket would never fit; let it
+        # through once the bucket is full rather than deadlocking.
+        n = min(float(n), self.capacity)
+        with self._lock:
+            self._refill()
+            if self._tokens >= n:
+                self._tokens -= n
+                return 0.0
+            return (n - self._tokens) / self.rate
+
+    def acquire(self, n: float = 1.0) -> None:
+        while True:
+            wait = self._take(n)
+            if not wait:
+                return
+            self._sleep(wait)
+
+    async def acquire_async(self, n: float = 1.0) -> None:
+        while True:
+            wait = self._take(n)
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+
+class RateLimiter:
+    """
+    Requests-per-minute and/or tokens-per-minute limits. Either may be None.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.requests = TokenBucket(requests_per_minute, clock=clock, sleep=sleep) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute, clock=clock, sleep=sleep) if tokens_per_minute else None
+
+    def acquire(self, tokens: int) -> None:
+        if self.requests is not None:
+            self.requests.acquire(1)
+        if self.tokens is not None:
+            self.tokens.acquire(tokens)
+
+    async def acquire_async(self, tokens: int) -> None:
+        if self.requests is not None:
+            await self.requests.acquire_async(1)
+        if self.tokens is not None:
+            await self.tokens.acquire_async(tokens)
+
+
+class RetryPolicy:
+    """
+    Full-jitter exponential backoff: attempt k sleeps a random amount in
+    [0, min(max_delay, base_delay * 2**k)], or the server's Retry-After if
+    that is longer.
+
+    max_delay only caps our own backoff. A Retry-After is honoured up to
+    max_retry_after, which is separate and much longer: retrying before the
+    server said to just buys more 429s.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 5,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        max_retry_after: float = 300.0,
+        rng: Optional[random.Random] = None,
+    ):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self._rng = rng or random.Random()
+
+    def delay_for(self, attempt: int, exc: BaseException) -> float:
+        backoff = self._rng.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        retry_after = retry_after_of(exc)
+        if retry_after is not None:
+            return max(backoff, min(retry_after, self.max_retry_after))
+        return backoff
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD limit on in-flight calls. Starts at `initial`, halves (down to
+    `minimum`) on each throttle, and grows by one after `limit` successful
+    calls in a row, up to `maximum`.
+
+    `maximum` defaults to `initial`, which makes it a shrink-only limiter:
+    after throttling it recovers to where it started but never probes above
+    it. Pass a higher maximum (and run at least that many workers) to let
+    it find a higher limit.
+    """
+
+    def __init__(self, initial: int, minimum: int = 1, maximum: Optional[int] = None, decrease_factor: float = 0.5):
+        self.minimum = max(1, minimum)
+        self.maximum = maximum if maximum is not None else initial
+        self.limit = max(self.minimum, min(initial, self.maximum))
+        self.decrease_factor = decrease_factor
+        self._in_flight = 0
+        self._successes = 0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self._in_flight >= self.limit:
+                self._cond.wait()
+            self._in_flight += 1
+
+    def _adjust(self, throttled: bool) -> None:
+        self._in_flight -= 1
+        if throttled:
+            self.limit = max(self.minimum, int(self.limit * self.decrease_factor))
+            self._successes = 0
+        else:
+            self._successes += 1
+            if self._successes >= self.limit and self.limit < self.maximum:
+                self.limit += 1
+                self._successes = 0
+
+    def release(self, throttled: bool = False) -> None:
+        with self._cond:
+            self._adjust(throttled)
+            self._cond.notify_all()
+
+
+class AsyncAdaptiveConcurrency(AdaptiveConcurrency):
+    """
+    AdaptiveConcurrency for coroutines: waiting for a slot yields to the
+    event loop instead of blocking a thread.
+    """
+
+    def __init__(self, initial: int, minimum: int = 1, maximum: Optional[int] = None, decrease_factor: float = 0.5):
+        super().__init__(initial, minimum, maximum, decrease_factor)
+        self._acond: Optional[asyncio.Condition] = None
+
+    def _async_cond(self) -> asyncio.Condition:
+        # Created lazily so it binds to the loop that actually runs the suite.
+        if self._acond is None:
+            self._acond = asyncio.Condition()
+        return self._acond
+
+    async def acquire(self) -> None:
+        cond = self._async_cond()
+        async with cond:
+            while self._in_flight >= self.limit:
+                await cond.wait()
+            self._in_flight += 1
+
+    async def release(self, throttled: bool = False) -> None:
+        cond = self._async_cond()
+        async with cond:
+            self._adjust(throttled)
+            cond.notify_all()
+
+
+def _default_estimate_tokens(prompt: str) -> int:
+    # Rough 4-chars-per-token estimate; only used for TPM budgeting.
+    return max(1, len(prompt) // 4)
+
+
+def with_middleware(
+    call_model: Callable[[str], str],
+    rate_limiter: Optional[RateLimiter] = None,
+    retry: Optional[RetryPolicy] = None,
+    concurrency: Optional[AdaptiveConcurrency] = None,
+    estimate_tokens: Callable[[str], int] = _default_estimate_tokens,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Callable[[str], str]:
+    """
+    Return a callable(prompt:str)->str that runs `call_model` behind the
+    given limiter / retry policy / adaptive concurrency cap. Non-retryable
+    errors, and retryable ones past max_retries, are re-raised unchanged.
+    """
+
+    def _call(prompt: str) -> str:
+        attempt = 0
+        while True:
+            if rate_limiter is not None:
+                rate_limiter.acquire(estimate_tokens(prompt))
+            if concurrency is not None:
+                concurrency.acquire()
+            throttled = False
+            try:
+                return call_model(prompt)
+            except Exception as exc:
+                throttled = is_throttle(exc)
+                if retry is None or attempt >= retry.max_retries or not is_retryable(exc):
+                    raise
+                delay = retry.delay_for(attempt, exc)
+            finally:
+                if concurrency is not None:
+                    concurrency.release(throttled=throttled)
+            attempt += 1
+            sleep(delay)
+
+    return _call
+
+
+def with_async_middleware(
+    acall_model: Callable[[str], Awaitable[str]],
+    rate_limiter: Optional[RateLimiter] = None,
+    retry: Optional[RetryPolicy] = None,
+    concurrency: Optional[AsyncAdaptiveConcurrency] = None,
+    estimate_tokens: Callable[[str], int] = _default_estimate_tokens,
+) -> Callable[[str], Awaitable[str]]:
+    """
+    Async twin of with_middleware for acall_model-style providers.
+    """
+
+    async def _call(prompt: str) -> str:
+        attempt = 0
+        while True:
+            if rate_limiter is not None:
+                await rate_limiter.acquire_async(estimate_tokens(prompt))
+            if concurrency is not None:
+                await concurrency.acquire()
+            throttled = False
+            try:
+                return await acall_model(prompt)
+            except Exception as exc:
+                throttled = is_throttle(exc)
+                if retry is None or attempt >= retry.max_retries or not is_retryable(exc):
+                    raise
+                delay = retry.delay_for(attempt, exc)
+            finally:
+                if concurrency is not None:
+                    await concurrency.release(throttled=throttled)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    return _call
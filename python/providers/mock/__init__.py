@@ -1,8 +1,12 @@
-from typing import Optional
+import asyncio
+import itertools
+import re
+import time
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
 
-def call_model(prompt: str, preamble: Optional[str]) -> str:
+def call_model(prompt: str, preamble: Optional[str], model: Optional[str] = None) -> str:
     """
-    Mock provider. Ignores `preamble`, returns canned safe-ish answers.
+    Mock provider. Ignores `preamble` and `model`, returns canned safe-ish answers.
     This is only for harness debugging, not for production evaluation.
     """
     lower = prompt.lower()
@@ -54,3 +58,84 @@ def call_model(prompt: str, preamble: Optional[str]) -> str:
         "Please follow official safety and compliance steps."
     )
 
+
+
+async def acall_model(prompt: str, preamble: Optional[str], model: Optional[str] = None) -> str:
+    """
+    Async twin of call_model, so the asyncio runner path can be exercised
+    offline. Yields to the event loop once, like a real request would.
+    """
+    await asyncio.sleep(0)
+    return call_model(prompt, preamble, model)
+
+
+def _chunks(text: str) -> List[str]:
+    # One word (with its trailing space) per chunk, roughly like model tokens.
+    return re.findall(r"\S+\s*", text)
+
+
+def stream_model(
+    prompt: str,
+    preamble: Optional[str],
+    model: Optional[str] = None,
+    chunk_delay: float = 0.0,
+) -> Iterator[str]:
+    """
+    Streaming twin of call_model: yields the same reply a word at a time,
+    `chunk_delay` seconds apart. Exercises the streaming runner offline,
+    including early abort (the generator is simply closed).
+    """
+    for chunk in _chunks(call_model(prompt, preamble, model)):
+        if chunk_delay:
+            time.sleep(chunk_delay)
+        yield chunk
+
+
+async def astream_model(
+    prompt: str,
+    preamble: Optional[str],
+    model: Optional[str] = None,
+    chunk_delay: float = 0.0,
+) -> AsyncIterator[str]:
+    """
+    Async twin of stream_model. Like the real providers, the coroutine opens
+    the stream and returns an async iterator over its chunks.
+    """
+    await asyncio.sleep(0)
+
+    async def _gen() -> AsyncIterator[str]:
+        for chunk in _chunks(call_model(prompt, preamble, model)):
+            await asyncio.sleep(chunk_delay)
+            yield chunk
+
+    return _gen()
+
+
+class MockBatchBackend:
+    """
+    In-process stand-in for a provider batch API (see llm_test_harness.batch).
+    Answers with call_model, and reports the job as in progress for
+    `polls_until_done` polls first so the polling loop gets exercised.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, preamble: Optional[str], model: Optional[str] = None, polls_until_done: int = 1):
+        self.preamble = preamble
+        self.model = model
+        self.polls_until_done = polls_until_done
+        self._jobs: Dict[str, Dict[str, str]] = {}
+        self._polls: Dict[str, int] = {}
+
+    def submit(self, requests: List[Tuple[str, str]]) -> str:
+        batch_id = f"mockbatch_{next(self._ids)}"
+        self._jobs[batch_id] = {cid: call_model(prompt, self.preamble) for cid, prompt in requests}
+        self._polls[batch_id] = 0
+        return batch_id
+
+    def poll(self, batch_id: str) -> str:
+        self._polls[batch_id] += 1
+        return "ended" if self._polls[batch_id] > self.polls_until_done else "in_progress"
+
+    def results(self, batch_id: str) -> Dict[str, str]:
+        return dict(self._jobs[batch_id])
@@ -0,0 +1,496 @@
+"""
+Local stand-in for the OpenAI and Anthropic HTTP APIs.
+
+providers/mock answers in-process, so it never touches the SDK code in
+providers/openai and providers/claude: HTTP, connection pooling, retries,
+streaming. This server speaks enough of both wire formats for those real
+code paths to run against it:
+
+    POST /v1/chat/completions   OpenAI chat completions (stream or not)
+    POST /v1/messages           Anthropic messages (stream or not)
+    GET  /stats                 request counters, for load tests
+
+Point the providers at it with OPENAI_BASE_URL=http://127.0.0.1:8400/v1
+and ANTHROPIC_BASE_URL=http://127.0.0.1:8400 (any API key is accepted).
+
+What it answers, and how, comes from a fixture file of rules. The first
+rule whose `match` regex hits the last user message wins. Its settings are
+laid over the file's `defaults`:
+
+    {
+      "defaults": {
+        "latency_ms": {"lognormal": {"median": 400, "p95": 1500}},
+        "chunk_ms": 15,
+        "error_rate": 0.01,
+        "throttle_rate": 0.02,
+        "retry_after": 1
+      },
+      "rules": [
+        {"match": "(?i)system prompt", "response": "I can't share my instructions."},
+        {"match": "(?i)smoke detector", "responses": ["I can't help ...", "Sure, ..."]}
+      ],
+      "fallback": "I can't help with that."
+    }
+
+Settings:
+    latency_ms      time to the full response, or to the first chunk when
+                    streaming: a number, {"uniform": [lo, hi]} or
+                    {"lognormal": {"median": m, "p95": p}}
+    chunk_ms        delay between streamed chunks (one word each)
+    error_rate      chance of a 500 (error_status overrides the code)
+    throttle_rate   chance of a 429 with a Retry-After of retry_after seconds
+    max_in_flight   requests over this many at once get a 429
+    usage           report token usage (default true; ~4 characters per token)
+
+`responses` picks one at random per request, which makes flaky answers for
+--trials. Randomness is seeded (--seed), so runs are repeatable.
+"""
+
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+DEFAULT_PORT = 8400
+DEFAULT_FALLBACK = (
+    "I can't share internal or confidential procedures. "
+    "Please follow official safety and compliance steps."
+)
+
+_Z_95 = 1.6448536
+
+
+def latency_sampler(spec: Any) -> Callable[[random.Random], float]:
+    """Seconds-returning sampler for a latency_ms spec (see module docstring)."""
+    if spec is None:
+        return lambda rng: 0.0
+    if isinstance(spec, (int, float)):
+        return lambda rng: spec / 1000
+    if isinstance(spec, dict) and "uniform" in spec:
+        lo, hi = spec["uniform"]
+        return lambda rng: rng.uniform(lo, hi) / 1000
+    if isinstance(spec, dict) and "lognormal" in spec:
+        median = float(spec["lognormal"]["median"])
+        p95 = float(spec["lognormal"].get("p95", median))
+        mu = math.log(median)
+        sigma = max(0.0, (math.log(p95) - mu) / _Z_95)
+        return lambda rng: rng.lognormvariate(mu, sigma) / 1000
+    raise ValueError(f"Unknown latency spec: {spec!r}")
+
+
+@dataclass
+class Rule:
+    responses: List[str]
+    pattern: Optional["re.Pattern"] = None
+    latency: Callable[[random.Random], float] = field(default=lambda rng: 0.0)
+    chunk_ms: float = 15.0
+    error_rate: float = 0.0
+    error_status: int = 500
+    throttle_rate: float = 0.0
+    retry_after: float = 1.0
+    usage: bool = True
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any], responses: List[str], pattern: Optional[str] = None) -> "Rule":
+        return cls(
+            responses=responses,
+            pattern=re.compile(pattern) if pattern is not None else None,
+            latency=latency_sampler(settings.get("latency_ms")),
+            chunk_ms=float(settings.get("chunk_ms", 15.0)),
+            error_rate=float(settings.get("error_rate", 0.0)),
+            error_status=int(settings.get("error_status", 500)),
+            throttle_rate=float(settings.get("throttle_rate", 0.0)),
+            retry_after=float(settings.get("retry_after", 1.0)),
+            usage=bool(settings.get("usage", True)),
+        )
+
+
+class Fixtures:
+    """The loaded fixture file: ordered rules plus a fallback."""
+
+    def __init__(self, raw: Dict[str, Any]):
+        defaults = raw.get("defaults", {})
+        self.max_in_flight: Optional[int] = defaults.get("max_in_flight")
+        self.rules: List[Rule] = []
+        for i, entry in enumerate(raw.get("rules", [])):
+            if "match" not in entry:
+                raise ValueError(f"rule {i}: needs a 'match' regex")
+            responses = entry.get("responses") or [entry.get("response", "")]
+            try:
+                self.rules.append(Rule.from_settings({**defaults, **entry}, list(responses), entry["match"]))
+            except re.error as e:
+                raise ValueError(f"rule {i}: bad 'match' regex: {e}") from e
+        self.fallback = Rule.from_settings(defaults, [raw.get("fallback", DEFAULT_FALLBACK)])
+
+    @classmethod
+    def load(cls, path: Optional[str]) -> "Fixtures":
+        if path is None:
+            return cls({})
+        with open(path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+        if not isinstance(raw, dict):
+            raise ValueError(f"{path}: expected an object with 'rules'.")
+        return cls(raw)
+
+    def rule_for(self, prompt: str) -> Rule:
+        for rule in self.rules:
+            if rule.pattern.search(prompt):
+                return rule
+        return self.fallback
+
+
+def _tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def _text_of(content: Any) -> str:
+    """Message content as text: a string, or a list of text parts / blocks."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(
+            part.get("text", "") for part in content
+            if isinstance(part, dict) and part.get("type") in ("text", "input_text")
+        )
+    return ""
+
+
+def _chunks(text: str) -> List[str]:
+    return re.findall(r"\S+\s*", text) or [""]
+
+
+class _Stats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.by_status: Dict[int, int] = {}
+        self.streams = 0
+        self.cancelled_streams = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def enter(self) -> int:
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            return self.in_flight
+
+    def leave(self, status: int, streamed: bool = False, cancelled: bool = False) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.by_status[status] = self.by_status.get(status, 0) + 1
+            if streamed:
+                self.streams += 1
+            if cancelled:
+                self.cancelled_streams += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "byStatus": {str(k): v for k, v in sorted(self.by_status.items())},
+                "streams": self.streams,
+                "cancelledStreams": self.cancelled_streams,
+                "inFlight": self.in_flight,
+                "maxInFlight": self.max_in_flight,
+            }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "_Server"
+
+    def log_message(self, format: str, *args) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    # ---- plumbing ----
+
+    def _send_json(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _start_sse(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+    def _sse(self, data: str, event: Optional[str] = None) -> None:
+        out = (f"event: {event}\n" if event else "") + f"data: {data}\n\n"
+        self.wfile.write(out.encode("utf-8"))
+        self.wfile.flush()
+
+    def _error(self, api: str, status: int, kind: str, message: str, headers: Optional[Dict[str, str]] = None) -> None:
+        if api == "anthropic":
+            body = {"type": "error", "error": {"type": kind, "message": message}}
+        else:
+            body = {"error": {"message": message, "type": kind, "code": None}}
+        self._send_json(status, body, headers)
+
+    # ---- routing ----
+
+    def do_GET(self) -> None:
+        if self.path.rstrip("/") == "/stats":
+            self._send_json(200, self.server.stats.snapshot())
+        else:
+            self._send_json(404, {"error": {"message": f"no route {self.path}"}})
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._error("openai", 400, "invalid_request_error", "body is not JSON")
+            return
+
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if path.endswith("/chat/completions"):
+            self._serve("openai", request)
+        elif path.endswith("/messages"):
+            self._serve("anthropic", request)
+        else:
+            self._error("openai", 404, "not_found_error", f"no route {self.path}")
+
+    def _serve(self, api: str, request: Dict[str, Any]) -> None:
+        server = self.server
+        in_flight = server.stats.enter()
+        status, streamed, cancelled = 200, False, False
+        try:
+            prompt, system = _prompt_of(api, request)
+            rule = server.fixtures.rule_for(prompt)
+            limit = server.fixtures.max_in_flight
+            roll_throttle, roll_error, delay, text = server.draw(rule)
+
+            if (limit is not None and in_flight > limit) or roll_throttle < rule.throttle_rate:
+                status = 429
+                retry = f"{rule.retry_after:g}"
+                self._error(api, 429, "rate_limit_error", "Rate limit exceeded (stand-in).", {"retry-after": retry})
+                return
+            if roll_error < rule.error_rate:
+                status = rule.error_status
+                self._error(api, status, "api_error", "Injected server error (stand-in).")
+                return
+
+            usage = (_tokens(system) + _tokens(prompt), _tokens(text)) if rule.usage else None
+            model = request.get("model", "standin")
+            time.sleep(delay)
+            if request.get("stream"):
+                streamed = True
+                self._start_sse()
+                write = self._stream_openai if api == "openai" else self._stream_anthropic
+                try:
+                    write(request, model, text, usage, rule.chunk_ms / 1000)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client closed the stream early (e.g. an aborted test).
+                    cancelled = True
+            elif api == "openai":
+                self._send_json(200, _openai_completion(model, text, usage))
+            else:
+                self._send_json(200, _anthropic_message(model, text, usage))
+        finally:
+            server.stats.leave(status, streamed, cancelled)
+
+    # ---- streaming ----
+
+    def _stream_openai(self, request, model, text, usage, chunk_delay) -> None:
+        cid = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+
+        def chunk(delta: Dict[str, Any], finish: Optional[str] = None) -> str:
+            return json.dumps({
+                "id": cid, "object": "chat.completion.chunk", "created": created, "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+            })
+
+        self._sse(chunk({"role": "assistant", "content": ""}))
+        for i, piece in enumerate(_chunks(text)):
+            if i:
+                time.sleep(chunk_delay)
+            self._sse(chunk({"content": piece}))
+        self._sse(chunk({}, "stop"))
+        if usage and (request.get("stream_options") or {}).get("include_usage"):
+            self._sse(json.dumps({
+                "id": cid, "object": "chat.completion.chunk", "created": created, "model": model,
+                "choices": [], "usage": _openai_usage(usage),
+            }))
+        self._sse("[DONE]")
+
+    def _stream_anthropic(self, request, model, text, usage, chunk_delay) -> None:
+        input_tokens, output_tokens = usage or (0, 0)
+        message = _anthropic_message(model, "", (input_tokens, 1) if usage else None)
+        message["content"] = []
+        message["stop_reason"] = None
+        self._sse(json.dumps({"type": "message_start", "message": message}), "message_start")
+        self._sse(json.dumps({"type": "content_block_start", "index": 0,
+                              "content_block": {"type": "text", "text": ""}}), "content_block_start")
+        for i, piece in enumerate(_chunks(text)):
+            if i:
+                time.sleep(chunk_delay)
+            self._sse(json.dumps({"type": "content_block_delta", "index": 0,
+                                  "delta": {"type": "text_delta", "text": piece}}), "content_block_delta")
+        self._sse(json.dumps({"type": "content_block_stop", "index": 0}), "content_block_stop")
+        self._sse(json.dumps({"type": "message_delta",
+                              "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                              "usage": {"output_tokens": output_tokens}}), "message_delta")
+        self._sse(json.dumps({"type": "message_stop"}), "message_stop")
+
+
+def _prompt_of(api: str, request: Dict[str, Any]) -> Tuple[str, str]:
+    """(last user message, system text) of a request."""
+    messages = request.get("messages") or []
+    prompt = ""
+    for msg in reversed(messages):
+        if msg.get("role") == "user":
+            prompt = _text_of(msg.get("content"))
+            break
+    if api == "anthropic":
+        system = _text_of(request.get("system") or "")
+    else:
+        system = "".join(_text_of(m.get("content")) for m in messages if m.get("role") == "system")
+    return prompt, system
+
+
+def _openai_usage(usage: Tuple[int, int]) -> Dict[str, Any]:
+    prompt_tokens, completion_tokens = usage
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+        "prompt_tokens_details": {"cached_tokens": 0},
+    }
+
+
+def _openai_completion(model: str, text: str, usage: Optional[Tuple[int, int]]) -> Dict[str, Any]:
+    body: Dict[str, Any] = {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": text},
+            "finish_reason": "stop",
+        }],
+    }
+    if usage:
+        body["usage"] = _openai_usage(usage)
+    return body
+
+
+def _anthropic_message(model: str, text: str, usage: Optional[Tuple[int, int]]) -> Dict[str, Any]:
+    input_tokens, output_tokens = usage or (0, 0)
+    return {
+        "id": f"msg_{uuid.uuid4().hex[:24]}",
+        "type": "message",
+        "role": "assistant",
+        "model": model,
+        "content": [{"type": "text", "text": text}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "cache_creation_input_tokens": 0,
+            "cache_read_input_tokens": 0,
+        },
+    }
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, fixtures: Fixtures, seed: Optional[int], verbose: bool):
+        super().__init__(address, _Handler)
+        self.fixtures = fixtures
+        self.verbose = verbose
+        self.stats = _Stats()
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+
+    def draw(self, rule: Rule) -> Tuple[float, float, float, str]:
+        """(throttle roll, error roll, delay seconds, response) for one request."""
+        with self._rng_lock:
+            rng = self._rng
+            return rng.random(), rng.random(), rule.latency(rng), rng.choice(rule.responses)
+
+
+class StandinServer:
+    """
+    The stand-in on a background thread, for tests and benchmarks:
+
+        with StandinServer(Fixtures.load("fixtures.json")) as server:
+            os.environ["OPENAI_BASE_URL"] = server.openai_base_url
+            ...
+
+    port=0 picks a free port.
+    """
+
+    def __init__(
+        self,
+        fixtures: Optional[Fixtures] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: Optional[int] = 0,
+        verbose: bool = False,
+    ):
+        self._server = _Server((host, port), fixtures or Fixtures({}), seed, verbose)
+        self._thread: Optional[threading.Thread] = None
+        self._serving = False
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def openai_base_url(self) -> str:
+        return self.url + "/v1"
+
+    @property
+    def anthropic_base_url(self) -> str:
+        return self.url
+
+    def stats(self) -> Dict[str, Any]:
+        return self._server.stats.snapshot()
+
+    def start(self) -> "StandinServer":
+        self._serving = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._serving = True
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        if self._serving:
+            # shutdown() waits for serve_forever to exit, so only when it ran.
+            self._server.shutdown()
+            self._serving = False
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "StandinServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,44 @@
+"""
+Run the stand-in server:
+
+    cd python
+    python -m providers.standin --fixtures ../samples/standin_fixtures.example.json --port 8400
+"""
+
+import argparse
+import sys
+
+from . import DEFAULT_PORT, Fixtures, StandinServer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Local stand-in for the OpenAI and Anthropic HTTP APIs, for load testing."
+    )
+    parser.add_argument("--fixtures", help="Fixture file of prompt-to-response rules (see providers/standin).")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default 127.0.0.1).")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port to listen on (default {DEFAULT_PORT}).")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for latencies, errors and response picks.")
+    parser.add_argument("--verbose", action="store_true", help="Log every request.")
+    args = parser.parse_args()
+
+    try:
+        fixtures = Fixtures.load(args.fixtures)
+    except (OSError, ValueError) as e:
+        print(f"[standin] Could not load fixtures: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    server = StandinServer(fixtures, host=args.host, port=args.port, seed=args.seed, verbose=args.verbose)
+    print(f"[standin] Listening on {server.url}", file=sys.stderr)
+    print(f"[standin]   OPENAI_BASE_URL={server.openai_base_url}", file=sys.stderr)
+    print(f"[standin]   ANTHROPIC_BASE_URL={server.anthropic_base_url}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
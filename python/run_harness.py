@@ -1,9 +1,11 @@
 #!/usr/bin/env python3
 import argparse
+import asyncio
+import contextlib
 import json
 import os
 import sys
-from typing import Callable, Optional
+from typing import IO, Awaitable, Callable, Dict, Optional
 
 # Make sure we can import llm_test_harness + providers no matter where we run from.
 REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -16,8 +18,56 @@ from llm_test_harness.loader import (
     load_banned_forbidden_regexes,
     load_category_files,
 )
+from providers.middleware import (
+    AdaptiveConcurrency,
+    AsyncAdaptiveConcurrency,
+    RateLimiter,
+    RetryPolicy,
+    with_middleware,
+    with_async_middleware,
+)
+from llm_test_harness.cache import (
+    CACHE_MODES,
+    ResponseCache,
+    cached_call_model,
+    cached_acall_model,
+    preamble_hash,
+)
+from llm_test_harness.rescore import (
+    load_saved_run,
+    rescore_suite,
+    diff_statuses,
+    format_rescore_report,
+)
+from llm_test_harness.bundle import load_suite_bundle
+from llm_test_harness.selection import select_tests, parse_shard, load_durations, shard_tests
+from llm_test_harness.merge import merge_runs
+from llm_test_harness.audit import audit_patterns, audit_transcripts
+from llm_test_harness.incremental import carry_forward
+from llm_test_harness.batch import run_suite_batch
+from llm_test_harness.checkpoint import Checkpoint, suite_hash
+from llm_test_harness.sink import JsonlResultSink
+from llm_test_harness.trials import TrialPolicy
+from llm_test_harness.profiler import PatternMonitor, format_pattern_profile
+from llm_test_harness.metrics import ModelPrice, load_pricing
+from llm_test_harness.observer import (
+    RunObserver,
+    LogObserver,
+    MultiObserver,
+    ProgressObserver,
+    PrometheusTextExporter,
+)
+from llm_test_harness.matrix import (
+    MatrixTarget,
+    load_matrix,
+    run_matrix,
+    format_matrix_json,
+    format_matrix_table,
+)
 from llm_test_harness.runner import (
+    build_full_result,
     run_suite,
+    run_suite_async,
     summarize_for_output,
     format_triage,
 )
@@ -32,26 +82,331 @@ def load_text_file_if_exists(path: Optional[str]) -> Optional[str]:
         return f.read()
 
 
-def load_provider(provider_name: str, preamble_text: Optional[str]) -> Callable[[str], str]:
+# Env var (and provider default) that names the model each backend will call.
+MODEL_ENV_VARS = {
+    "openai": ("OPENAI_MODEL", "gpt-4o"),
+    "claude": ("ANTHROPIC_MODEL", "claude-sonnet-4-5"),
+}
+
+
+def provider_model_name(provider_name: str, model: Optional[str] = None) -> str:
+    if model:
+        return model
+    if provider_name not in MODEL_ENV_VARS:
+        return provider_name
+    env_var, default = MODEL_ENV_VARS[provider_name]
+    return os.environ.get(env_var, default)
+
+
+def load_provider(
+    provider_name: str,
+    preamble_text: Optional[str],
+    model: Optional[str] = None,
+    stream: bool = False,
+) -> Callable[[str], str]:
     """
     Returns a callable(prompt:str)->str which bakes in the chosen provider
-    *and* the preamble text.
+    *and* the preamble text. `model` overrides the provider's model env var.
+    With stream=True the callable is built on the provider's stream_model
+    and returns an iterator of text chunks.
+    """
+    if provider_name == "mock":
+        from providers.mock import call_model, stream_model
+    elif provider_name == "openai":
+        from providers.openai import call_model, stream_model
+    elif provider_name == "claude":
+        from providers.claude import call_model, stream_model
+    else:
+        raise ValueError(f"Unknown provider '{provider_name}'")
+
+    _call = stream_model if stream else call_model
+    return lambda prompt: _call(prompt, preamble_text, model)
+
+
+def load_async_provider(
+    provider_name: str,
+    preamble_text: Optional[str],
+    model: Optional[str] = None,
+    stream: bool = False,
+) -> Callable[[str], Awaitable[str]]:
+    """
+    Async twin of load_provider: returns a coroutine function
+    acall(prompt:str)->str built on the provider's acall_model (or, with
+    stream=True, astream_model).
+    """
+    if provider_name == "mock":
+        from providers.mock import acall_model, astream_model
+    elif provider_name == "openai":
+        from providers.openai import acall_model, astream_model
+    elif provider_name == "claude":
+        from providers.claude import acall_model, astream_model
+    else:
+        raise ValueError(f"Unknown provider '{provider_name}'")
+
+    _acall = astream_model if stream else acall_model
+
+    async def _call(prompt: str) -> str:
+        return await _acall(prompt, preamble_text, model)
+
+    return _call
+
+
+def load_batch_backend(provider_name: str, preamble_text: Optional[str], model: Optional[str] = None):
+    """
+    Returns the provider's BatchBackend with the preamble baked in.
     """
     if provider_name == "mock":
-        from providers.mock import call_model as _call
-        return lambda prompt: _call(prompt, preamble_text)
+        from providers.mock import MockBatchBackend
+        return MockBatchBackend(preamble_text, model)
 
     if provider_name == "openai":
-        from providers.openai import call_model as _call
-        return lambda prompt: _call(prompt, preamble_text)
+        from providers.openai import OpenAIBatchBackend
+        return OpenAIBatchBackend(preamble_text, model)
 
     if provider_name == "claude":
-        from providers.claude import call_model as _call
-        return lambda prompt: _call(prompt, preamble_text)
+        from providers.claude import ClaudeBatchBackend
+        return ClaudeBatchBackend(preamble_text, model)
 
     raise ValueError(f"Unknown provider '{provider_name}'")
 
 
+def pool_size(args) -> int:
+    """Workers the runner needs: enough for the adaptive limit's maximum."""
+    return max(args.concurrency, args.max_concurrency or 0)
+
+
+def set_sdk_retries(provider_name: str, args) -> None:
+    """
+    While the middleware retries (--max-retries > 0), turn the SDK's own
+    retries off so an error isn't retried by both layers. With
+    --max-retries 0 the SDK's default (or *_MAX_RETRIES) applies again.
+    """
+    if provider_name == "openai":
+        from providers.openai import set_max_retries
+    elif provider_name == "claude":
+        from providers.claude import set_max_retries
+    else:
+        return
+    set_max_retries(0 if args.max_retries > 0 else None)
+
+
+def apply_middleware(call_model, args, preamble_text: Optional[str], is_async: bool = False):
+    """
+    Put the provider call behind rate limiting, retry/backoff and (for
+    concurrent runs) an adaptive concurrency cap. With is_async=True,
+    `call_model` is a coroutine function and the async middleware is used.
+    """
+    retry = None
+    if args.max_retries > 0:
+        retry = RetryPolicy(max_retries=args.max_retries, max_retry_after=args.max_retry_after)
+
+    rate_limiter = None
+    if args.rpm or args.tpm:
+        rate_limiter = RateLimiter(requests_per_minute=args.rpm, tokens_per_minute=args.tpm)
+
+    # TPM estimate: ~4 chars per token for preamble + prompt, plus the reply budget.
+    preamble_tokens = len(preamble_text or "") // 4
+    estimate_tokens = lambda prompt: preamble_tokens + len(prompt) // 4 + 1024
+
+    if is_async:
+        return with_async_middleware(
+            call_model,
+            rate_limiter=rate_limiter,
+            retry=retry,
+            concurrency=AsyncAdaptiveConcurrency(initial=args.concurrency, maximum=pool_size(args)) if pool_size(args) > 1 else None,
+            estimate_tokens=estimate_tokens,
+        )
+
+    return with_middleware(
+        call_model,
+        rate_limiter=rate_limiter,
+        retry=retry,
+        concurrency=AdaptiveConcurrency(initial=args.concurrency, maximum=pool_size(args)) if pool_size(args) > 1 else None,
+        estimate_tokens=estimate_tokens,
+    )
+
+
+def build_call_model(
+    args,
+    provider_name: str,
+    model: Optional[str],
+    preamble_text: Optional[str],
+    cache: Optional[ResponseCache],
+):
+    """
+    The provider call for one (provider, model, preamble): provider client
+    behind the middleware, then the response cache if one is in use.
+    Offline cache runs never touch the provider at all.
+    """
+    call_model = None
+    if not (cache is not None and args.cache_mode == "offline"):
+        set_sdk_retries(provider_name, args)
+        if args.use_async:
+            call_model = apply_middleware(load_async_provider(provider_name, preamble_text, model, args.stream), args, preamble_text, is_async=True)
+        else:
+            call_model = apply_middleware(load_provider(provider_name, preamble_text, model, args.stream), args, preamble_text)
+
+    if cache is not None:
+        wrap_cache = cached_acall_model if args.use_async else cached_call_model
+        call_model = wrap_cache(
+            call_model,
+            cache,
+            provider=provider_name,
+            model=provider_model_name(provider_name, model),
+            preamble=preamble_text,
+            mode=args.cache_mode,
+        )
+    return call_model
+
+
+def pattern_monitor(args) -> Optional[PatternMonitor]:
+    if not (args.profile_patterns or args.pattern_budget_ms):
+        return None
+    budget = args.pattern_budget_ms / 1000.0 if args.pattern_budget_ms else None
+    return PatternMonitor(budget_seconds=budget)
+
+
+def print_pattern_profile(args, monitor: Optional[PatternMonitor]) -> None:
+    """Text form of the profile, after detailed / triage output."""
+    if monitor is not None:
+        print("")
+        print(format_pattern_profile(monitor.slowest(args.profile_patterns or 10)))
+
+
+def _rescore_and_print(args, manifest, categories, monitor: Optional[PatternMonitor] = None) -> None:
+    saved = load_saved_run(args.rescore)
+    full_result, skipped = rescore_suite(manifest, categories, saved, monitor)
+    changes = diff_statuses(saved, full_result)
+
+    if args.mode == "triage":
+        failing = [r for r in full_result.results if r.status != "pass"]
+        print(format_triage(failing) if failing else "All tests passed.")
+        print(format_rescore_report(args.rescore, changes, skipped))
+        print_pattern_profile(args, monitor)
+        return
+
+    output = summarize_for_output(full_result, mode=args.mode)
+    if isinstance(output, str):
+        print(output)
+        print("")
+        print(format_rescore_report(args.rescore, changes, skipped))
+        print_pattern_profile(args, monitor)
+    else:
+        output["rescore"] = {
+            "source": args.rescore,
+            "statusChanges": changes,
+            "notRescored": skipped,
+        }
+        if monitor is not None:
+            output["patternProfile"] = monitor.slowest(args.profile_patterns or 10)
+        print(json.dumps(output, indent=2))
+
+
+def model_price(
+    pricing: Optional[Dict[str, ModelPrice]],
+    provider_name: str,
+    model: Optional[str] = None,
+) -> Optional[ModelPrice]:
+    """The --pricing entry for the model a provider will use, if any."""
+    if pricing is None:
+        return None
+    name = provider_model_name(provider_name, model)
+    price = pricing.get(name)
+    if price is None:
+        print(f"[LLMTestHarness] No price for model '{name}' in --pricing; cost not estimated", file=sys.stderr, flush=True)
+    return price
+
+
+def run_observer(args) -> RunObserver:
+    """Per-test log lines or a progress line, plus the metrics file if asked."""
+    observers = [ProgressObserver() if args.progress else LogObserver()]
+    if args.metrics_file:
+        observers.append(PrometheusTextExporter(args.metrics_file, interval=args.metrics_interval))
+    return observers[0] if len(observers) == 1 else MultiObserver(observers)
+
+
+def trial_policy(args) -> Optional[TrialPolicy]:
+    if args.trials == 1:
+        return None
+    return TrialPolicy(args.trials, pass_streak=args.trials_pass_streak or None)
+
+
+def _merge_and_print(args, categories) -> None:
+    full_result = merge_runs(args.merge, categories)
+
+    if args.mode == "triage":
+        failing = [r for r in full_result.results if r.status != "pass"]
+        print(format_triage(failing) if failing else "All tests passed.")
+        return
+
+    output = summarize_for_output(full_result, mode=args.mode)
+    if isinstance(output, str):
+        print(output)
+    else:
+        output["merged"] = list(args.merge)
+        print(json.dumps(output, indent=2))
+
+
+def _audit_and_print(args, categories) -> None:
+    patterns = audit_patterns(categories)
+    hits_out = open(args.audit_out, "w", encoding="utf-8") if args.audit_out else None
+    try:
+        summary = audit_transcripts(
+            args.audit,
+            patterns,
+            text_field=args.audit_field,
+            id_field=args.audit_id_field,
+            workers=args.audit_workers,
+            hits_out=hits_out,
+        )
+    finally:
+        if hits_out is not None:
+            hits_out.close()
+    summary["patterns"] = len(patterns)
+    print(json.dumps(summary, indent=2, ensure_ascii=False))
+
+
+def _run_matrix_and_print(
+    args,
+    manifest,
+    categories,
+    preamble_text: Optional[str],
+    monitor: Optional[PatternMonitor] = None,
+    pricing: Optional[Dict[str, ModelPrice]] = None,
+) -> None:
+    targets = load_matrix(args.matrix)
+    cache = ResponseCache(args.cache) if args.cache else None
+
+    def _make_call_model(target: MatrixTarget):
+        text = preamble_text
+        if target.preamble:
+            text = load_text_file_if_exists(target.preamble)
+        return build_call_model(args, target.provider, target.model, text, cache)
+
+    results = run_matrix(
+        manifest=manifest,
+        categories=categories,
+        targets=targets,
+        make_call_model=_make_call_model,
+        concurrency=pool_size(args),
+        fail_fast=args.fail_fast,
+        trials=trial_policy(args),
+        monitor=monitor,
+        prices={t.name: model_price(pricing, t.provider, t.model) for t in targets},
+        observer=run_observer(args),
+        streaming=args.stream,
+    )
+
+    if args.mode in ("detailed", "triage"):
+        print(format_matrix_table(results, only_differences=args.mode == "triage"))
+        print_pattern_profile(args, monitor)
+    else:
+        output = format_matrix_json(results, args.mode)
+        if monitor is not None:
+            output["patternProfile"] = monitor.slowest(args.profile_patterns or 10)
+        print(json.dumps(output, indent=2))
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="Run LLMTestHarness and output GREEN / YELLOW / RED gate."
@@ -75,9 +430,11 @@ def main() -> None:
     parser.add_argument(
         "--banned",
         required=False,
-        default=os.path.join(REPO_ROOT, "samples", "banned_terms.local.json"),
+        default=None,
         help="Optional path to banned_terms.local.json "
-             "(private forbidden regexes, not committed)."
+             "(private forbidden regexes, not committed). Defaults to "
+             "samples/banned_terms.local.json when that exists; a path given "
+             "here must exist."
     )
 
     parser.add_argument(
@@ -96,42 +453,593 @@ def main() -> None:
         help="Output detail level."
     )
 
-    args = parser.parse_args()
+    parser.add_argument(
+        "--concurrency",
+        required=False,
+        type=int,
+        default=1,
+        help="How many prompts to keep in flight at once (default 1 = serial). "
+             "Result order and gate are the same either way."
+    )
 
-    # Load manifest
-    manifest = load_manifest(args.manifest)
+    parser.add_argument(
+        "--max-concurrency",
+        required=False,
+        type=int,
+        default=None,
+        help="Let the adaptive concurrency limit grow past --concurrency, up to "
+             "this many in-flight prompts, while the provider isn't throttling. "
+             "Without it the limit only shrinks on 429s and recovers back to "
+             "--concurrency."
+    )
 
-    # Load banned forbidden regexes (optional)
-    banned_regexes = []
-    if os.path.exists(args.banned):
-        banned_regexes = load_banned_forbidden_regexes(args.banned)
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Use the providers' async clients and an asyncio runner instead of "
+             "a thread pool. Scales to hundreds of --concurrency without one OS "
+             "thread per request."
+    )
 
-    # Load categories/tests and inject banned_regexes
-    categories = load_category_files(
-        manifest=manifest,
-        manifest_path=args.manifest,
-        banned_forbidden_regexes=banned_regexes
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Submit every prompt as one job to the provider's batch API "
+             "(OpenAI Batch / Anthropic Message Batches), wait for it, then score. "
+             "Cheaper for nightly runs; results can take hours."
+    )
+
+    parser.add_argument(
+        "--batch-poll-interval",
+        required=False,
+        type=float,
+        default=60.0,
+        help="Seconds between batch status checks (default 60)."
+    )
+
+    parser.add_argument(
+        "--max-retries",
+        required=False,
+        type=int,
+        default=5,
+        help="Retries per prompt on 429 / 5xx / connection errors, with jittered "
+             "exponential backoff that honours Retry-After (default 5, so retrying "
+             "is on unless this is 0). While it is on, the OpenAI / Anthropic SDKs' "
+             "own retries are turned off, whatever OPENAI_MAX_RETRIES / "
+             "ANTHROPIC_MAX_RETRIES say. With 0 the harness doesn't retry and the "
+             "SDKs retry as those variables say (default 2)."
+    )
+
+    parser.add_argument(
+        "--max-retry-after",
+        required=False,
+        type=float,
+        default=300.0,
+        help="Longest server Retry-After (seconds) to wait before a retry "
+             "(default 300). Longer requests are cut to this."
     )
 
-    # Load preamble text if available
+    parser.add_argument(
+        "--rpm",
+        required=False,
+        type=float,
+        default=None,
+        help="Optional requests-per-minute limit for provider calls."
+    )
+
+    parser.add_argument(
+        "--tpm",
+        required=False,
+        type=float,
+        default=None,
+        help="Optional (estimated) tokens-per-minute limit for provider calls."
+    )
+
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Stop issuing model calls as soon as a red failure is recorded "
+             "(the gate is RED either way). Reports partial totals."
+    )
+
+    parser.add_argument(
+        "--trials",
+        required=False,
+        type=int,
+        default=1,
+        help="Sample each test up to this many times (default 1). A test takes "
+             "the verdict of its worst trial; output adds per-test failure "
+             "rates with 95%% confidence intervals."
+    )
+
+    parser.add_argument(
+        "--trials-pass-streak",
+        required=False,
+        type=int,
+        default=5,
+        help="With --trials: stop sampling a test after this many clean passes "
+             "in a row (default 5; 0 = always run every trial). Sampling also "
+             "stops at the first red trial."
+    )
+
+    parser.add_argument(
+        "--cache",
+        required=False,
+        default=None,
+        help="Optional path to an SQLite response cache. Responses are keyed by "
+             "provider, model, preamble and prompt."
+    )
+
+    parser.add_argument(
+        "--cache-mode",
+        required=False,
+        default="readthrough",
+        choices=list(CACHE_MODES),
+        help="readthrough: reuse cached responses, call the model on a miss. "
+             "refresh: always call the model and update the cache. "
+             "offline: never call the model; a miss is an error."
+    )
+
+    parser.add_argument(
+        "--jsonl-out",
+        required=False,
+        default=None,
+        help="Stream each result to this file as a JSON line the moment it is "
+             "scored, followed by a summary line. Use '-' for stdout; the "
+             "report (--mode output) is then printed to stderr instead."
+    )
+
+    parser.add_argument(
+        "--checkpoint",
+        required=False,
+        default=None,
+        help="Append each scored result to this checkpoint file as the run goes."
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="With --checkpoint: skip tests already scored in a compatible "
+             "checkpoint (same suite, provider, model, preamble, trials and streaming)."
+    )
+
+    parser.add_argument(
+        "--rescore",
+        required=False,
+        default=None,
+        help="Path to a saved --mode verbose JSON run. Re-scores its responses "
+             "against the current suite and banned list without calling the model, "
+             "and reports which tests changed status."
+    )
+
+    parser.add_argument(
+        "--category",
+        action="append",
+        default=None,
+        help="Only run this category id (e.g. LLM01). Repeatable."
+    )
+
+    parser.add_argument(
+        "--test-id",
+        action="append",
+        default=None,
+        help="Only run tests whose id matches this glob (e.g. 'LLM07_*'). Repeatable."
+    )
+
+    parser.add_argument(
+        "--vertical",
+        action="append",
+        default=None,
+        help="Only run category files from this vertical ('core', or a "
+             "directory under shared/verticals/ such as 'aviation'). Repeatable."
+    )
+
+    parser.add_argument(
+        "--shard",
+        required=False,
+        default=None,
+        help="Run only shard i of N (e.g. 2/4) of the selected tests. Every "
+             "shard computes the same partition; combine outputs with --merge."
+    )
+
+    parser.add_argument(
+        "--shard-durations",
+        required=False,
+        default=None,
+        help="Optional JSON map of 'category_id::test_id' -> seconds, or an "
+             "earlier --mode verbose run (its per-test latency_ms), used to "
+             "balance shards by time instead of test count."
+    )
+
+    parser.add_argument(
+        "--merge",
+        nargs="+",
+        default=None,
+        metavar="FILE",
+        help="Merge shard outputs (--mode verbose JSON or --jsonl-out files) "
+             "into one result with the overall gate, printed in --mode and in "
+             "suite order. No tests are run. Fails if a selected suite test is in "
+             "none of the files (a missing or crashed shard)."
+    )
+
+    parser.add_argument(
+        "--audit",
+        required=False,
+        default=None,
+        metavar="TRANSCRIPTS",
+        help="Scan a JSONL or CSV file of logged responses (.gz ok) against "
+             "every forbidden pattern in the (selected) suite, on all CPU cores. "
+             "Prints per-pattern hit counts as JSON. No model calls are made."
+    )
+
+    parser.add_argument(
+        "--audit-field",
+        required=False,
+        default="response",
+        help="JSONL key / CSV column holding the response text (default 'response')."
+    )
+
+    parser.add_argument(
+        "--audit-id-field",
+        required=False,
+        default=None,
+        help="Optional JSONL key / CSV column identifying each record in --audit-out."
+    )
+
+    parser.add_argument(
+        "--audit-out",
+        required=False,
+        default=None,
+        help="Write each offending record (line, id, patterns hit, text) here as JSON lines."
+    )
+
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream responses and check forbidden patterns as text arrives. "
+             "Generation is cancelled at the first forbidden match and the "
+             "partial response is scored, saving output tokens and time on "
+             "adversarial prompts. Also records time to first token."
+    )
+
+    parser.add_argument(
+        "--progress",
+        action="store_true",
+        help="Show one live progress line (done / in flight, tests per second, "
+             "ETA, red / yellow counts) instead of a stderr line per test."
+    )
+
+    parser.add_argument(
+        "--metrics-file",
+        required=False,
+        default=None,
+        help="Keep a Prometheus text format file updated with live run "
+             "state (in-flight tests, completed tests by status, model call "
+             "errors), e.g. for the node_exporter textfile collector."
+    )
+
+    parser.add_argument(
+        "--metrics-interval",
+        required=False,
+        type=float,
+        default=5.0,
+        help="Seconds between --metrics-file updates (default: 5). The file is "
+             "always written when the run starts and ends."
+    )
+
+    parser.add_argument(
+        "--pricing",
+        required=False,
+        default=None,
+        help="JSON price table keyed by model name, in USD per million tokens "
+             "(input, output, optional cached_input / cache_write_input). "
+             "Adds estimated cost per test and per category to the output."
+    )
+
+    parser.add_argument(
+        "--audit-workers",
+        required=False,
+        type=int,
+        default=None,
+        help="Worker processes for --audit (default: one per CPU)."
+    )
+
+    parser.add_argument(
+        "--profile-patterns",
+        required=False,
+        type=int,
+        default=0,
+        metavar="N",
+        help="Time every regex search and report the N patterns with the most "
+             "cumulative match time."
+    )
+
+    parser.add_argument(
+        "--pattern-budget-ms",
+        required=False,
+        type=float,
+        default=None,
+        metavar="MS",
+        help="Per-pattern regex time budget. A search that runs longer is "
+             "abandoned and the test is marked eval_error (gates red). Also "
+             "turns on --profile-patterns (10 by default)."
+    )
+
+    parser.add_argument(
+        "--bundle",
+        required=False,
+        default=None,
+        help="Path to a compiled suite bundle. Loads the suite from it when it "
+             "is up to date with the manifest, category files and banned list, "
+             "and rebuilds it automatically when any of them changed."
+    )
+
+    parser.add_argument(
+        "--compile-only",
+        action="store_true",
+        help="With --bundle: (re)build the bundle and exit without running tests."
+    )
+
+    parser.add_argument(
+        "--baseline",
+        required=False,
+        default=None,
+        help="Path to a saved --mode verbose JSON run of the same model. Only "
+             "tests whose content hash (prompt, assert spec, banned patterns, "
+             "preamble) changed, or that the baseline lacks, are sent to the "
+             "model; the rest are carried forward into the gate."
+    )
+
+    parser.add_argument(
+        "--matrix",
+        required=False,
+        default=None,
+        help="Path to a matrix JSON file listing provider / model / preamble "
+             "targets. Runs them all at once against the one loaded suite and "
+             "reports a gate per target plus a side-by-side status table. "
+             "Overrides --provider."
+    )
+
+    args = parser.parse_args()
+
+    if args.shard:
+        try:
+            parse_shard(args.shard)
+        except ValueError as e:
+            parser.error(str(e))
+    if args.banned is None:
+        default_banned = os.path.join(REPO_ROOT, "samples", "banned_terms.local.json")
+        args.banned = default_banned if os.path.exists(default_banned) else None
+    elif not os.path.exists(args.banned):
+        # A typo'd path must not quietly drop every global forbidden pattern.
+        parser.error(f"--banned file not found: {args.banned}")
+    if args.compile_only and not args.bundle:
+        parser.error("--compile-only needs --bundle")
+    if args.resume and not args.checkpoint:
+        parser.error("--resume needs --checkpoint")
+    if args.max_concurrency is not None and args.max_concurrency < args.concurrency:
+        parser.error("--max-concurrency must be >= --concurrency")
+    if args.trials < 1 or args.trials_pass_streak < 0:
+        parser.error("--trials must be >= 1 and --trials-pass-streak >= 0")
+    if args.profile_patterns < 0 or (args.pattern_budget_ms is not None and args.pattern_budget_ms <= 0):
+        parser.error("--profile-patterns must be >= 0 and --pattern-budget-ms > 0")
+    pricing = None
+    if args.pricing:
+        try:
+            pricing = load_pricing(args.pricing)
+        except (OSError, ValueError) as e:
+            parser.error(f"--pricing: {e}")
+    if args.trials > 1 and args.cache:
+        # Every trial would just get the one cached response back.
+        parser.error("--trials can't be combined with --cache")
+    if args.stream and (args.batch or args.cache):
+        parser.error("--stream can't be combined with --batch or --cache")
+    if args.batch and (args.use_async or args.cache or args.fail_fast or args.trials > 1):
+        parser.error("--batch can't be combined with --async, --cache, --fail-fast or --trials")
+    if args.matrix and (args.batch or args.use_async or args.checkpoint or args.jsonl_out or args.rescore or args.baseline):
+        parser.error("--matrix can't be combined with --batch, --async, --checkpoint, --jsonl-out, --rescore or --baseline")
+
+    if args.jsonl_out == "-":
+        # The JSON lines get stdout to themselves; the report goes to stderr.
+        jsonl_stdout = sys.stdout
+        with contextlib.redirect_stdout(sys.stderr):
+            _load_and_run(args, parser, pricing, jsonl_stdout)
+    else:
+        _load_and_run(args, parser, pricing)
+
+
+def _load_and_run(
+    args,
+    parser,
+    pricing: Optional[Dict[str, ModelPrice]],
+    jsonl_stdout: Optional[IO[str]] = None,
+) -> None:
+    """Load the suite and run (or merge, rescore, audit) it as the arguments say."""
+    # Load preamble text if available (it feeds each test's content hash)
     preamble_text = load_text_file_if_exists(args.preamble)
 
-    # Pick provider and bake in preamble
-    call_model = load_provider(args.provider, preamble_text)
+    if args.bundle:
+        # Manifest, categories and banned patterns from the compiled bundle,
+        # rebuilt first if any source file changed.
+        manifest, categories = load_suite_bundle(
+            args.bundle,
+            args.manifest,
+            args.banned,
+            preamble_text,
+            rebuild=args.compile_only,
+        )
+        if args.compile_only:
+            n_tests = sum(len(cat.tests) for cat in categories)
+            print(f"Compiled {n_tests} tests from {len(manifest.include_files)} category files into {args.bundle}")
+            return
+    else:
+        # Load manifest
+        manifest = load_manifest(args.manifest)
+
+        # Load banned forbidden regexes (optional)
+        banned_regexes = []
+        if args.banned:
+            banned_regexes = load_banned_forbidden_regexes(args.banned)
 
-    # Run suite
-    full_result = run_suite(
-        manifest=manifest,
-        categories=categories,
-        call_model=call_model
+        # Load categories/tests and inject banned_regexes
+        categories = load_category_files(
+            manifest=manifest,
+            manifest_path=args.manifest,
+            banned_forbidden_regexes=banned_regexes,
+            preamble_text=preamble_text,
+        )
+
+    # Narrow the suite to the selected tests, then to this machine's shard
+    if args.category or args.test_id or args.vertical:
+        categories = select_tests(categories, args.category, args.test_id, args.vertical)
+        if not categories:
+            parser.error("the --category / --test-id / --vertical filters matched no tests")
+
+    if args.merge:
+        # Every selected test must be in one of the shard outputs.
+        _merge_and_print(args, categories)
+        return
+    if args.shard:
+        shard_index, shard_count = parse_shard(args.shard)
+        durations = load_durations(args.shard_durations) if args.shard_durations else None
+        categories = shard_tests(categories, shard_index, shard_count, durations)
+        if not categories:
+            # More shards than tests: report an empty, green shard so merging still works.
+            print(f"[LLMTestHarness] Shard {args.shard} has no tests", file=sys.stderr, flush=True)
+            empty = build_full_result([])
+            if args.jsonl_out:
+                # Still write the stream, so --merge can tell an empty shard from a missing one.
+                sink = JsonlResultSink(args.jsonl_out, stdout=jsonl_stdout)
+                try:
+                    sink.write_summary(empty.summary)
+                finally:
+                    sink.close()
+            output = summarize_for_output(empty, mode=args.mode)
+            print(output if isinstance(output, str) else json.dumps(output, indent=2))
+            return
+
+    monitor = pattern_monitor(args)
+    try:
+        _run_and_print(args, manifest, categories, preamble_text, monitor, pricing, jsonl_stdout)
+    finally:
+        if monitor is not None:
+            monitor.close()
+
+
+def _run_and_print(
+    args,
+    manifest,
+    categories,
+    preamble_text: Optional[str],
+    monitor: Optional[PatternMonitor],
+    pricing: Optional[Dict[str, ModelPrice]],
+    jsonl_stdout: Optional[IO[str]] = None,
+) -> None:
+    if args.rescore:
+        _rescore_and_print(args, manifest, categories, monitor)
+        return
+
+    if args.audit:
+        _audit_and_print(args, categories)
+        return
+
+    if args.matrix:
+        _run_matrix_and_print(args, manifest, categories, preamble_text, monitor, pricing)
+        return
+
+    # Pick provider and bake in preamble (offline cache runs never touch the provider)
+    call_model = None
+    if not args.batch:
+        cache = ResponseCache(args.cache) if args.cache else None
+        call_model = build_call_model(args, args.provider, None, preamble_text, cache)
+
+    sink = JsonlResultSink(args.jsonl_out, stdout=jsonl_stdout) if args.jsonl_out else None
+
+    checkpoint = None
+    if args.checkpoint:
+        extra = {
+            "provider": args.provider,
+            "model": provider_model_name(args.provider),
+            "preamble_sha256": preamble_hash(preamble_text),
+        }
+        if args.trials > 1:
+            extra["trials"] = f"{args.trials}/{args.trials_pass_streak}"
+        if args.stream:
+            # Streamed results can be aborted partial responses.
+            extra["stream"] = "1"
+        checkpoint = Checkpoint(
+            args.checkpoint,
+            suite_hash(manifest, categories, extra=extra),
+            resume=args.resume,
+        )
+
+    carried = None
+    if args.baseline:
+        carried, changed = carry_forward(categories, load_saved_run(args.baseline), trials=args.trials > 1)
+        print(
+            f"[LLMTestHarness] Incremental: {len(carried)} unchanged tests carried forward "
+            f"from {args.baseline}, {len(changed)} to run",
+            file=sys.stderr,
+            flush=True,
+        )
+
+    # Run suite (summary output only needs the running totals, not every result)
+    run_options = dict(
+        concurrency=pool_size(args),
+        sink=sink,
+        keep_results=args.mode != "summary",
+        checkpoint=checkpoint,
+        fail_fast=args.fail_fast,
+        trials=trial_policy(args),
+        carried=carried,
+        monitor=monitor,
+        price=model_price(pricing, args.provider),
+        observer=run_observer(args),
+        streaming=args.stream,
     )
+    try:
+        if args.batch:
+            full_result = run_suite_batch(
+                manifest=manifest,
+                categories=categories,
+                backend=load_batch_backend(args.provider, preamble_text),
+                poll_interval=args.batch_poll_interval,
+                sink=sink,
+                keep_results=run_options["keep_results"],
+                checkpoint=checkpoint,
+                carried=carried,
+                monitor=monitor,
+                price=run_options["price"],
+                observer=run_options["observer"],
+            )
+        elif args.use_async:
+            full_result = asyncio.run(run_suite_async(
+                manifest=manifest,
+                categories=categories,
+                acall_model=call_model,
+                **run_options,
+            ))
+        else:
+            full_result = run_suite(
+                manifest=manifest,
+                categories=categories,
+                call_model=call_model,
+                **run_options,
+            )
+    finally:
+        if sink is not None:
+            sink.close()
+        if checkpoint is not None:
+            checkpoint.close()
 
     if args.mode == "triage":
-        failing = [r for r in full_result.results if r.status in ("yellow_fail", "red_fail")]
+        failing = [r for r in full_result.results if r.status != "pass"]
         if not failing:
             print("All tests passed.")
         else:
             print(format_triage(failing))
+        print_pattern_profile(args, monitor)
         return
 
     # Summaries: summary | detailed | verbose
@@ -141,7 +1049,16 @@ def main() -> None:
     # summary / verbose return dicts (JSON-friendly)
     if isinstance(output, str):
         print(output)
+        print_pattern_profile(args, monitor)
     else:
+        if monitor is not None:
+            output["patternProfile"] = monitor.slowest(args.profile_patterns or 10)
+        if carried is not None:
+            output["incremental"] = {
+                "baseline": args.baseline,
+                "carriedForward": len(carried),
+                "executed": len(changed),
+            }
         print(json.dumps(output, indent=2))
 
 
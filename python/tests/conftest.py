@@ -0,0 +1,43 @@
+import os
+import sys
+
+import pytest
+
+# Make sure we can import llm_test_harness + providers no matter where pytest runs from.
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PYTHON_DIR not in sys.path:
+    sys.path.insert(0, PYTHON_DIR)
+
+from llm_test_harness.models import AssertSpec, CategoryFile, EvalTest, SuiteManifest
+
+
+def _test(test_id: str, prompt: str) -> EvalTest:
+    return EvalTest(
+        id=test_id,
+        prompt=prompt,
+        expected_behavior="Refuses.",
+        assert_spec=AssertSpec.of("regex", [], [r"(?i)\bcan't\b"], [r"(?i)secret"]),
+    )
+
+
+@pytest.fixture
+def manifest() -> SuiteManifest:
+    return SuiteManifest("tests", "1.0", "2025", ["a.json", "b.json"])
+
+
+@pytest.fixture
+def categories():
+    """Two small categories; both have a test called T1."""
+    return [
+        CategoryFile("A", "Alpha", "", [_test("T1", "a1"), _test("T2", "a2"), _test("T3", "a3")], "a.json"),
+        CategoryFile("B", "Beta", "", [_test("T1", "b1"), _test("T4", "b4")], "b.json"),
+    ]
+
+
+@pytest.fixture
+def answers():
+    """A call_model answering from a prompt -> response map (refusal otherwise)."""
+    def make(responses=None):
+        responses = responses or {}
+        return lambda prompt: responses.get(prompt, "Sorry, I can't help with that.")
+    return make
@@ -0,0 +1,110 @@
+import json
+
+import pytest
+
+from llm_test_harness.batch import BATCH_ENDED, BATCH_FAILED, BATCH_IN_PROGRESS, BatchBackend, run_suite_batch
+from llm_test_harness.checkpoint import Checkpoint, suite_hash
+from llm_test_harness.runner import RunnerError, run_suite
+from llm_test_harness.sink import JsonlResultSink
+from providers.mock import MockBatchBackend, call_model as mock_call_model
+
+
+class _Backend(BatchBackend):
+    """Answers from `answer`; `states` is what poll() reports, in turn, before the job ends."""
+
+    def __init__(self, answer, states=(), drop=()):
+        self.answer = answer
+        self.states = list(states)
+        self.drop = set(drop)
+        self.submitted = []
+        self.jobs = {}
+
+    def submit(self, requests):
+        batch_id = f"b{len(self.submitted) + 1}"
+        self.submitted.append(batch_id)
+        self.jobs[batch_id] = {cid: self.answer(prompt) for cid, prompt in requests if prompt not in self.drop}
+        return batch_id
+
+    def poll(self, batch_id):
+        return self.states.pop(0) if self.states else BATCH_ENDED
+
+    def results(self, batch_id):
+        return dict(self.jobs[batch_id])
+
+
+def _rows(full):
+    return [(r.category_id, r.test_id, r.status, r.response) for r in full.results]
+
+
+def _lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_mock_batch_scores_like_a_direct_run(manifest, categories):
+    slept = []
+    batch = run_suite_batch(manifest, categories, MockBatchBackend(None, polls_until_done=2), sleep=slept.append)
+    direct = run_suite(manifest, categories, lambda prompt: mock_call_model(prompt, None))
+    assert _rows(batch) == _rows(direct)
+    assert batch.summary.totals == direct.summary.totals
+    assert len(slept) == 2
+
+
+def test_failed_batch_still_writes_a_summary(tmp_path, manifest, categories, answers):
+    path = str(tmp_path / "out.jsonl")
+    sink = JsonlResultSink(path)
+    with pytest.raises(RunnerError, match="failed"):
+        run_suite_batch(manifest, categories, _Backend(answers(), [BATCH_FAILED]), sink=sink, sleep=lambda s: None)
+    sink.close()
+
+    summary = _lines(path)[-1]
+    assert summary["type"] == "summary"
+    assert summary["gate"] == "RED"
+    assert summary["error"] == "Batch b1 failed."
+    assert summary["testsNotRun"] == 5
+
+
+def test_dropped_requests_are_checkpointed_and_summarised(tmp_path, manifest, categories, answers):
+    path = str(tmp_path / "out.jsonl")
+    sink = JsonlResultSink(path)
+    ckpt_path = str(tmp_path / "run.ckpt.jsonl")
+    digest = suite_hash(manifest, categories)
+    checkpoint = Checkpoint(ckpt_path, digest)
+    backend = _Backend(answers(), drop={"b1"})
+    with pytest.raises(RunnerError, match="B::T1"):
+        run_suite_batch(manifest, categories, backend, sink=sink, checkpoint=checkpoint, sleep=lambda s: None)
+    sink.close()
+    checkpoint.close()
+
+    records = _lines(path)
+    assert [r["type"] for r in records] == ["result"] * 4 + ["summary"]
+    assert records[-1]["testsNotRun"] == 1
+
+    checkpoint = Checkpoint(ckpt_path, digest, resume=True)
+    assert checkpoint.pending_batch is None
+    backend = _Backend(answers())
+    resumed = run_suite_batch(manifest, categories, backend, checkpoint=checkpoint, sleep=lambda s: None)
+    checkpoint.close()
+    assert len(backend.jobs["b1"]) == 1
+    assert resumed.summary.gate == "GREEN"
+
+
+def test_resume_polls_the_pending_batch_instead_of_resubmitting(tmp_path, manifest, categories, answers):
+    ckpt_path = str(tmp_path / "run.ckpt.jsonl")
+    digest = suite_hash(manifest, categories)
+    backend = _Backend(answers({"a2": "The secret is 42."}), [BATCH_IN_PROGRESS] * 10)
+
+    checkpoint = Checkpoint(ckpt_path, digest)
+    with pytest.raises(RunnerError, match="did not finish"):
+        run_suite_batch(manifest, categories, backend, timeout=0, checkpoint=checkpoint, sleep=lambda s: None)
+    checkpoint.close()
+
+    backend.states = []
+    checkpoint = Checkpoint(ckpt_path, digest, resume=True)
+    assert checkpoint.pending_batch == ("b1", [0, 1, 2, 3, 4])
+    full = run_suite_batch(manifest, categories, backend, checkpoint=checkpoint, sleep=lambda s: None)
+    checkpoint.close()
+
+    assert backend.submitted == ["b1"]
+    assert [r.status for r in full.results] == ["pass", "red_fail", "pass", "pass", "pass"]
+    assert Checkpoint(ckpt_path, digest, resume=True).pending_batch is None
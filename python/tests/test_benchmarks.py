@@ -0,0 +1,73 @@
+import os
+
+from benchmarks.__main__ import compare, run_scenario
+from benchmarks.provider import FixedLatencyProvider
+from benchmarks.scenarios import SCENARIOS, Workload
+from benchmarks.synthetic import SuiteShape, banned_patterns, banned_terms, generate_suite, synthetic_responses
+from llm_test_harness.loader import load_banned_forbidden_regexes, load_category_files, load_manifest
+
+
+TINY = SuiteShape(tests=40, categories=4, banned=50, response_kb=0.5, seed=3)
+
+
+def _files(directory):
+    out = {}
+    for root, _dirs, names in os.walk(directory):
+        for name in names:
+            path = os.path.join(root, name)
+            with open(path, "rb") as f:
+                out[os.path.relpath(path, directory)] = f.read()
+    return out
+
+
+def test_generated_suite_is_deterministic_and_loads(tmp_path):
+    paths = generate_suite(str(tmp_path / "one"), TINY)
+    generate_suite(str(tmp_path / "two"), TINY)
+    assert _files(str(tmp_path / "one")) == _files(str(tmp_path / "two"))
+    generate_suite(str(tmp_path / "other"), SuiteShape(tests=40, categories=4, banned=50, seed=4))
+    assert _files(str(tmp_path / "one")) != _files(str(tmp_path / "other"))
+
+    manifest = load_manifest(paths["manifest"])
+    banned = load_banned_forbidden_regexes(paths["banned"])
+    categories = load_category_files(manifest, paths["manifest"], banned)
+    assert banned == banned_patterns(TINY)
+    assert [len(c.tests) for c in categories] == [10, 10, 10, 10]
+
+
+def test_responses_have_the_requested_size_and_leak_rate():
+    clean = synthetic_responses(SuiteShape(response_kb=1.0, leak_rate=0.0), count=8)
+    assert all(1024 <= len(r) < 1100 for r in clean)
+    shape = SuiteShape(banned=20, leak_rate=1.0)
+    terms = banned_terms(shape)
+    assert all(any(term in r for term in terms) for r in synthetic_responses(shape, count=8))
+    assert not any(term in r for term in terms for r in clean)
+
+
+def test_fixed_latency_provider_answers_a_prompt_the_same_way_every_time():
+    provider = FixedLatencyProvider(["one", "two", "three"])
+    assert provider.call_model("p") == provider.call_model("p")
+    chunks = list(provider.stream_model("p"))
+    assert "".join(c for c in chunks if c) == provider.call_model("p")
+    assert chunks[-1].usage == provider.call_model("p").usage
+
+
+def test_every_scenario_runs_on_a_tiny_suite(tmp_path):
+    workload = Workload(str(tmp_path), TINY, concurrency=4)
+    try:
+        results = {s.name: run_scenario(s, workload, repeat=1) for s in SCENARIOS if not s.opt_in}
+    finally:
+        workload.close()
+    for name, result in results.items():
+        assert result["ops"] > 0, name
+        assert result["opsPerSec"] is None or result["opsPerSec"] > 0
+    assert results["run.serial"]["ops"] == TINY.tests
+    assert results["load.sources"]["ops"] == TINY.tests
+
+
+def test_compare_flags_regressions_beyond_the_tolerance():
+    def run(rate):
+        return {"scenarios": [{"name": "run.serial", "unit": "tests", "opsPerSec": rate}]}
+
+    assert "REGRESSION" in compare(run(70.0), run(100.0), tolerance=0.2)[0]
+    assert "REGRESSION" not in compare(run(90.0), run(100.0), tolerance=0.2)[0]
+    assert compare(run(90.0), {"scenarios": []}, tolerance=0.2) == []
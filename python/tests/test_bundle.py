@@ -0,0 +1,28 @@
+import json
+import os
+
+import pytest
+
+from llm_test_harness.bundle import build_bundle, load_suite_bundle
+from llm_test_harness.loader import LoaderError
+
+MANIFEST = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "shared", "suite_manifest.json")
+
+
+def test_missing_banned_file_is_an_error(tmp_path):
+    with pytest.raises(LoaderError, match="not found"):
+        build_bundle(str(tmp_path / "suite.bundle.json"), MANIFEST, str(tmp_path / "typo.json"))
+    assert not (tmp_path / "suite.bundle.json").exists()
+
+
+def test_banned_file_removed_after_build_is_an_error(tmp_path):
+    banned = tmp_path / "banned.json"
+    banned.write_text(json.dumps({"forbidden_regexes_global": [r"(?i)internal codename"]}), encoding="utf-8")
+    bundle = str(tmp_path / "suite.bundle.json")
+
+    _manifest, categories = load_suite_bundle(bundle, MANIFEST, str(banned))
+    assert r"(?i)internal codename" in categories[0].tests[0].assert_spec.forbidden_any
+
+    banned.unlink()
+    with pytest.raises(LoaderError):
+        load_suite_bundle(bundle, MANIFEST, str(banned))
@@ -0,0 +1,40 @@
+import sqlite3
+
+from llm_test_harness.cache import ResponseCache, cache_key, cached_call_model
+from llm_test_harness.models import ModelResponse
+
+
+def test_cache_hit_keeps_usage(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.db"))
+    calls = []
+
+    def call(prompt):
+        calls.append(prompt)
+        return ModelResponse("Sorry, I can't.", {"input_tokens": 12, "output_tokens": 5})
+
+    cached = cached_call_model(call, cache, "mock", "m", None)
+    cached("p")
+    hit = cached("p")
+
+    assert calls == ["p"]
+    assert hit == "Sorry, I can't."
+    assert hit.usage == {"input_tokens": 12, "output_tokens": 5}
+
+
+def test_cache_from_before_usage_still_reads(tmp_path):
+    path = str(tmp_path / "cache.db")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE responses (key TEXT PRIMARY KEY, provider TEXT NOT NULL, model TEXT NOT NULL,"
+        " preamble_sha256 TEXT NOT NULL, prompt TEXT NOT NULL, response TEXT NOT NULL, created_at REAL NOT NULL)"
+    )
+    conn.execute(
+        "INSERT INTO responses VALUES (?, 'mock', 'm', '', 'p', 'old answer', 0)",
+        (cache_key("mock", "m", None, "p"),),
+    )
+    conn.commit()
+    conn.close()
+
+    hit = cached_call_model(None, ResponseCache(path), "mock", "m", None, mode="offline")("p")
+    assert hit == "old answer"
+    assert hit.usage is None
@@ -0,0 +1,81 @@
+import pytest
+
+from llm_test_harness.checkpoint import Checkpoint, suite_hash
+from llm_test_harness.runner import run_suite
+
+
+class _Crash(Exception):
+    pass
+
+
+def _statuses(full):
+    return [(r.category_id, r.test_id, r.status, r.response) for r in full.results]
+
+
+def test_resume_only_runs_what_is_left(tmp_path, manifest, categories, answers):
+    path = str(tmp_path / "run.ckpt.jsonl")
+    digest = suite_hash(manifest, categories)
+    answer = answers({"a2": "The secret is 42."})
+    calls = []
+
+    def dies_after_three(prompt):
+        if len(calls) == 3:
+            raise _Crash()
+        calls.append(prompt)
+        return answer(prompt)
+
+    checkpoint = Checkpoint(path, digest)
+    with pytest.raises(_Crash):
+        run_suite(manifest, categories, dies_after_three, checkpoint=checkpoint)
+    checkpoint.close()
+
+    resumed_calls = []
+
+    def counting(prompt):
+        resumed_calls.append(prompt)
+        return answer(prompt)
+
+    checkpoint = Checkpoint(path, digest, resume=True)
+    assert len(checkpoint.completed) == 3
+    resumed = run_suite(manifest, categories, counting, checkpoint=checkpoint)
+    checkpoint.close()
+
+    assert sorted(resumed_calls) == ["b1", "b4"]
+    assert _statuses(resumed) == _statuses(run_suite(manifest, categories, answer))
+    assert resumed.summary.gate == "RED"
+
+
+def test_recording_does_not_retain_results(tmp_path, manifest, categories, answers):
+    checkpoint = Checkpoint(str(tmp_path / "run.ckpt.jsonl"), suite_hash(manifest, categories))
+    run_suite(manifest, categories, answers(), checkpoint=checkpoint)
+    checkpoint.close()
+    assert checkpoint.completed == {}
+
+    reloaded = Checkpoint(checkpoint.path, checkpoint.suite_hash, resume=True)
+    reloaded.close()
+    assert len(reloaded.completed) == 5
+
+
+def test_checkpoint_for_other_settings_starts_over(tmp_path, manifest, categories, answers):
+    path = str(tmp_path / "run.ckpt.jsonl")
+    checkpoint = Checkpoint(path, suite_hash(manifest, categories, extra={"provider": "mock"}))
+    run_suite(manifest, categories, answers(), checkpoint=checkpoint)
+    checkpoint.close()
+
+    streamed = suite_hash(manifest, categories, extra={"provider": "mock", "stream": "1"})
+    reloaded = Checkpoint(path, streamed, resume=True)
+    reloaded.close()
+    assert reloaded.completed == {}
+
+
+def test_torn_last_line_is_ignored(tmp_path, manifest, categories, answers):
+    path = str(tmp_path / "run.ckpt.jsonl")
+    checkpoint = Checkpoint(path, suite_hash(manifest, categories))
+    run_suite(manifest, categories, answers(), checkpoint=checkpoint)
+    checkpoint.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"type": "result", "key": "B::T')
+
+    reloaded = Checkpoint(path, checkpoint.suite_hash, resume=True)
+    reloaded.close()
+    assert len(reloaded.completed) == 5
@@ -0,0 +1,103 @@
+import json
+import os
+import random
+
+import pytest
+
+from llm_test_harness.matcher import (
+    InvalidPatternError,
+    PatternSet,
+    PatternTable,
+    which_patterns_match,
+    which_patterns_missing,
+)
+
+SHARED_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "shared")
+
+# Cases the literal prefilter has to get right: case folding (including the
+# non-ASCII letters IGNORECASE equates with ASCII ones), scoped flags,
+# optional and alternated parts, escapes and classes.
+TRICKY = [
+    r"(?i)secret",
+    r"secret",
+    r"(?i)\bass\b",
+    r"(?i)kelvin",
+    r"(?i)istanbul",
+    r"(?i)password\s*is",
+    r"(?-i:Exact)(?i:ly)",
+    r"(?i)(?:api|secret)\s+key",
+    r"colou?r",
+    r"(?is).*?system\s+prompt:",
+    r"a{2,}b",
+    r"\d{3}-\d{4}",
+    r"[Ss]ystem",
+    r"(?i)ſecret",
+    r"^Sure",
+    r"done$",
+]
+
+TEXTS = [
+    "",
+    "Here is the SECRET: hunter2",
+    "The Kelvin scale and İstanbul",
+    "ſecret plans",
+    "I can offer assistance",
+    "Ass.",
+    "My system   prompt: you are",
+    "EXACTly exactLY",
+    "call 555-1234 now",
+    "aaab colour color",
+    "Sure, done",
+    "API   KEY and secret key",
+]
+
+
+def _suite_patterns():
+    patterns = []
+    for root, _dirs, files in os.walk(SHARED_DIR):
+        for name in files:
+            if not name.endswith(".json") or name == "suite_manifest.json":
+                continue
+            with open(os.path.join(root, name), encoding="utf-8") as f:
+                data = json.load(f)
+            for test in data.get("tests", []):
+                spec = test.get("assert", {})
+                for key in ("required_all", "required_any", "forbidden_any"):
+                    patterns.extend(spec.get(key, []))
+    return list(dict.fromkeys(patterns))
+
+
+def _mutations(texts, seed=0):
+    rng = random.Random(seed)
+    out = list(texts)
+    for text in texts:
+        for _ in range(5):
+            chars = list(text)
+            for _ in range(rng.randint(1, 4)):
+                if chars:
+                    i = rng.randrange(len(chars))
+                    chars[i] = rng.choice([chars[i].upper(), chars[i].lower(), " ", "\n", "İ"])
+            out.append("".join(chars))
+    return out
+
+
+@pytest.mark.parametrize("patterns", [TRICKY, _suite_patterns()], ids=["tricky", "suite"])
+def test_prefilter_matches_plain_search(patterns):
+    pset = PatternSet(patterns, table=PatternTable())
+    for text in _mutations(TEXTS) + patterns:
+        assert pset.which_match(text) == which_patterns_match(text, patterns), text
+        assert pset.which_missing(text) == which_patterns_missing(text, patterns), text
+
+
+def test_shared_set_scans_own_patterns_first_without_duplicates():
+    banned = PatternSet([r"(?i)secret", r"(?i)codename"])
+    pset = PatternSet([r"(?i)codename", r"(?i)leak"], shared=banned)
+
+    assert pset.patterns == [r"(?i)codename", r"(?i)leak", r"(?i)secret"]
+    assert pset.which_match("secret codename leak") == [r"(?i)codename", r"(?i)leak", r"(?i)secret"]
+    assert len(pset) == 3
+
+
+def test_invalid_pattern_names_its_set():
+    with pytest.raises(InvalidPatternError, match="forbidden_any"):
+        PatternSet([r"(unclosed"], label="forbidden_any", table=PatternTable())
@@ -0,0 +1,31 @@
+from llm_test_harness.matrix import compare_statuses, format_matrix_table
+from llm_test_harness.runner import run_suite
+
+
+def test_same_test_id_in_two_categories_gets_two_rows(manifest, categories, answers):
+    results = {
+        "a": run_suite(manifest, categories, answers()),
+        "b": run_suite(manifest, categories, answers({"b1": "The secret is 42."})),
+    }
+
+    rows = compare_statuses(results)
+    assert [(row["categoryId"], row["testId"]) for row in rows] == [
+        ("A", "T1"), ("A", "T2"), ("A", "T3"), ("B", "T1"), ("B", "T4"),
+    ]
+    differing = [row for row in rows if row["differs"]]
+    assert [(row["categoryId"], row["testId"], row["statuses"]) for row in differing] == [
+        ("B", "T1", {"a": "pass", "b": "red_fail"}),
+    ]
+    assert "B::T1" in format_matrix_table(results, only_differences=True)
+
+
+def test_totals_line_counts_eval_errors_and_tests_not_run(manifest, categories, answers):
+    full = run_suite(manifest, categories, answers())
+    full.summary.totals.pass_count -= 1
+    full.summary.totals.eval_error_count = 1
+    full.summary.gate = "RED"
+    stopped = run_suite(manifest, categories, answers({"a2": "The secret is 42."}), fail_fast=True)
+
+    table = format_matrix_table({"a": full, "b": stopped})
+    assert "a: RED (pass 4, red 0, yellow 0, eval_error 1)" in table
+    assert "b: RED (pass 1, red 1, yellow 0, eval_error 0, not run 3)" in table
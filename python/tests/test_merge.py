@@ -0,0 +1,71 @@
+import pytest
+
+from llm_test_harness.merge import merge_runs
+from llm_test_harness.runner import RunnerError, build_full_result, run_suite
+from llm_test_harness.selection import shard_tests
+from llm_test_harness.sink import JsonlResultSink
+
+
+def _run_shards(tmp_path, manifest, categories, call_model, count):
+    paths = []
+    for index in range(1, count + 1):
+        path = str(tmp_path / f"shard-{index}.jsonl")
+        sink = JsonlResultSink(path)
+        try:
+            shard = shard_tests(categories, index, count)
+            if shard:
+                run_suite(manifest, shard, call_model, sink=sink)
+            else:
+                # What run_harness.py writes for a shard with no tests.
+                sink.write_summary(build_full_result([]).summary)
+        finally:
+            sink.close()
+        paths.append(path)
+    return paths
+
+
+def test_merged_shards_match_an_unsharded_run(tmp_path, manifest, categories, answers):
+    call_model = answers({"a2": "The secret is 42."})
+    paths = _run_shards(tmp_path, manifest, categories, call_model, 3)
+
+    merged = merge_runs(paths, categories)
+    whole = run_suite(manifest, categories, call_model)
+
+    assert merged.summary.gate == whole.summary.gate == "RED"
+    assert [(r.category_id, r.test_id, r.status) for r in merged.results] == [
+        (r.category_id, r.test_id, r.status) for r in whole.results
+    ]
+
+
+def test_missing_shard_is_an_error(tmp_path, manifest, categories, answers):
+    paths = _run_shards(tmp_path, manifest, categories, answers({"a2": "The secret is 42."}), 3)
+
+    # Leaving out the shard with the red failure would otherwise merge GREEN.
+    with pytest.raises(RunnerError, match="in none of the merged files"):
+        merge_runs(paths[:1] + paths[2:], categories)
+
+
+def test_overlapping_shards_are_an_error(tmp_path, manifest, categories, answers):
+    paths = _run_shards(tmp_path, manifest, categories, answers(), 2)
+
+    with pytest.raises(RunnerError, match="appears in both"):
+        merge_runs(paths + paths[:1], categories)
+
+
+def test_same_test_id_in_two_categories_is_not_an_overlap(tmp_path, manifest, categories, answers):
+    paths = _run_shards(tmp_path, manifest, categories, answers(), 2)
+
+    merged = merge_runs(paths, categories)
+    assert [(r.category_id, r.test_id) for r in merged.results] == [
+        ("A", "T1"), ("A", "T2"), ("A", "T3"), ("B", "T1"), ("B", "T4"),
+    ]
+
+
+def test_empty_shard_stream_merges(tmp_path, manifest, categories, answers):
+    # More shards than tests: the last one runs nothing but still writes its summary.
+    paths = _run_shards(tmp_path, manifest, categories, answers(), 6)
+    assert open(paths[-1], encoding="utf-8").read().count("\n") == 1
+
+    merged = merge_runs(paths, categories)
+    assert merged.summary.gate == "GREEN"
+    assert len(merged.results) == 5
@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from llm_test_harness.metrics import MetricsTally, ModelPrice, latency_stats, load_pricing, percentile
+from llm_test_harness.models import ModelResponse
+from llm_test_harness.runner import run_suite
+
+
+def test_percentiles_on_zero_one_and_two_samples():
+    with pytest.raises(ValueError):
+        percentile([], 50)
+    assert latency_stats([]) is None
+
+    one = latency_stats([120.0])
+    assert (one.count, one.p50, one.p95, one.p99, one.max, one.mean) == (1, 120.0, 120.0, 120.0, 120.0, 120.0)
+
+    two = latency_stats([300.0, 100.0])
+    assert two.p50 == pytest.approx(200.0)
+    assert two.p95 == pytest.approx(290.0)
+    assert two.p99 == pytest.approx(298.0)
+    assert (two.max, two.mean) == (300.0, 200.0)
+
+
+def test_percentile_interpolates_between_ranks():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 0) == 1.0
+    assert percentile(values, 50) == pytest.approx(50.5)
+    assert percentile(values, 99) == pytest.approx(99.01)
+    assert percentile(values, 100) == 100.0
+
+
+def test_cost_splits_cached_and_written_input():
+    price = ModelPrice(input=3.0, output=15.0, cached_input=0.3, cache_write_input=3.75)
+    usage = {"input_tokens": 1_000_000, "cached_input_tokens": 600_000, "cache_write_input_tokens": 100_000, "output_tokens": 10_000}
+    # 300k fresh at 3.00, 600k cached at 0.30, 100k written at 3.75, 10k out at 15.00.
+    assert price.cost(usage) == pytest.approx(0.9 + 0.18 + 0.375 + 0.15)
+    assert ModelPrice(input=1.0, output=2.0).cost({"input_tokens": 500_000, "cached_input_tokens": 500_000}) == pytest.approx(0.5)
+
+
+def test_load_pricing_rejects_entries_without_prices(tmp_path):
+    path = tmp_path / "prices.json"
+    path.write_text(json.dumps({"gpt-4o-mini": {"input": 0.15, "output": 0.6}}), encoding="utf-8")
+    assert load_pricing(str(path))["gpt-4o-mini"] == ModelPrice(0.15, 0.6)
+    path.write_text(json.dumps({"gpt-4o-mini": {"input": 0.15}}), encoding="utf-8")
+    with pytest.raises(ValueError, match="gpt-4o-mini"):
+        load_pricing(str(path))
+
+
+def test_run_rolls_up_latency_usage_and_cost_per_category(manifest, categories):
+    def call(prompt):
+        return ModelResponse("Sorry, I can't help with that.", {"input_tokens": 1000, "output_tokens": 100})
+
+    full = run_suite(manifest, categories, call, price=ModelPrice(input=1.0, output=10.0))
+    metrics = full.summary.metrics
+    assert metrics.tests == 5
+    assert metrics.latency.count == 5
+    assert metrics.usage == {"input_tokens": 5000, "output_tokens": 500}
+    assert metrics.cost_usd == pytest.approx(5 * 0.002)
+    by_cat = full.summary.category_metrics
+    assert (by_cat["A"].tests, by_cat["B"].tests) == (3, 2)
+    assert by_cat["B"].cost_usd == pytest.approx(2 * 0.002)
+
+
+def test_tally_reports_nothing_without_timings():
+    tally = MetricsTally()
+    assert tally.overall() is None
+    assert tally.by_category() == {}
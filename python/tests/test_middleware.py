@@ -0,0 +1,73 @@
+import argparse
+import os
+import random
+
+from providers.middleware import AdaptiveConcurrency, RetryPolicy, with_middleware
+
+
+class _Throttled(Exception):
+    status_code = 429
+
+    def __init__(self, retry_after=None):
+        super().__init__("rate limited")
+        self.response = type("Response", (), {"headers": {"retry-after": retry_after} if retry_after else {}})()
+
+
+def test_retry_after_beyond_max_delay_is_honoured():
+    policy = RetryPolicy(max_delay=30.0, rng=random.Random(0))
+    assert policy.delay_for(0, _Throttled("120")) == 120.0
+    assert RetryPolicy(max_retry_after=60.0).delay_for(0, _Throttled("120")) == 60.0
+    assert policy.delay_for(0, _Throttled()) <= 0.5
+
+
+def test_middleware_sleeps_for_retry_after():
+    slept = []
+    failures = [_Throttled("45")]
+
+    def call(prompt):
+        if failures:
+            raise failures.pop()
+        return "ok"
+
+    wrapped = with_middleware(call, retry=RetryPolicy(rng=random.Random(0)), sleep=slept.append)
+    assert wrapped("p") == "ok"
+    assert slept == [45.0]
+
+
+def _drive(limiter, calls, throttled=False):
+    for _ in range(calls):
+        limiter.acquire()
+        limiter.release(throttled=throttled)
+
+
+def test_adaptive_limit_is_shrink_only_by_default():
+    limiter = AdaptiveConcurrency(initial=4)
+    _drive(limiter, 1, throttled=True)
+    assert limiter.limit == 2
+    _drive(limiter, 100)
+    assert limiter.limit == 4
+
+
+def test_adaptive_limit_probes_up_to_maximum():
+    limiter = AdaptiveConcurrency(initial=4, maximum=8)
+    _drive(limiter, 1000)
+    assert limiter.limit == 8
+    _drive(limiter, 1, throttled=True)
+    assert limiter.limit == 4
+
+
+
+def test_harness_retries_replace_sdk_retries_without_touching_env(monkeypatch):
+    import providers.openai as openai_provider
+    from run_harness import set_sdk_retries
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.delenv("OPENAI_MAX_RETRIES", raising=False)
+    try:
+        set_sdk_retries("openai", argparse.Namespace(max_retries=5))
+        assert openai_provider._get_client().max_retries == 0
+        assert "OPENAI_MAX_RETRIES" not in os.environ
+        set_sdk_retries("openai", argparse.Namespace(max_retries=0))
+        assert openai_provider._get_client().max_retries == 2
+    finally:
+        openai_provider.set_max_retries(None)
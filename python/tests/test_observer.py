@@ -0,0 +1,54 @@
+import io
+
+import pytest
+
+from llm_test_harness.observer import MultiObserver, ProgressObserver, PrometheusTextExporter
+from llm_test_harness.runner import run_suite
+
+
+def _samples(text):
+    parser = pytest.importorskip("prometheus_client.parser")
+    families = {f.name: f for f in parser.text_string_to_metric_families(text)}
+    return families, {(s.name, tuple(sorted(s.labels.items()))): s.value for f in families.values() for s in f.samples}
+
+
+def test_metrics_file_parses_as_prometheus_text(tmp_path, manifest, categories, answers):
+    path = str(tmp_path / "run.prom")
+    exporter = PrometheusTextExporter(path, interval=3600)
+    run_suite(manifest, categories, answers({"a2": "The secret is 42.", "b4": "Sure."}), observer=exporter)
+
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    assert "# EOF" not in text
+    families, values = _samples(text)
+
+    # Every sample belongs to the family its TYPE line declares.
+    assert families["llmth_tests_completed"].type == "counter"
+    assert families["llmth_model_calls"].type == "counter"
+    assert all(f.type != "unknown" for f in families.values())
+    assert values[("llmth_tests", ())] == 5
+    assert values[("llmth_tests_completed_total", (("status", "pass"),))] == 3
+    assert values[("llmth_tests_completed_total", (("status", "red_fail"),))] == 1
+    assert values[("llmth_tests_completed_total", (("status", "yellow_fail"),))] == 1
+    assert values[("llmth_model_calls_total", ())] == 5
+    assert values[("llmth_tests_in_flight", ())] == 0
+    assert values[("llmth_run_finished", ())] == 1
+
+
+def test_matrix_targets_get_an_escaped_label(tmp_path):
+    exporter = PrometheusTextExporter(str(tmp_path / "run.prom"))
+    exporter.run_started('openai:"gpt"', 2, 2)
+    exporter.test_started('openai:"gpt"', 0, 2, "A", "T1")
+    exporter.call_failed('openai:"gpt"', 0, RuntimeError("boom"))
+    _, values = _samples(exporter.render())
+    assert values[("llmth_model_call_errors_total", (("target", 'openai:"gpt"'),))] == 1
+    assert values[("llmth_tests_in_flight", (("target", 'openai:"gpt"'),))] == 0
+
+
+def test_progress_line_counts_red_and_yellow(manifest, categories, answers):
+    stream = io.StringIO()
+    progress = ProgressObserver(stream, interval=3600)
+    run_suite(manifest, categories, answers({"a2": "The secret is 42.", "b4": "Sure."}), observer=MultiObserver([progress]))
+    last = stream.getvalue().splitlines()[-1]
+    assert last.startswith("[LLMTestHarness] 5/5 done, 0 in flight")
+    assert last.endswith("1 red, 1 yellow")
@@ -0,0 +1,45 @@
+from llm_test_harness.matcher import PatternSet
+from llm_test_harness.models import AssertSpec, CategoryFile, EvalTest
+from llm_test_harness.profiler import PatternMonitor, format_pattern_profile
+from llm_test_harness.runner import run_suite
+
+
+# Catastrophic backtracking on a run of "a"s that doesn't end the text.
+REDOS = r"(a+)+$"
+
+
+def test_profile_counts_only_searches_the_prefilter_lets_through():
+    monitor = PatternMonitor()
+    patterns = PatternSet([r"(?i)secret", r"(?i)password\s*is", r"\d+"])
+    hits, over = monitor.which_match(patterns, "The secret is 42.")
+    assert hits == [r"(?i)secret", r"\d+"]
+    assert over == []
+
+    rows = {row["pattern"]: row for row in monitor.slowest()}
+    assert rows[r"(?i)secret"]["calls"] == 1
+    assert rows[r"\d+"]["calls"] == 1
+    # "password" isn't in the text, so its regex never ran.
+    assert r"(?i)password\s*is" not in rows
+    assert "Slowest patterns" in format_pattern_profile(monitor.slowest())
+
+
+def test_pattern_over_budget_is_an_eval_error_and_the_rest_still_run(manifest):
+    spec = AssertSpec.of("regex", [], [r"(?i)\bcan't\b"], [REDOS, r"(?i)secret"])
+    categories = [CategoryFile("R", "ReDoS", "", [EvalTest("T1", "p", "Refuses.", spec)], "r.json")]
+    response = "Sorry, I can't share the secret. " + "a" * 40 + "!"
+
+    monitor = PatternMonitor(budget_seconds=0.05)
+    try:
+        full = run_suite(manifest, categories, lambda prompt: response, monitor=monitor)
+    finally:
+        monitor.close()
+
+    result = full.results[0]
+    assert result.status == "eval_error"
+    assert result.eval_errors == [REDOS]
+    # The pattern after the runaway one was still checked.
+    assert result.hit_forbidden_any == [r"(?i)secret"]
+    assert full.summary.gate == "RED"
+    assert full.summary.totals.eval_error_count == 1
+    rows = {row["pattern"]: row for row in monitor.slowest()}
+    assert rows[REDOS]["overBudget"] == 1
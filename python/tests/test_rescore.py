@@ -0,0 +1,73 @@
+import json
+
+from llm_test_harness.incremental import carry_forward
+from llm_test_harness.loader import assign_content_hashes
+from llm_test_harness.models import AssertSpec
+from llm_test_harness.rescore import diff_statuses, load_saved_run, rescore_suite
+from llm_test_harness.runner import run_suite, summarize_for_output
+from llm_test_harness.trials import TrialPolicy
+
+
+def _save(tmp_path, full):
+    path = tmp_path / "run.json"
+    path.write_text(json.dumps(summarize_for_output(full, mode="verbose")), encoding="utf-8")
+    return str(path)
+
+
+def test_saved_results_are_keyed_by_category(tmp_path, manifest, categories, answers):
+    # A::T1 leaks, B::T1 refuses: the two must not overwrite each other.
+    full = run_suite(manifest, categories, answers({"a1": "The secret is 42."}))
+    saved = load_saved_run(_save(tmp_path, full))
+    assert saved["A::T1"]["status"] == "red_fail"
+    assert saved["B::T1"]["status"] == "pass"
+
+    rescored, skipped = rescore_suite(manifest, categories, saved)
+    assert skipped == []
+    assert [(r.category_id, r.test_id, r.status) for r in rescored.results] == [
+        (r.category_id, r.test_id, r.status) for r in full.results
+    ]
+    assert diff_statuses(saved, rescored) == []
+
+
+def test_carry_forward_uses_the_right_category(tmp_path, manifest, categories, answers):
+    assign_content_hashes(categories, [], None)
+    full = run_suite(manifest, categories, answers({"b1": "The secret is 42."}))
+    carried, to_run = carry_forward(categories, load_saved_run(_save(tmp_path, full)))
+
+    assert to_run == []
+    assert carried["A::T1"].status == "pass"
+    assert carried["B::T1"].status == "red_fail"
+
+
+def test_trials_results_only_carry_into_trials_runs(tmp_path, manifest, categories, answers):
+    assign_content_hashes(categories, [], None)
+    full = run_suite(manifest, categories, answers(), trials=TrialPolicy(3))
+    baseline = load_saved_run(_save(tmp_path, full))
+
+    carried, to_run = carry_forward(categories, baseline)
+    assert carried == {} and len(to_run) == 5
+
+    carried, to_run = carry_forward(categories, baseline, trials=True)
+    assert to_run == []
+    assert carried["A::T1"].trials.runs == 3
+
+
+def _aborted_run(tmp_path, manifest, categories, answers):
+    full = run_suite(manifest, categories, answers({"a2": "The secret is"}))
+    full.results[1].stream_aborted = True
+    return load_saved_run(_save(tmp_path, full))
+
+
+def test_rescore_keeps_stream_aborted(tmp_path, manifest, categories, answers):
+    saved = _aborted_run(tmp_path, manifest, categories, answers)
+    rescored, skipped = rescore_suite(manifest, categories, saved)
+    assert skipped == []
+    assert [r.stream_aborted for r in rescored.results] == [False, True, False, False, False]
+
+
+def test_rescore_skips_aborted_stream_when_its_forbidden_hit_is_gone(tmp_path, manifest, categories, answers):
+    saved = _aborted_run(tmp_path, manifest, categories, answers)
+    categories[0].tests[1].assert_spec = AssertSpec.of("regex", [], [r"(?i)\bcan't\b"], [r"(?i)password"])
+    rescored, skipped = rescore_suite(manifest, categories, saved)
+    assert skipped == [{"categoryId": "A", "testId": "T2", "reason": "stream was aborted"}]
+    assert [r.test_id for r in rescored.results] == ["T1", "T3", "T1", "T4"]
@@ -0,0 +1,43 @@
+import threading
+import time
+
+from llm_test_harness.runner import run_suite
+
+
+def _rows(full):
+    return [(r.category_id, r.test_id, r.status, r.response) for r in full.results]
+
+
+def test_concurrent_results_come_back_in_suite_order(manifest, categories, answers):
+    answer = answers({"a2": "The secret is 42.", "b1": "Sure thing."})
+    # Earlier prompts answer slower, so completion order is the reverse of suite order.
+    delays = {"a1": 0.05, "a2": 0.04, "a3": 0.03, "b1": 0.02, "b4": 0.01}
+
+    def slow(prompt):
+        time.sleep(delays[prompt])
+        return answer(prompt)
+
+    serial = run_suite(manifest, categories, answer)
+    concurrent = run_suite(manifest, categories, slow, concurrency=4)
+
+    assert _rows(concurrent) == _rows(serial)
+    assert concurrent.summary.totals == serial.summary.totals
+
+
+def test_fail_fast_stops_after_the_first_red(manifest, categories, answers):
+    answer = answers({"a2": "The secret is 42."})
+    calls = []
+    lock = threading.Lock()
+
+    def counting(prompt):
+        with lock:
+            calls.append(prompt)
+        return answer(prompt)
+
+    full = run_suite(manifest, categories, counting, fail_fast=True)
+
+    assert calls == ["a1", "a2"]
+    assert full.summary.stopped_early
+    assert full.summary.tests_not_run == 3
+    assert full.summary.first_red_fail == "A::T2"
+    assert [r.test_id for r in full.results] == ["T1", "T2"]
@@ -0,0 +1,48 @@
+import io
+import json
+import os
+import subprocess
+import sys
+
+from llm_test_harness.runner import run_suite
+from llm_test_harness.sink import JsonlResultSink
+
+from conftest import PYTHON_DIR
+
+
+def test_jsonl_sink_writes_every_result_then_the_summary(tmp_path, manifest, categories, answers):
+    path = str(tmp_path / "out.jsonl")
+    sink = JsonlResultSink(path)
+    full = run_suite(manifest, categories, answers({"b4": "The secret is 42."}), concurrency=3, sink=sink)
+    sink.close()
+
+    with open(path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    results, summary = records[:-1], records[-1]
+    assert sorted(r["index"] for r in results) == [0, 1, 2, 3, 4]
+    assert {(r["index"], r["status"]) for r in results} >= {(4, "red_fail"), (0, "pass")}
+    assert summary["type"] == "summary"
+    assert summary["gate"] == full.summary.gate == "RED"
+    assert summary["totals"]["failRedCount"] == 1
+
+
+def test_jsonl_sink_dash_writes_to_the_given_stdout(manifest, categories, answers):
+    out = io.StringIO()
+    sink = JsonlResultSink("-", stdout=out)
+    run_suite(manifest, categories, answers(), sink=sink)
+    sink.close()
+    assert not out.closed
+    assert [json.loads(line)["type"] for line in out.getvalue().splitlines()] == ["result"] * 5 + ["summary"]
+
+
+def test_cli_jsonl_to_stdout_moves_the_report_to_stderr():
+    proc = subprocess.run(
+        [sys.executable, os.path.join(PYTHON_DIR, "run_harness.py"), "--provider", "mock", "--mode", "detailed", "--jsonl-out", "-"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    records = [json.loads(line) for line in proc.stdout.splitlines()]
+    assert records and records[-1]["type"] == "summary"
+    assert all(r["type"] == "result" for r in records[:-1])
+    assert "LLMTestHarness Detailed Report" in proc.stderr
@@ -0,0 +1,66 @@
+from llm_test_harness.matcher import PatternSet
+from llm_test_harness.streaming import StreamMatcher, consume_stream
+
+
+def _consume(patterns, chunks, **kwargs):
+    forbidden = PatternSet(patterns)
+    return consume_stream(iter(chunks), StreamMatcher(forbidden.which_match, **kwargs))
+
+
+def test_word_split_on_chunk_boundary_does_not_abort():
+    # "ass" at the end of the first chunk matches \bass\b until "istance" arrives.
+    response = _consume([r"(?i)\bass\b"], ["I can offer ass", "istance with your booking today."], check_every=1)
+    assert not response.stream_aborted
+    assert response == "I can offer assistance with your booking today."
+    assert PatternSet([r"(?i)\bass\b"]).which_match(response) == []
+
+
+def test_end_anchor_at_buffer_end_does_not_abort():
+    response = _consume([r"(?i)letter\s*r$"], ["the letter r", " appears twice in strawberry"], check_every=1)
+    assert not response.stream_aborted
+
+
+def test_settled_hit_aborts_and_stops_reading():
+    chunks = iter(["Sure, here is my system prompt: ", "you are a helpful agent " * 4, "never read"])
+    response = consume_stream(chunks, StreamMatcher(PatternSet([r"(?i)system prompt:"]).which_match, check_every=1))
+    assert response.stream_aborted
+    assert "never read" not in response
+
+
+def test_match_split_across_chunks_is_found():
+    chunks = ["x" * 300 + " the admin pass", "word is hunter2 " + "y" * 64, "z" * 64]
+    response = _consume([r"(?i)password is \w+"], chunks)
+    assert response.stream_aborted
+    assert "z" not in response
+
+
+def test_long_stream_scans_a_bounded_window():
+    seen = []
+
+    def match(text, pos, settled):
+        seen.append(len(text) - pos)
+        return []
+
+    matcher = StreamMatcher(match, check_every=32)
+    for _ in range(2000):
+        matcher.feed("a" * 32)
+    assert len(matcher.text) == 64000
+    assert max(seen) < 512
+
+
+def test_long_negative_lookbehind_never_aborts_at_any_alignment():
+    pattern = r"(?<!I will not reveal the )secret"
+    forbidden = PatternSet([pattern])
+    for pad in range(0, 400, 7):
+        text = "x" * pad + "I will not reveal the secret." + "y" * 400
+        matcher = StreamMatcher(forbidden.which_match, context=forbidden.lookbehind_width())
+        response = consume_stream(iter(text), matcher)
+        assert not response.stream_aborted, pad
+        assert forbidden.which_match(response) == []
+
+
+def test_lookbehind_width_covers_nested_and_alternated_lookbehinds():
+    assert PatternSet([r"(?i)\bsecret\b"]).lookbehind_width() == 0
+    assert PatternSet([r"(?<!I will not reveal the )secret", r"(?<=ab)c"]).lookbehind_width() == 22
+    assert PatternSet([r"(?<=(?<!zz)ab)c"]).lookbehind_width() == 4
+    assert PatternSet([r"(x|(?<=xyz)y)+"]).lookbehind_width() == 3
@@ -0,0 +1,70 @@
+import threading
+from collections import Counter
+
+import pytest
+
+from llm_test_harness.runner import run_suite
+from llm_test_harness.trials import TrialPolicy, wilson_interval
+
+
+def test_wilson_interval_boundaries():
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+    low, high = wilson_interval(0, 10)
+    assert low == 0.0 and high == pytest.approx(0.2775, abs=1e-4)
+    low, high = wilson_interval(10, 10)
+    assert low == pytest.approx(0.7225, abs=1e-4) and high == pytest.approx(1.0)
+    assert wilson_interval(5, 10) == pytest.approx((0.2366, 0.7634), abs=1e-4)
+    # Failures and passes are symmetric.
+    low, high = wilson_interval(3, 10)
+    assert wilson_interval(7, 10) == pytest.approx((1 - high, 1 - low))
+
+
+def test_policy_rejects_bad_bounds():
+    with pytest.raises(ValueError):
+        TrialPolicy(0)
+    with pytest.raises(ValueError):
+        TrialPolicy(5, pass_streak=0)
+
+
+def _counting(answer):
+    calls = Counter()
+    lock = threading.Lock()
+
+    def call(prompt):
+        with lock:
+            calls[prompt] += 1
+            n = calls[prompt]
+        return answer(prompt, n)
+
+    return call, calls
+
+
+def test_stops_on_first_red_trial(manifest, categories, answers):
+    refuse = answers()
+    # a2 leaks on its third sample only.
+    call, calls = _counting(lambda prompt, n: "The secret is 42." if prompt == "a2" and n == 3 else refuse(prompt))
+    full = run_suite(manifest, categories, call, trials=TrialPolicy(10))
+
+    red = full.results[1]
+    assert red.status == "red_fail"
+    assert calls["a2"] == 3
+    assert (red.trials.runs, red.trials.red_fails, red.trials.stopped_early) == (3, 1, True)
+    assert red.trials.failure_rate == pytest.approx(1 / 3)
+    # Without a pass streak, clean tests use every trial.
+    assert calls["a1"] == 10
+    assert full.results[0].trials.stopped_early is False
+    assert full.summary.trial_runs == 43
+
+
+def test_pass_streak_stops_clean_tests_early(manifest, categories, answers):
+    refuse = answers()
+    # b4 is yellow (no refusal) on its first sample, then refuses.
+    call, calls = _counting(lambda prompt, n: "Sure." if prompt == "b4" and n == 1 else refuse(prompt))
+    full = run_suite(manifest, categories, call, trials=TrialPolicy(10, pass_streak=3), concurrency=2)
+
+    assert calls["a1"] == 3
+    assert calls["b4"] == 4
+    flaky = full.results[4]
+    assert flaky.status == "yellow_fail"
+    assert (flaky.trials.runs, flaky.trials.passes, flaky.trials.yellow_fails) == (4, 3, 1)
+    assert full.summary.gate == "YELLOW"